@@ -6,59 +6,170 @@ from pathlib import Path
 from assembler.parser import Parser
 from assembler.translator import Translator
 from assembler.codegen import CodeGenerator
+from assembler.ir import format_fields
+from uvm.objfile import ObjectFile, ObjectWriter
+from uvm.timings import Report
+
+
+def assemble_stream(yaml_content: str, output_path: Path, test: bool = False,
+                    symbols_path: Path = None, object_format: bool = False,
+                    with_index: bool = False) -> tuple:
+    """
+    Ассемблирует программу в потоковом режиме.
+    
+    Каждая стадия (парсер, транслятор, генератор) обрабатывает по одной
+    инструкции, машинный код пишется в буферизованный файл порциями,
+    поэтому потребление памяти не зависит от числа команд, порождаемых
+    блоками repeat и macro. Исходный YAML документ загружается целиком
+    (yaml.safe_load), так что память растет с размером исходного текста.
+    
+    Args:
+        yaml_content: Строка с YAML содержимым
+        output_path: Путь к выходному бинарному файлу
+        test: Выводить промежуточное представление каждой инструкции
+        symbols_path: Путь к файлу карты символов (если нужен)
+        object_format: Записать объектный файл вместо сырого машинного кода
+        with_index: Добавить в объектный файл индекс смещений команд
+        
+    Returns:
+        Кортеж (количество команд, количество байт машинного кода)
+    """
+    codegen = CodeGenerator()
+    counter = {'count': 0}
+    
+    def tap(intermediate):
+        for instr in intermediate:
+            if test:
+                fields = format_fields(instr)
+                instr_bytes = ", ".join(
+                    f"0x{b:02X}" for b in codegen._generate_instruction(instr)
+                )
+                print(f"  Инструкция {counter['count']}: {fields} -> {instr_bytes}")
+            counter['count'] += 1
+            yield instr
+    
+    parser = Parser()
+    instructions = parser.iter_parse(yaml_content)
+    if parser.data and not object_format:
+        raise ValueError("Сегменты данных поддерживаются только в формате object")
+    if symbols_path is not None:
+        parser.symbols.save(symbols_path)
+    intermediate = tap(Translator().iter_translate(instructions))
+    
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if test:
+        print("Промежуточное представление и машинный код:")
+    with open(output_path, 'wb', buffering=CodeGenerator.CHUNK_SIZE) as f:
+        if object_format:
+            writer = ObjectWriter(f, with_index)
+            written = codegen.write(intermediate, writer)
+            writer.finish(parser.data, parser.symbols.to_dict())
+        else:
+            written = codegen.write(intermediate, f)
+    if test:
+        print()
+    
+    return counter['count'], written
 
 
 def main():
     """Главная функция CLI ассемблера."""
+    report = Report('assembler')  # Общее время отсчитывается от начала main()
     parser = argparse.ArgumentParser(description='Ассемблер для учебной виртуальной машины')
     parser.add_argument('input_file', type=str, help='Путь к исходному YAML файлу')
     parser.add_argument('output_file', type=str, help='Путь к выходному бинарному файлу')
     parser.add_argument('--test', action='store_true', help='Режим тестирования')
+    parser.add_argument('--stream', action='store_true',
+                        help='Потоковый режим: потребление памяти не зависит от числа '
+                             'команд после раскрытия repeat/macro')
+    parser.add_argument('--symbols', type=str, default=None,
+                        help='Путь к файлу карты символов (JSON) для интерпретатора')
+    parser.add_argument('--format', choices=['raw', 'object'], default='raw',
+                        help='Формат выходного файла: сырой машинный код или объектный файл '
+                             'с секциями кода, данных и символов')
+    parser.add_argument('--index', action='store_true',
+                        help='Добавить в объектный файл индекс смещений команд')
+    parser.add_argument('--report', type=str, default=None, metavar='FILE',
+                        help='Записать JSON отчет: длительности этапов, счетчики, пиковая память')
     
     args = parser.parse_args()
     
+    def fail(message: str):
+        """Сообщает об ошибке, записывает отчет и завершает работу."""
+        print(message, file=sys.stderr)
+        if args.report:
+            report.fail(message)
+            report.save(Path(args.report))
+        sys.exit(1)
+    
     # Читаем входной файл
     try:
-        with open(args.input_file, 'r', encoding='utf-8') as f:
-            yaml_content = f.read()
+        with report.phase('read'):
+            with open(args.input_file, 'r', encoding='utf-8') as f:
+                yaml_content = f.read()
     except FileNotFoundError:
-        print(f"Ошибка: файл {args.input_file} не найден", file=sys.stderr)
-        sys.exit(1)
+        fail(f"Ошибка: файл {args.input_file} не найден")
     except Exception as e:
-        print(f"Ошибка при чтении файла: {e}", file=sys.stderr)
-        sys.exit(1)
+        fail(f"Ошибка при чтении файла: {e}")
+    report.count('source_bytes', len(yaml_content.encode('utf-8')))
+    
+    # Потоковый режим: все стадии конвейера работают по одной инструкции
+    if args.stream:
+        output_path = Path(args.output_file)
+        try:
+            symbols_path = Path(args.symbols) if args.symbols else None
+            # Стадии конвейера чередуются, поэтому замеряются одним этапом
+            with report.phase('assemble'):
+                count, written = assemble_stream(yaml_content, output_path, args.test, symbols_path,
+                                                 args.format == 'object', args.index)
+        except Exception as e:
+            output_path.unlink(missing_ok=True)
+            fail(f"Ошибка при ассемблировании: {e}")
+        
+        report.count('instructions', count)
+        report.count('code_bytes', written)
+        report.count('output_bytes', output_path.stat().st_size)
+        report.rate('instructions_per_second', count, 'assemble')
+        if args.report:
+            report.save(Path(args.report))
+        
+        print(f"Ассемблировано команд: {count}")
+        print(f"Записано байт: {written}")
+        print(f"Результат сохранен в: {args.output_file}")
+        return
     
     # Парсим YAML
     try:
-        parser_obj = Parser()
-        instructions = parser_obj.parse(yaml_content)
+        with report.phase('parse'):
+            parser_obj = Parser()
+            instructions = parser_obj.parse(yaml_content)
     except Exception as e:
-        print(f"Ошибка при парсинге YAML: {e}", file=sys.stderr)
-        sys.exit(1)
+        fail(f"Ошибка при парсинге YAML: {e}")
     
     # Транслируем в промежуточное представление
     try:
-        translator = Translator()
-        intermediate = translator.translate(instructions)
+        with report.phase('translate'):
+            translator = Translator()
+            intermediate = translator.translate_compact(instructions)
+            del instructions
     except Exception as e:
-        print(f"Ошибка при трансляции: {e}", file=sys.stderr)
-        sys.exit(1)
+        fail(f"Ошибка при трансляции: {e}")
     
     # В режиме тестирования выводим промежуточное представление
     if args.test:
         print("Промежуточное представление:")
         for i, instr in enumerate(intermediate):
-            fields = ", ".join(f"{k}={v}" for k, v in instr.items())
+            fields = format_fields(instr)
             print(f"  Инструкция {i}: {fields}")
         print()
     
     # Генерируем машинный код
     try:
-        codegen = CodeGenerator()
-        machine_code = codegen.generate(intermediate)
+        with report.phase('codegen'):
+            codegen = CodeGenerator()
+            machine_code = codegen.generate(intermediate)
     except Exception as e:
-        print(f"Ошибка при генерации кода: {e}", file=sys.stderr)
-        sys.exit(1)
+        fail(f"Ошибка при генерации кода: {e}")
     
     # В режиме тестирования выводим байты
     if args.test:
@@ -67,15 +178,40 @@ def main():
         print(f"  {byte_str}")
         print()
     
+    # Упаковываем в объектный файл
+    output_bytes = machine_code
+    if args.format == 'object':
+        with report.phase('package'):
+            obj = ObjectFile(machine_code, parser_obj.data, parser_obj.symbols.to_dict())
+            output_bytes = obj.to_bytes(with_index=args.index)
+    elif parser_obj.data:
+        fail("Ошибка: сегменты данных поддерживаются только в формате object")
+    
+    # Сохраняем карту символов
+    if args.symbols:
+        try:
+            with report.phase('symbols'):
+                parser_obj.symbols.save(Path(args.symbols))
+        except Exception as e:
+            fail(f"Ошибка при записи карты символов: {e}")
+    
     # Сохраняем результат
     try:
-        output_path = Path(args.output_file)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'wb') as f:
-            f.write(machine_code)
+        with report.phase('write'):
+            output_path = Path(args.output_file)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(output_path, 'wb') as f:
+                f.write(output_bytes)
     except Exception as e:
-        print(f"Ошибка при записи файла: {e}", file=sys.stderr)
-        sys.exit(1)
+        fail(f"Ошибка при записи файла: {e}")
+    
+    report.count('instructions', len(intermediate))
+    report.count('code_bytes', len(machine_code))
+    report.count('output_bytes', len(output_bytes))
+    report.count('ir_bytes', intermediate.nbytes())
+    report.rate('instructions_per_second', len(intermediate), 'parse', 'translate', 'codegen')
+    if args.report:
+        report.save(Path(args.report))
     
     print(f"Ассемблировано команд: {len(intermediate)}")
     print(f"Результат сохранен в: {args.output_file}")
@@ -83,4 +219,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-
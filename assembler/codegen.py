@@ -1,39 +1,101 @@
 """Генератор машинного кода из промежуточного представления."""
 
-from typing import List, Dict
+from typing import Dict, Iterable, Iterator, BinaryIO, Union
+from assembler.ir import IRInstruction, IRBuffer
+
+
+# Промежуточное представление: последовательность команд или компактный буфер
+Intermediate = Union[Iterable[IRInstruction], IRBuffer]
 
 
 class CodeGenerator:
     """Генератор машинного кода."""
     
-    def generate(self, intermediate: List[Dict]) -> bytes:
+    # Размер порции при потоковой записи (байт)
+    CHUNK_SIZE = 64 * 1024
+    
+    def generate(self, intermediate: Intermediate) -> bytes:
         """
         Генерирует машинный код из промежуточного представления.
         
         Args:
-            intermediate: Список словарей с полями команд
+            intermediate: Последовательность команд IRInstruction или IRBuffer
             
         Returns:
             Байтовая последовательность машинного кода
         """
         code = bytearray()
         
-        for instr in intermediate:
-            instr_bytes = self._generate_instruction(instr)
+        for instr_bytes in self.iter_generate(intermediate):
             code.extend(instr_bytes)
         
         return bytes(code)
     
-    def _generate_instruction(self, instr: Dict) -> bytes:
-        """Генерирует байты для одной инструкции."""
-        opcode = instr['A']
+    def iter_generate(self, intermediate: Intermediate) -> Iterator[bytes]:
+        """
+        Лениво генерирует машинный код, по одной инструкции за раз.
         
+        Args:
+            intermediate: Последовательность команд IRInstruction или IRBuffer
+            
+        Returns:
+            Итератор байтовых последовательностей отдельных инструкций
+        """
+        if isinstance(intermediate, IRBuffer):
+            # Читаем столбцы буфера напрямую, без создания объектов команд
+            encode = self._encode
+            for a, b, c, d, e in zip(intermediate.A, intermediate.B, intermediate.C,
+                                     intermediate.D, intermediate.E):
+                yield encode(a, b, c, d, e)
+            return
+        
+        for instr in intermediate:
+            yield self._generate_instruction(instr)
+    
+    def write(self, intermediate: Intermediate, stream: BinaryIO,
+              chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Потоково генерирует машинный код и записывает его в файл порциями.
+        
+        Args:
+            intermediate: Последовательность команд IRInstruction или IRBuffer
+            stream: Двоичный поток для записи
+            chunk_size: Размер порции в байтах
+            
+        Returns:
+            Количество записанных байт
+        """
+        chunk = bytearray()
+        written = 0
+        
+        for instr_bytes in self.iter_generate(intermediate):
+            chunk += instr_bytes
+            if len(chunk) >= chunk_size:
+                stream.write(chunk)
+                written += len(chunk)
+                chunk.clear()
+        
+        if chunk:
+            stream.write(chunk)
+            written += len(chunk)
+        
+        return written
+    
+    def _generate_instruction(self, instr: Union[IRInstruction, Dict]) -> bytes:
+        """Генерирует байты для одной инструкции."""
+        if isinstance(instr, dict):
+            # Поддержка прежнего представления в виде словаря
+            instr = IRInstruction(**instr)
+        return self._encode(instr.A, instr.B, instr.C, instr.D, instr.E)
+    
+    def _encode(self, opcode: int, B: int, C: int, D: int, E: int) -> bytes:
+        """Кодирует команду по значениям полей A-E."""
         if opcode == 2:  # load_const: 5 байт
             # Биты 0-3: код (2)
             # Биты 4-10: адрес (B)
             # Биты 11-37: константа (C) - 27 бит
-            address = instr['B']
-            constant = instr['C']
+            address = B
+            constant = C
             
             # Байт 0: биты 0-3 (opcode), биты 4-7 (младшие 4 бита адреса)
             byte0 = (opcode & 0x0F) | ((address & 0x0F) << 4)
@@ -52,8 +114,8 @@ class CodeGenerator:
             # Биты 0-3: код (7)
             # Биты 4-10: адрес результата (B)
             # Биты 11-17: адрес источника (C)
-            result_addr = instr['B']
-            source_addr = instr['C']
+            result_addr = B
+            source_addr = C
             
             # Байт 0: биты 0-3 (opcode), биты 4-7 (младшие 4 бита адреса результата)
             byte0 = (opcode & 0x0F) | ((result_addr & 0x0F) << 4)
@@ -68,8 +130,8 @@ class CodeGenerator:
             # Биты 0-3: код (5)
             # Биты 4-10: адрес источника (B)
             # Биты 11-17: адрес результата (C)
-            source_addr = instr['B']
-            result_addr = instr['C']
+            source_addr = B
+            result_addr = C
             
             # Байт 0: биты 0-3 (opcode), биты 4-7 (младшие 4 бита адреса источника)
             byte0 = (opcode & 0x0F) | ((source_addr & 0x0F) << 4)
@@ -86,10 +148,10 @@ class CodeGenerator:
             # Биты 11-22: смещение операнда (C) - 12 бит
             # Биты 23-34: смещение результата (D) - 12 бит
             # Биты 35-41: адрес операнда (E) - 7 бит
-            result_addr = instr['B']
-            operand_offset = instr['C']
-            result_offset = instr['D']
-            operand_addr = instr['E']
+            result_addr = B
+            operand_offset = C
+            result_offset = D
+            operand_addr = E
             
             # Байт 0: биты 0-3 (opcode), биты 4-7 (B младшие 4)
             byte0 = (opcode & 0x0F) | ((result_addr & 0x0F) << 4)
@@ -0,0 +1,66 @@
+"""Вычисление целочисленных выражений в полях инструкций."""
+
+import ast
+from functools import lru_cache
+from typing import Any, Dict
+
+
+# Разрешенные узлы AST: только целочисленная арифметика и имена
+_ALLOWED_NODES = (
+    ast.Expression, ast.Constant, ast.Name, ast.Load,
+    ast.BinOp, ast.UnaryOp,
+    ast.Add, ast.Sub, ast.Mult, ast.FloorDiv, ast.Mod,
+    ast.LShift, ast.RShift, ast.BitAnd, ast.BitOr, ast.BitXor,
+    ast.USub, ast.UAdd, ast.Invert,
+)
+
+
+@lru_cache(maxsize=1024)
+def _compile(expression: str):
+    """Проверяет выражение и компилирует его (результат кэшируется)."""
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Некорректное выражение '{expression}': {e.msg}")
+
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"Недопустимая конструкция в выражении '{expression}'")
+        if isinstance(node, ast.Constant) and (
+                not isinstance(node.value, int) or isinstance(node.value, bool)):
+            raise ValueError(f"Допускаются только целые числа: '{expression}'")
+
+    return compile(tree, '<expression>', 'eval')
+
+
+# Пространство имен по умолчанию: без встроенных функций
+_EMPTY_NAMESPACE = {'__builtins__': {}}
+
+
+def evaluate(value: Any, env: Dict[str, int], namespace: Dict[str, Any] = None) -> int:
+    """
+    Вычисляет значение поля инструкции.
+
+    Args:
+        value: Целое число или строка с выражением (например, "0x1000 + 4 * i")
+        env: Значения локальных имен (параметры макросов, счетчики повторений)
+        namespace: Глобальные имена (символы и метки), должен содержать '__builtins__'
+
+    Returns:
+        Целочисленное значение
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Ожидалось целое число, получено: {value}")
+    if isinstance(value, int):
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"Ожидалось целое число или выражение, получено: {value!r}")
+
+    code = _compile(value)
+    try:
+        result = eval(code, namespace or _EMPTY_NAMESPACE, env)
+    except NameError as e:
+        raise ValueError(f"Неизвестное имя в выражении '{value}': {e}")
+    except ZeroDivisionError:
+        raise ValueError(f"Деление на ноль в выражении '{value}'")
+    return result
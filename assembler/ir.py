@@ -0,0 +1,75 @@
+"""Компактное промежуточное представление команд УВМ."""
+
+from array import array
+from typing import Iterator, NamedTuple, Optional
+
+
+class IRInstruction(NamedTuple):
+    """Промежуточное представление одной команды (поля A-E спецификации)."""
+
+    A: int
+    B: int
+    C: int
+    D: Optional[int] = None
+    E: Optional[int] = None
+
+    def __repr__(self):
+        return f"IRInstruction({format_fields(self)})"
+
+
+def format_fields(instr: IRInstruction) -> str:
+    """Форматирует заданные поля команды: 'A=2, B=1, C=5'."""
+    return ", ".join(f"{k}={v}" for k, v in zip(instr._fields, instr) if v is not None)
+
+
+class IRBuffer:
+    """
+    Промежуточное представление программы в виде структуры массивов.
+
+    Каждое поле хранится в отдельном типизированном массиве, поэтому
+    команда занимает 9 байт вместо нескольких сотен байт у словаря.
+    Значения маскируются до разрядности, используемой генератором кода.
+    """
+
+    # Маски полей: A - 4 бита, B - 7 бит, C - до 27 бит, D - 15 бит, E - 7 бит
+    MASK_A = 0x0F
+    MASK_B = 0x7F
+    MASK_C = 0x7FFFFFF
+    MASK_D = 0x7FFF
+    MASK_E = 0x7F
+
+    # Коды операций, у которых есть поля D и E
+    EXTENDED_OPCODES = (13,)
+
+    def __init__(self):
+        self.A = array('B')
+        self.B = array('B')
+        self.C = array('I')
+        self.D = array('H')
+        self.E = array('B')
+
+    def append(self, instr: IRInstruction):
+        """Добавляет команду в конец буфера."""
+        self.A.append(instr.A & self.MASK_A)
+        self.B.append(instr.B & self.MASK_B)
+        self.C.append(instr.C & self.MASK_C)
+        self.D.append((instr.D or 0) & self.MASK_D)
+        self.E.append((instr.E or 0) & self.MASK_E)
+
+    def __len__(self):
+        return len(self.A)
+
+    def __getitem__(self, index: int) -> IRInstruction:
+        a = self.A[index]
+        if a in self.EXTENDED_OPCODES:
+            return IRInstruction(a, self.B[index], self.C[index], self.D[index], self.E[index])
+        return IRInstruction(a, self.B[index], self.C[index])
+
+    def __iter__(self) -> Iterator[IRInstruction]:
+        for index in range(len(self.A)):
+            yield self[index]
+
+    def nbytes(self) -> int:
+        """Возвращает объем памяти, занимаемый данными буфера."""
+        return sum(len(column) * column.itemsize
+                   for column in (self.A, self.B, self.C, self.D, self.E))
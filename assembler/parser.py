@@ -1,31 +1,66 @@
 """Парсер YAML файлов для ассемблера УВМ."""
 
-import yaml
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from assembler.expressions import evaluate
+from assembler.symbols import SymbolTable
+from uvm import isa
 
 
 class Instruction:
     """Класс для представления инструкции."""
     
+    __slots__ = ('opcode', 'values')
+    
+    # Имена полей команд по кодам операций в порядке их следования
+    FIELD_NAMES = isa.FIELD_NAMES
+    
+    # Размеры команд в байтах по кодам операций
+    SIZES = isa.SIZES
+    
     def __init__(self, opcode: int, **kwargs):
         self.opcode = opcode
-        self.fields = kwargs
+        self.values = tuple(kwargs[name] for name in self.FIELD_NAMES[opcode])
+    
+    @classmethod
+    def from_values(cls, opcode: int, values: tuple) -> 'Instruction':
+        """Создает инструкцию из кортежа значений полей (без словаря)."""
+        instr = cls.__new__(cls)
+        instr.opcode = opcode
+        instr.values = values
+        return instr
+    
+    @property
+    def fields(self) -> Dict[str, int]:
+        """Поля инструкции в виде словаря."""
+        return dict(zip(self.FIELD_NAMES[self.opcode], self.values))
     
     def __repr__(self):
         fields_str = ", ".join(f"{k}={v}" for k, v in self.fields.items())
         return f"Instruction(opcode={self.opcode}, {fields_str})"
 
 
+class Macro:
+    """Параметризованный блок инструкций."""
+    
+    def __init__(self, name: str, params: List[str], body: List[Dict[str, Any]]):
+        self.name = name
+        self.params = params
+        self.body = body
+
+
 class Parser:
     """Парсер для преобразования YAML в промежуточное представление."""
     
     # Маппинг имен команд на коды операций
-    OPCODES = {
-        'load_const': 2,
-        'read_mem': 7,
-        'write_mem': 5,
-        'bswap': 13,
-    }
+    OPCODES = isa.OPCODES
+    
+    # Ограничение глубины вложенности макросов и повторений
+    MAX_DEPTH = 64
+    
+    def __init__(self):
+        # Таблица символов и сегменты данных последней разобранной программы
+        self.symbols = SymbolTable()
+        self.data: List[Tuple[int, bytes]] = []
     
     def parse(self, yaml_content: str) -> List[Instruction]:
         """
@@ -37,20 +72,224 @@ class Parser:
         Returns:
             Список объектов Instruction
         """
+        return list(self.iter_parse(yaml_content))
+    
+    def iter_parse(self, yaml_content: str) -> Iterator[Instruction]:
+        """
+        Лениво парсит YAML содержимое, раскрывая блоки repeat и macro.
+        
+        Разбор выполняется в два прохода. Первый проход вычисляет адреса
+        меток по таблице размеров команд, ничего не кодируя. Второй проход
+        порождает инструкции по одной с подстановкой символов, поэтому
+        короткий исходный текст, раскрывающийся в миллионы команд,
+        не материализуется в памяти.
+        
+        Args:
+            yaml_content: Строка с YAML содержимым
+            
+        Returns:
+            Итератор объектов Instruction
+        """
+        # PyYAML импортируется лениво: его загрузка заметно замедляет старт CLI
+        import yaml
         data = yaml.safe_load(yaml_content)
         
         if not isinstance(data, dict) or 'instructions' not in data:
             raise ValueError("YAML должен содержать ключ 'instructions'")
         
-        instructions = []
-        for instr_data in data['instructions']:
-            instruction = self._parse_instruction(instr_data)
-            instructions.append(instruction)
+        macros = self._parse_macros(data.get('macros') or {})
+        symbols = SymbolTable()
+        self._parse_symbols(data.get('symbols') or {}, symbols)
+        segments = self._parse_data(data.get('data') or [], symbols)
+        
+        # Первый проход: адреса меток
+        self._measure(data['instructions'], {}, macros, symbols, 0, 0)
+        self.symbols = symbols
+        self.data = segments
         
-        return instructions
+        # Второй проход: ленивое порождение инструкций
+        return self._expand(data['instructions'], {}, macros, symbols, 0)
     
-    def _parse_instruction(self, instr_data: Dict[str, Any]) -> Instruction:
-        """Парсит одну инструкцию."""
+    def _parse_macros(self, macros_data: Dict[str, Any]) -> Dict[str, Macro]:
+        """Парсит определения макросов."""
+        if not isinstance(macros_data, dict):
+            raise ValueError("Ключ 'macros' должен содержать словарь макросов")
+        
+        macros = {}
+        for name, macro_data in macros_data.items():
+            if not isinstance(macro_data, dict) or 'body' not in macro_data:
+                raise ValueError(f"Макрос '{name}' должен содержать поле 'body'")
+            params = macro_data.get('params') or []
+            macros[name] = Macro(name, list(params), macro_data['body'])
+        return macros
+    
+    def _parse_symbols(self, symbols_data: Dict[str, Any], symbols: SymbolTable):
+        """Парсит именованные константы (могут ссылаться на предыдущие)."""
+        if not isinstance(symbols_data, dict):
+            raise ValueError("Ключ 'symbols' должен содержать словарь констант")
+        
+        for name, value in symbols_data.items():
+            symbols.define_constant(name, evaluate(value, {}, symbols.namespace))
+    
+    def _parse_data(self, data_items: List[Dict[str, Any]],
+                    symbols: SymbolTable) -> List[Tuple[int, bytes]]:
+        """
+        Парсит сегменты данных: 32-битные слова (words) или байты (bytes),
+        размещаемые по адресу address. Поле name определяет константу с адресом сегмента.
+        """
+        if not isinstance(data_items, list):
+            raise ValueError("Ключ 'data' должен содержать список сегментов")
+        
+        segments = []
+        for item in data_items:
+            if not isinstance(item, dict) or 'address' not in item:
+                raise ValueError("Сегмент данных должен содержать поле 'address'")
+            address = evaluate(item['address'], {}, symbols.namespace)
+            if address < 0:
+                raise ValueError(f"Отрицательный адрес сегмента данных: {address}")
+            
+            payload = bytearray()
+            for value in item.get('words') or []:
+                payload += (evaluate(value, {}, symbols.namespace) & 0xFFFFFFFF).to_bytes(4, 'little')
+            for value in item.get('bytes') or []:
+                payload.append(evaluate(value, {}, symbols.namespace) & 0xFF)
+            
+            if 'name' in item:
+                symbols.define_data(item['name'], address)
+            segments.append((address, bytes(payload)))
+        return segments
+    
+    def _static_size(self, items: List[Dict[str, Any]]) -> Optional[int]:
+        """Размер блока из простых инструкций или None, если в нем есть вложенные блоки."""
+        size = 0
+        for item in items:
+            if not isinstance(item, dict) or 'opcode' not in item:
+                return None
+            opcode = self.OPCODES.get(item['opcode'])
+            if opcode is None:
+                return None
+            size += Instruction.SIZES[opcode]
+        return size
+    
+    def _measure(self, items: List[Dict[str, Any]], env: Dict[str, int],
+                 macros: Dict[str, Macro], symbols: SymbolTable,
+                 offset: int, depth: int) -> int:
+        """
+        Первый проход: определяет метки и возвращает смещение после блока.
+        
+        Поля команд не вычисляются, размеры берутся из таблицы
+        Instruction.SIZES, поэтому проход линеен по числу команд, а блоки
+        repeat из простых команд учитываются за O(1).
+        """
+        self._check_block(items, depth)
+        
+        for item in items:
+            if 'label' in item:
+                if depth > 0:
+                    # Метка в теле, раскрываемом несколько раз, была бы определена повторно
+                    raise ValueError(f"Метка '{item['label']}' внутри repeat или macro "
+                                     f"не поддерживается")
+                symbols.define_label(item['label'], offset)
+            elif 'repeat' in item:
+                count, var, body = self._repeat_params(item, env, symbols)
+                static_size = self._static_size(body)
+                if static_size is not None:
+                    offset += count * static_size
+                    continue
+                local_env = dict(env)
+                for i in range(count):
+                    if var:
+                        local_env[var] = i
+                    offset = self._measure(body, local_env, macros, symbols, offset, depth + 1)
+            elif 'macro' in item:
+                macro, macro_env = self._macro_params(item, env, macros, symbols, strict=False)
+                offset = self._measure(macro.body, macro_env, macros, symbols, offset, depth + 1)
+            else:
+                offset += Instruction.SIZES[self._opcode(item)]
+        
+        return offset
+    
+    def _expand(self, items: List[Dict[str, Any]], env: Dict[str, int],
+                macros: Dict[str, Macro], symbols: SymbolTable,
+                depth: int) -> Iterator[Instruction]:
+        """Второй проход: раскрывает последовательность элементов программы."""
+        self._check_block(items, depth)
+        
+        for item in items:
+            if 'label' in item:
+                continue
+            elif 'repeat' in item:
+                count, var, body = self._repeat_params(item, env, symbols)
+                local_env = dict(env)
+                for i in range(count):
+                    if var:
+                        local_env[var] = i
+                    yield from self._expand(body, local_env, macros, symbols, depth + 1)
+            elif 'macro' in item:
+                macro, macro_env = self._macro_params(item, env, macros, symbols, strict=True)
+                yield from self._expand(macro.body, macro_env, macros, symbols, depth + 1)
+            else:
+                yield self._parse_instruction(item, env, symbols)
+    
+    def _check_block(self, items: List[Dict[str, Any]], depth: int):
+        """Проверяет структуру блока инструкций."""
+        if depth > self.MAX_DEPTH:
+            raise ValueError("Превышена глубина вложенности repeat/macro")
+        if not isinstance(items, list):
+            raise ValueError("Тело блока должно быть списком инструкций")
+        for item in items:
+            if not isinstance(item, dict):
+                raise ValueError(f"Некорректный элемент программы: {item!r}")
+    
+    def _repeat_params(self, item: Dict[str, Any], env: Dict[str, int],
+                       symbols: SymbolTable) -> tuple:
+        """Возвращает (число повторений, имя счетчика, тело) блока repeat."""
+        count = evaluate(item['repeat'], env, symbols.namespace)
+        if count < 0:
+            raise ValueError(f"Число повторений не может быть отрицательным: {count}")
+        if 'body' not in item:
+            raise ValueError("Блок repeat должен содержать поле 'body'")
+        return count, item.get('var'), item['body']
+    
+    def _macro_params(self, item: Dict[str, Any], env: Dict[str, int],
+                      macros: Dict[str, Macro], symbols: SymbolTable,
+                      strict: bool) -> tuple:
+        """
+        Возвращает (макрос, значения параметров) для вызова макроса.
+        
+        Состав аргументов проверяется в обоих проходах одинаково. При
+        strict=False (первый проход) не вычисляются только значения
+        аргументов, ссылающиеся на еще не определенные метки: они нужны
+        только второму проходу.
+        """
+        name = item['macro']
+        if name not in macros:
+            raise ValueError(f"Неизвестный макрос: {name}")
+        macro = macros[name]
+        
+        args = item.get('args') or {}
+        if not isinstance(args, dict):
+            raise ValueError(f"Аргументы макроса '{name}' должны быть словарем "
+                             f"параметр: значение (параметры: {macro.params})")
+        unknown = set(args) - set(macro.params)
+        if unknown:
+            raise ValueError(f"Неизвестные аргументы макроса '{name}': {sorted(unknown)}")
+        missing = [p for p in macro.params if p not in args]
+        if missing:
+            raise ValueError(f"Не заданы аргументы макроса '{name}': {missing}")
+        
+        # Тело макроса видит только свои параметры и глобальные символы
+        macro_env = {}
+        for param in macro.params:
+            try:
+                macro_env[param] = evaluate(args[param], env, symbols.namespace)
+            except ValueError:
+                if strict:
+                    raise
+        return macro, macro_env
+    
+    def _opcode(self, instr_data: Dict[str, Any]) -> int:
+        """Возвращает код операции инструкции."""
         if 'opcode' not in instr_data:
             raise ValueError("Инструкция должна содержать поле 'opcode'")
         
@@ -58,24 +297,20 @@ class Parser:
         if opcode_name not in self.OPCODES:
             raise ValueError(f"Неизвестный код операции: {opcode_name}")
         
-        opcode = self.OPCODES[opcode_name]
-        fields = {}
+        return self.OPCODES[opcode_name]
+    
+    def _parse_instruction(self, instr_data: Dict[str, Any],
+                           env: Dict[str, int] = None,
+                           symbols: SymbolTable = None) -> Instruction:
+        """Парсит одну инструкцию."""
+        opcode = self._opcode(instr_data)
+        env = env or {}
+        namespace = symbols.namespace if symbols is not None else None
         
         # Парсинг полей в зависимости от типа команды
-        if opcode_name == 'load_const':
-            fields['address'] = instr_data.get('address', 0)
-            fields['constant'] = instr_data.get('constant', 0)
-        elif opcode_name == 'read_mem':
-            fields['result_addr'] = instr_data.get('result_addr', 0)
-            fields['source_addr'] = instr_data.get('source_addr', 0)
-        elif opcode_name == 'write_mem':
-            fields['source_addr'] = instr_data.get('source_addr', 0)
-            fields['result_addr'] = instr_data.get('result_addr', 0)
-        elif opcode_name == 'bswap':
-            fields['result_addr'] = instr_data.get('result_addr', 0)
-            fields['result_offset'] = instr_data.get('result_offset', 0)
-            fields['operand_offset'] = instr_data.get('operand_offset', 0)
-            fields['operand_addr'] = instr_data.get('operand_addr', 0)
-        
-        return Instruction(opcode, **fields)
-
+        values = tuple(
+            evaluate(instr_data.get(name, 0), env, namespace)
+            for name in Instruction.FIELD_NAMES[opcode]
+        )
+        
+        return Instruction.from_values(opcode, values)
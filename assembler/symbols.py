@@ -0,0 +1,63 @@
+"""Таблица символов ассемблера УВМ: метки и именованные константы."""
+
+import json
+from pathlib import Path
+from typing import Dict
+
+
+# Формат и версия файла карты символов
+SYMBOL_MAP_FORMAT = 'uvm-symbols'
+SYMBOL_MAP_VERSION = 1
+
+
+class SymbolTable:
+    """Таблица символов: именованные константы и метки (смещения в коде)."""
+
+    def __init__(self):
+        self.constants: Dict[str, int] = {}
+        self.labels: Dict[str, int] = {}
+        # Константы с адресами сегментов данных (подмножество constants)
+        self.data: Dict[str, int] = {}
+        # Пространство имен для вычисления выражений
+        self.namespace: Dict[str, object] = {'__builtins__': {}}
+
+    def _check_name(self, name: str):
+        """Проверяет, что имя корректно и еще не определено."""
+        if not isinstance(name, str) or not name.isidentifier():
+            raise ValueError(f"Некорректное имя символа: {name!r}")
+        if name in self.constants or name in self.labels:
+            raise ValueError(f"Символ '{name}' определен повторно")
+
+    def define_constant(self, name: str, value: int):
+        """Определяет именованную константу."""
+        self._check_name(name)
+        self.constants[name] = value
+        self.namespace[name] = value
+
+    def define_data(self, name: str, address: int):
+        """Определяет константу с адресом сегмента данных."""
+        self.define_constant(name, address)
+        self.data[name] = address
+
+    def define_label(self, name: str, offset: int):
+        """Определяет метку - смещение следующей команды в машинном коде."""
+        self._check_name(name)
+        self.labels[name] = offset
+        self.namespace[name] = offset
+
+    def to_dict(self) -> Dict:
+        """Возвращает карту символов в виде словаря."""
+        return {
+            'format': SYMBOL_MAP_FORMAT,
+            'version': SYMBOL_MAP_VERSION,
+            'labels': dict(self.labels),
+            'constants': dict(self.constants),
+            'data': dict(self.data),
+        }
+
+    def save(self, path: Path):
+        """Сохраняет карту символов в JSON файл."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
@@ -1,13 +1,14 @@
 """Транслятор для преобразования инструкций в промежуточное представление."""
 
-from typing import List, Dict
+from typing import List, Iterable, Iterator
 from assembler.parser import Instruction
+from assembler.ir import IRInstruction, IRBuffer
 
 
 class Translator:
     """Транслятор инструкций в промежуточное представление."""
     
-    def translate(self, instructions: List[Instruction]) -> List[Dict]:
+    def translate(self, instructions: Iterable[Instruction]) -> List[IRInstruction]:
         """
         Преобразует список инструкций в промежуточное представление.
         
@@ -15,34 +16,50 @@ class Translator:
             instructions: Список объектов Instruction
             
         Returns:
-            Список словарей с полями команд
+            Список команд IRInstruction
         """
-        intermediate = []
+        return list(self.iter_translate(instructions))
+    
+    def translate_compact(self, instructions: Iterable[Instruction]) -> IRBuffer:
+        """
+        Преобразует инструкции в компактное представление (структуру массивов).
         
-        for instr in instructions:
-            representation = self._translate_instruction(instr)
-            intermediate.append(representation)
+        Args:
+            instructions: Итерируемая последовательность объектов Instruction
+            
+        Returns:
+            Буфер IRBuffer
+        """
+        buffer = IRBuffer()
+        for instr in self.iter_translate(instructions):
+            buffer.append(instr)
+        return buffer
+    
+    def iter_translate(self, instructions: Iterable[Instruction]) -> Iterator[IRInstruction]:
+        """
+        Лениво преобразует инструкции в промежуточное представление.
         
-        return intermediate
+        Args:
+            instructions: Итерируемая последовательность объектов Instruction
+            
+        Returns:
+            Итератор команд IRInstruction
+        """
+        for instr in instructions:
+            yield self._translate_instruction(instr)
     
-    def _translate_instruction(self, instr: Instruction) -> Dict:
+    def _translate_instruction(self, instr: Instruction) -> IRInstruction:
         """Преобразует одну инструкцию в промежуточное представление."""
-        result = {'A': instr.opcode}
+        values = instr.values
         
-        if instr.opcode == 2:  # load_const
-            result['B'] = instr.fields['address']
-            result['C'] = instr.fields['constant']
-        elif instr.opcode == 7:  # read_mem
-            result['B'] = instr.fields['result_addr']
-            result['C'] = instr.fields['source_addr']
-        elif instr.opcode == 5:  # write_mem
-            result['B'] = instr.fields['source_addr']
-            result['C'] = instr.fields['result_addr']
+        if instr.opcode == 2:  # load_const: B=address, C=constant
+            return IRInstruction(2, values[0], values[1])
+        elif instr.opcode == 7:  # read_mem: B=result_addr, C=source_addr
+            return IRInstruction(7, values[0], values[1])
+        elif instr.opcode == 5:  # write_mem: B=source_addr, C=result_addr
+            return IRInstruction(5, values[0], values[1])
         elif instr.opcode == 13:  # bswap
-            result['B'] = instr.fields['result_addr']
-            result['C'] = instr.fields['operand_offset']
-            result['D'] = instr.fields['result_offset']
-            result['E'] = instr.fields['operand_addr']
+            result_addr, result_offset, operand_offset, operand_addr = values
+            return IRInstruction(13, result_addr, operand_offset, result_offset, operand_addr)
         
-        return result
-
+        raise ValueError(f"Неизвестный код операции: {instr.opcode}")
@@ -0,0 +1 @@
+"""Модуль дизассемблера УВМ."""
@@ -0,0 +1,130 @@
+"""CLI для дизассемблера УВМ."""
+
+import argparse
+import mmap
+import sys
+from pathlib import Path
+from typing import Dict, List
+from uvm.objfile import ObjectFile, is_object_file
+from disassembler.decoder import iter_decode, iter_decode_stream, open_mapped
+from disassembler.formatter import iter_yaml, iter_listing
+
+
+# Число строк, накапливаемых перед записью в выходной поток
+BATCH_LINES = 4096
+
+
+def write_batched(lines, stream):
+    """Записывает строки в поток пакетами."""
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= BATCH_LINES:
+            stream.write(''.join(batch))
+            batch.clear()
+    if batch:
+        stream.write(''.join(batch))
+
+
+def labels_by_offset(symbols: Dict) -> Dict[int, List[str]]:
+    """Возвращает метки из карты символов, сгруппированные по смещениям."""
+    labels: Dict[int, List[str]] = {}
+    for name, offset in (symbols or {}).get('labels', {}).items():
+        labels.setdefault(offset, []).append(name)
+    return labels
+
+
+def main():
+    """Главная функция CLI дизассемблера."""
+    parser = argparse.ArgumentParser(description='Дизассемблер для учебной виртуальной машины')
+    parser.add_argument('input_file', type=str, help='Путь к бинарному файлу программы')
+    parser.add_argument('output_file', type=str, nargs='?', default=None,
+                        help='Путь к выходному файлу (по умолчанию - стандартный вывод)')
+    parser.add_argument('--listing', action='store_true',
+                        help='Листинг: одна строка на команду со смещением и байтами')
+    parser.add_argument('--chunked', action='store_true',
+                        help='Читать файл порциями вместо отображения в память (только сырой код)')
+    parser.add_argument('--first', type=int, default=None,
+                        help='Номер первой команды (произвольный доступ по индексу смещений)')
+    parser.add_argument('--count', type=int, default=None,
+                        help='Число команд, начиная с --first')
+    
+    args = parser.parse_args()
+    
+    # Открываем входной файл
+    try:
+        mapped = open_mapped(args.input_file)
+    except FileNotFoundError:
+        print(f"Ошибка: файл {args.input_file} не найден", file=sys.stderr)
+        sys.exit(1)
+    except Exception as e:
+        print(f"Ошибка при чтении файла: {e}", file=sys.stderr)
+        sys.exit(1)
+    
+    stream = None
+    try:
+        # Определяем формат и источник команд
+        symbols = None
+        data = None
+        try:
+            if is_object_file(mapped):
+                obj = ObjectFile.from_bytes(mapped)
+                symbols = obj.symbols
+                data = obj.data
+            else:
+                obj = ObjectFile(mapped)
+        
+            if args.chunked and not is_object_file(mapped) and args.first is None:
+                stream = open(args.input_file, 'rb')
+                decoded = iter_decode_stream(stream)
+            else:
+                start, end = 0, len(obj.code)
+                if args.first is not None:
+                    count = obj.instruction_count()
+                    first = min(args.first, count)
+                    last = count if args.count is None else min(count, first + args.count)
+                    start = obj.instruction_offset(first) if first < count else end
+                    end = obj.instruction_offset(last) if last < count else end
+                decoded = iter_decode(obj.code, start, end)
+        except Exception as e:
+            print(f"Ошибка при чтении программы: {e}", file=sys.stderr)
+            sys.exit(1)
+    
+        labels = labels_by_offset(symbols)
+        if args.listing:
+            lines = iter_listing(decoded, labels)
+        elif args.first is not None:
+            lines = iter_yaml(decoded)
+        else:
+            constants = (symbols or {}).get('constants')
+            lines = iter_yaml(decoded, labels, constants, data, (symbols or {}).get('data'))
+    
+        # Записываем результат
+        try:
+            if args.output_file:
+                output_path = Path(args.output_file)
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(output_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                    write_batched(lines, f)
+            else:
+                write_batched(lines, sys.stdout)
+        except Exception as e:
+            print(f"Ошибка при дизассемблировании: {e}", file=sys.stderr)
+            sys.exit(1)
+    finally:
+        # Генераторы и объектный файл ссылаются на отображение через memoryview;
+        # их нужно освободить до закрытия отображения
+        lines = decoded = obj = data = None
+        if stream is not None:
+            stream.close()
+        if isinstance(mapped, mmap.mmap):
+            try:
+                mapped.close()
+            except BufferError:
+                # После ошибки на представления еще ссылается трассировка
+                # исключения; отображение закроется при выходе из процесса
+                pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Потоковый декодер машинного кода УВМ."""
+
+import mmap
+from typing import BinaryIO, Iterator, Tuple
+from uvm import isa
+
+
+# Биты, которые генератор кода всегда оставляет нулевыми. Команда с
+# ненулевыми зарезервированными битами не может быть восстановлена
+# ассемблером байт в байт, поэтому считается ошибкой.
+RESERVED_MASKS = {
+    2: 0xC0 << 32,                     # load_const: биты 38-39
+    7: 0xFC << 16,                     # read_mem: биты 18-23
+    5: 0xFC << 16,                     # write_mem: биты 18-23
+    13: (0x03 << 32) | (0xF0 << 40),   # bswap: биты 32-33 и 44-47
+}
+
+# Декодированная команда: (смещение, код операции, значения полей, кодировка)
+Decoded = Tuple[int, int, Tuple[int, ...], int]
+
+
+class DecodeError(ValueError):
+    """Ошибка декодирования машинного кода."""
+
+
+def decode_fields(opcode: int, word: int) -> tuple:
+    """
+    Извлекает поля команды из ее кодировки (little-endian целое).
+
+    Значения возвращаются в порядке полей исходного текста
+    (см. isa.FIELD_NAMES), т.е. в том виде, в котором их принимает Parser.
+    """
+    if opcode == 2:  # load_const: address, constant
+        return ((word >> 4) & 0x7F, (word >> 11) & 0x7FFFFFF)
+    elif opcode == 7 or opcode == 5:  # read_mem/write_mem: B, C
+        return ((word >> 4) & 0x7F, (word >> 11) & 0x7F)
+    elif opcode == 13:  # bswap: result_addr, result_offset, operand_offset, operand_addr
+        result_addr = (word >> 4) & 0x7F
+        operand_offset = (word >> 11) & 0x1FF
+        result_offset = ((word >> 20) & 0xFFF) | (((word >> 37) & 0x07) << 12)
+        operand_addr = ((word >> 34) & 0x07) | (((word >> 40) & 0x0F) << 3)
+        return (result_addr, result_offset, operand_offset, operand_addr)
+    raise DecodeError(f"Неизвестный код операции: {opcode}")
+
+
+def _decode_range(view: memoryview, pos: int, end: int, base: int,
+                  partial: bool) -> Iterator[Decoded]:
+    """
+    Декодирует команды в диапазоне [pos, end).
+
+    При partial=True обрезанная последняя команда не считается ошибкой:
+    генератор останавливается и возвращает ее смещение.
+    """
+    sizes = isa.SIZES
+    reserved = RESERVED_MASKS
+    from_bytes = int.from_bytes
+
+    while pos < end:
+        opcode = view[pos] & 0x0F
+        size = sizes.get(opcode)
+        if size is None:
+            raise DecodeError(f"Неизвестный код операции {opcode} по смещению {base + pos}")
+        if pos + size > end:
+            if partial:
+                return pos
+            raise DecodeError(f"Обрезанная команда по смещению {base + pos}")
+        word = from_bytes(view[pos:pos + size], 'little')
+        if word & reserved[opcode]:
+            raise DecodeError(f"Ненулевые зарезервированные биты по смещению {base + pos}")
+        yield base + pos, opcode, decode_fields(opcode, word), word
+        pos += size
+    return pos
+
+
+def iter_decode(code, start: int = 0, end: int = None) -> Iterator[Decoded]:
+    """
+    Декодирует команды из буфера (bytes, memoryview или mmap) без копирования.
+
+    Args:
+        code: Буфер с машинным кодом
+        start: Смещение первой команды в буфере
+        end: Граница декодирования (по умолчанию - конец буфера)
+
+    Returns:
+        Итератор кортежей (смещение, код операции, значения полей, кодировка)
+    """
+    view = memoryview(code)
+    return _decode_range(view, start, len(view) if end is None else end, 0, False)
+
+
+def iter_decode_stream(stream: BinaryIO, chunk_size: int = 1 << 20) -> Iterator[Decoded]:
+    """
+    Декодирует команды из потока, читая его порциями.
+
+    Команда, разрезанная границей порции, переносится в следующую порцию,
+    поэтому в памяти одновременно находится не более одной порции.
+    """
+    tail = b''
+    base = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        view = memoryview(tail + chunk if tail else chunk)
+        pos = yield from _decode_range(view, 0, len(view), base, True)
+        tail = bytes(view[pos:])
+        base += pos
+
+    if tail:
+        yield from _decode_range(memoryview(tail), 0, len(tail), base, False)
+
+
+def open_mapped(path: str):
+    """Отображает файл в память (для пустого файла возвращает b'')."""
+    with open(path, 'rb') as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return b''
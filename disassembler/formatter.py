@@ -0,0 +1,96 @@
+"""Форматирование результатов дизассемблирования."""
+
+from typing import Dict, Iterable, Iterator, List, Tuple
+from uvm import isa
+from disassembler.decoder import Decoded
+
+
+def _yaml_templates() -> Dict[int, str]:
+    """Шаблоны YAML для команд (формируются один раз)."""
+    templates = {}
+    for opcode, names in isa.FIELD_NAMES.items():
+        lines = [f"  - opcode: {isa.OPCODE_NAMES[opcode]}"]
+        lines += [f"    {name}: {{}}" for name in names]
+        templates[opcode] = "\n".join(lines) + "\n"
+    return templates
+
+
+def iter_yaml(decoded: Iterable[Decoded], labels: Dict[int, List[str]] = None,
+              constants: Dict[str, int] = None,
+              data: List[Tuple[int, bytes]] = None,
+              data_names: Dict[str, int] = None) -> Iterator[str]:
+    """
+    Формирует исходный текст в формате, который принимает Parser.
+
+    Args:
+        decoded: Декодированные команды
+        labels: Метки по смещениям в коде
+        constants: Именованные константы (имена сегментов данных пропускаются)
+        data: Сегменты данных (адрес, байты)
+        data_names: Имена сегментов данных (имя -> адрес)
+
+    Returns:
+        Итератор фрагментов текста
+    """
+    data_names = data_names or {}
+    constants = {name: value for name, value in (constants or {}).items()
+                 if name not in data_names}
+    if constants:
+        yield "symbols:\n"
+        for name, value in constants.items():
+            yield f"  {name}: {value}\n"
+
+    if data:
+        names: Dict[int, List[str]] = {}
+        for name, address in data_names.items():
+            names.setdefault(address, []).append(name)
+        yield "data:\n"
+        for address, segment in data:
+            segment = bytes(segment)
+            yield f"  - address: 0x{address:04X}\n"
+            if names.get(address):
+                yield f"    name: {names[address].pop(0)}\n"
+            if len(segment) % 4 == 0:
+                words = ", ".join(
+                    f"0x{int.from_bytes(segment[i:i + 4], 'little'):08X}"
+                    for i in range(0, len(segment), 4)
+                )
+                yield f"    words: [{words}]\n"
+            else:
+                yield f"    bytes: [{', '.join(f'0x{b:02X}' for b in segment)}]\n"
+
+    yield "instructions:\n"
+    templates = _yaml_templates()
+    labels = labels or {}
+    for offset, opcode, fields, _ in decoded:
+        if offset in labels:
+            for name in labels.pop(offset):
+                yield f"  - label: {name}\n"
+        yield templates[opcode].format(*fields)
+
+    # Метки в конце кода
+    for offset in sorted(labels):
+        for name in labels[offset]:
+            yield f"  - label: {name}\n"
+
+
+def iter_listing(decoded: Iterable[Decoded], labels: Dict[int, List[str]] = None) -> Iterator[str]:
+    """
+    Формирует листинг: одна строка на команду со смещением и байтами.
+
+    Пример строки:
+        0x0000: C2 E7 19 00 00     load_const address=124, constant=828
+    """
+    labels = labels or {}
+    names = {opcode: (isa.OPCODE_NAMES[opcode], fields)
+             for opcode, fields in isa.FIELD_NAMES.items()}
+    sizes = isa.SIZES
+    for offset, opcode, values, word in decoded:
+        if offset in labels:
+            for name in labels[offset]:
+                yield f"{name}:\n"
+        size = sizes[opcode]
+        hex_bytes = word.to_bytes(size, 'little').hex(' ').upper()
+        opcode_name, field_names = names[opcode]
+        fields = ", ".join(f"{k}={v}" for k, v in zip(field_names, values))
+        yield f"0x{offset:04X}: {hex_bytes:<18} {opcode_name} {fields}\n"
@@ -0,0 +1,217 @@
+"""
+Асинхронный интерфейс выполнения программ УВМ (asyncio).
+
+Задания выполняются в ограниченном пуле процессов на тех же Memory/CPU,
+что и сервер (interpreter.server.run_job):
+
+    async with AsyncExecutor(workers=4) as executor:
+        result = await executor.submit(program_bytes, (0x1000, 0x1100))
+        async for chunk in executor.stream(program_bytes, (0, 0xFFFC)):
+            ...
+
+Задание stream() выполняется в блоке разделяемой памяти
+(interpreter.shared): итоговая память не сериализуется целиком, а
+читается родительским процессом порциями прямо из блока.
+"""
+
+import asyncio
+import atexit
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from interpreter.memory import Memory
+from interpreter.server import run_job, _init_worker
+from interpreter.shared import SharedMemoryImage, run_shared
+
+
+class JobResult:
+    """Результат выполнения задания."""
+
+    def __init__(self, steps: int, start: int, region: Optional[bytes], words: Dict[int, int]):
+        self.steps = steps
+        self.start = start
+        self.region = region
+        self.words = words
+
+    def read_word(self, address: int) -> int:
+        """Читает слово из диапазона дампа."""
+        offset = address - self.start
+        if self.region is None or offset < 0 or offset + 4 > len(self.region):
+            raise IndexError(f"Адрес вне диапазона дампа: {address}")
+        return int.from_bytes(self.region[offset:offset + 4], 'little')
+
+    def dump(self) -> List[Tuple[int, int]]:
+        """Возвращает дамп в виде списка пар (адрес, значение)."""
+        return list(iter_words(self.start, self.region or b''))
+
+    def to_memory_dump(self):
+        """Строит XML дамп (create_memory_dump) по диапазону задания."""
+        from interpreter.cli import create_memory_dump
+
+        region = self.region or b''
+        memory = Memory(self.start + len(region))
+        memory.load_program(region, self.start)
+        return create_memory_dump(memory, self.start, self.start + len(region) - 4)
+
+
+def iter_words(start: int, region: bytes):
+    """Итерирует пары (адрес, значение) по байтам диапазона."""
+    for i in range(0, len(region), 4):
+        yield start + i, int.from_bytes(region[i:i + 4], 'little')
+
+
+class AsyncExecutor:
+    """
+    Асинхронный исполнитель заданий на ограниченном пуле процессов.
+
+    Число одновременно принятых заданий ограничено max_pending: submit()
+    ожидает, пока не освободится место (обратное давление). Отмена
+    ожидающей корутины отменяет задание, если оно еще не начато; начатое
+    задание доводится до конца в рабочем процессе, но его результат
+    отбрасывается. Тайм-аут задания передается также в CPU.execute,
+    поэтому рабочий процесс освобождается не позже тайм-аута.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 memory_size: int = 65536):
+        """
+        Args:
+            workers: Число рабочих процессов (по умолчанию - число ядер)
+            max_pending: Максимум одновременно принятых заданий
+                (по умолчанию - удвоенное число процессов)
+            memory_size: Размер памяти УВМ в байтах
+        """
+        workers = workers or os.cpu_count() or 1
+        # Рабочие процессы должны использовать общий с родителем учет блоков
+        # разделяемой памяти, иначе блоки stream() считаются утекшими
+        resource_tracker.ensure_running()
+        self._pool = ProcessPoolExecutor(workers, initializer=_init_worker,
+                                         initargs=(memory_size,))
+        if max_pending is None:
+            max_pending = 2 * workers
+        self._slots = asyncio.Semaphore(max_pending)
+        self._memory_size = memory_size
+
+    async def __aenter__(self) -> 'AsyncExecutor':
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def submit(self, program: bytes, dump_range: Optional[Tuple[int, int]] = None,
+                     words: List[int] = (), timeout: Optional[float] = None,
+                     max_steps: Optional[int] = None) -> JobResult:
+        """
+        Выполняет программу и возвращает результат.
+
+        Args:
+            program: Содержимое бинарного файла (объектного или сырого)
+            dump_range: Диапазон дампа (начальный, конечный адрес включительно)
+            words: Адреса отдельных слов для чтения
+            timeout: Тайм-аут задания в секундах
+            max_steps: Лимит числа команд
+
+        Raises:
+            asyncio.TimeoutError: Задание не завершилось за timeout
+            ExecutionLimitError: Превышен лимит шагов или времени в CPU
+        """
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._pool, run_job, program, dump_range,
+                                          list(words), max_steps, timeout)
+            try:
+                if timeout is None:
+                    result = await future
+                else:
+                    result = await asyncio.wait_for(future, timeout)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+
+        start = dump_range[0] if dump_range is not None else 0
+        return JobResult(result['steps'], start, result['region'], result['words'])
+
+    async def stream(self, program: bytes, dump_range: Tuple[int, int],
+                     chunk_words: int = 1024, timeout: Optional[float] = None,
+                     max_steps: Optional[int] = None) -> AsyncIterator[List[Tuple[int, int]]]:
+        """
+        Выполняет программу и выдает дамп порциями по chunk_words слов.
+
+        Дамп описывает итоговое состояние, поэтому первая порция выдается
+        после завершения задания. Рабочий процесс выполняет программу в
+        блоке разделяемой памяти и не передает дамп целиком: каждая порция
+        копируется из блока в момент выдачи, так что память родительского
+        процесса ограничена одной порцией, а размер дампа - размером памяти.
+        Между порциями управление возвращается циклу событий.
+
+        Raises:
+            asyncio.TimeoutError: Задание не завершилось за timeout
+            ExecutionLimitError: Превышен лимит шагов или времени в CPU
+        """
+        start, end = dump_range
+        end = min(end, self._memory_size - 4)
+        if start < 0:
+            raise ValueError(f"Некорректный диапазон дампа: {dump_range}")
+        # Байты слов start, start+4, ..., не превышающих end
+        stop = start + max(end - start, -4) // 4 * 4 + 4
+
+        image = SharedMemoryImage(self._memory_size)
+        try:
+            async with self._slots:
+                loop = asyncio.get_running_loop()
+                future = loop.run_in_executor(self._pool, run_shared, image.name, image.size,
+                                              program, max_steps, timeout)
+                try:
+                    if timeout is None:
+                        await future
+                    else:
+                        await asyncio.wait_for(future, timeout)
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+
+            chunk_bytes = chunk_words * 4
+            for offset in range(start, stop, chunk_bytes):
+                chunk = bytes(image.data[offset:min(offset + chunk_bytes, stop)])
+                yield list(iter_words(offset, chunk))
+                await asyncio.sleep(0)
+        finally:
+            image.close()
+            image.unlink()
+
+    async def close(self):
+        """Завершает пул процессов, дождавшись выполняемых заданий."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._pool.shutdown)
+
+
+async def submit(program: bytes, dump_range: Optional[Tuple[int, int]] = None,
+                 **kwargs) -> JobResult:
+    """Выполняет одно задание на исполнителе по умолчанию."""
+    return await default_executor().submit(program, dump_range, **kwargs)
+
+
+_default_executor: Optional[AsyncExecutor] = None
+
+
+def default_executor() -> AsyncExecutor:
+    """
+    Возвращает общий исполнитель (создается при первом обращении).
+
+    Его пул процессов завершается при выходе из интерпретатора (atexit),
+    вызывать close() не требуется.
+    """
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = AsyncExecutor()
+    return _default_executor
+
+
+@atexit.register
+def shutdown_default_executor():
+    """Завершает пул процессов общего исполнителя, отменяя не начатые задания."""
+    global _default_executor
+    if _default_executor is not None:
+        _default_executor._pool.shutdown(cancel_futures=True)
+        _default_executor = None
@@ -0,0 +1,225 @@
+"""
+Пакетное выполнение одной программы УВМ над множеством образов памяти.
+
+В УВМ нет переходов, поэтому все экземпляры выполняют одну и ту же
+последовательность команд. K образов памяти хранятся строками двумерного
+массива NumPy (K x размер, uint8), K наборов регистров - массивом
+K x 128 (uint32); каждая команда выполняется один раз сразу для всех
+экземпляров векторными выборками и записями:
+
+    batch = BatchMemory.from_memories(memories)
+    cpu = BatchCPU(batch)
+    cpu.execute(code)
+    for i in range(len(batch)):
+        print(batch.read_word(i, 0x1000), cpu.errors[i])
+
+Ошибка обращения к памяти останавливает только свой экземпляр (его
+состояние совпадает с состоянием CPU после той же ошибки), остальные
+продолжают выполнение. NumPy - необязательная зависимость.
+"""
+
+import time
+from typing import List, Optional, Sequence, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy - необязательная зависимость
+    np = None
+
+from interpreter.memory import Memory
+from interpreter.cpu import ExecutionLimitError
+from interpreter.predecode import DecodedProgram, iter_fields
+from uvm import isa
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("Для пакетного выполнения требуется NumPy (pip install numpy)")
+
+
+class BatchMemory:
+    """Образы памяти и регистры K экземпляров УВМ в массивах NumPy."""
+
+    def __init__(self, count: int, size: int = 65536):
+        """
+        Args:
+            count: Число экземпляров
+            size: Размер памяти каждого экземпляра в байтах
+        """
+        _require_numpy()
+        if count < 1:
+            raise ValueError("Число экземпляров должно быть положительным")
+        self.size = size
+        self.data = np.zeros((count, size), dtype=np.uint8)
+        self.registers = np.zeros((count, 128), dtype=np.uint32)
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    @classmethod
+    def from_memories(cls, memories: Sequence[Memory]) -> 'BatchMemory':
+        """Создает пакет из копий объектов памяти одного размера."""
+        if not memories:
+            raise ValueError("Пустой список образов памяти")
+        batch = cls(len(memories), memories[0].size)
+        for i, memory in enumerate(memories):
+            if memory.size != batch.size:
+                raise ValueError(f"Размеры памяти не совпадают: {memory.size} и {batch.size}")
+            batch.data[i] = np.frombuffer(bytes(memory.data), dtype=np.uint8)
+            batch.registers[i] = memory.registers
+        return batch
+
+    @classmethod
+    def from_memory(cls, memory: Memory, count: int) -> 'BatchMemory':
+        """Создает пакет из count копий одного образа памяти."""
+        batch = cls(count, memory.size)
+        batch.data[:] = np.frombuffer(bytes(memory.data), dtype=np.uint8)
+        batch.registers[:] = memory.registers
+        return batch
+
+    def memory(self, index: int) -> Memory:
+        """Возвращает копию состояния экземпляра в виде объекта Memory."""
+        memory = Memory(self.size)
+        memory.data[:] = self.data[index].tobytes()
+        memory.registers[:] = self.registers[index].tolist()
+        return memory
+
+    def load_program(self, program_bytes: bytes, offset: int = 0):
+        """Загружает программу в память всех экземпляров."""
+        count = max(0, min(len(program_bytes), self.size - offset))
+        self.data[:, offset:offset + count] = np.frombuffer(bytes(program_bytes[:count]),
+                                                            dtype=np.uint8)
+
+    def read_word(self, index: int, address: int) -> int:
+        """Читает 32-битное слово (little-endian) из памяти экземпляра."""
+        if address < 0 or address + 4 > self.size:
+            raise IndexError(f"Адрес памяти вне диапазона: {address}")
+        return int.from_bytes(self.data[index, address:address + 4].tobytes(), 'little')
+
+
+class BatchCPU:
+    """CPU, выполняющий одну программу синхронно на всех экземплярах пакета."""
+
+    def __init__(self, batch: BatchMemory):
+        """
+        Args:
+            batch: Пакет образов памяти
+        """
+        self.batch = batch
+        self.pc = 0
+        count = len(batch)
+        self.steps = np.zeros(count, dtype=np.int64)  # Число выполненных команд
+        self.errors: List[Optional[str]] = [None] * count  # Ошибки экземпляров
+        self._rows = np.arange(count)  # Номера выполняющихся экземпляров
+        self._flat = batch.data.reshape(-1)
+        self._offsets = np.arange(4)
+
+    @property
+    def active(self) -> int:
+        """Число экземпляров, выполнение которых не остановлено ошибкой."""
+        return len(self._rows)
+
+    def execute(self, program: Union[bytes, DecodedProgram], max_steps: Optional[int] = None,
+                time_limit: Optional[float] = None):
+        """
+        Выполняет программу на всех экземплярах.
+
+        Ошибки обращения к памяти записываются в errors и останавливают
+        только свой экземпляр. Ошибка декодирования останавливает все
+        оставшиеся экземпляры.
+
+        Args:
+            program: Машинный код или декодированная программа (DecodedProgram)
+            max_steps: Максимальное число выполняемых команд
+            time_limit: Максимальное время выполнения в секундах
+
+        Raises:
+            ExecutionLimitError: Если превышен лимит шагов или времени
+        """
+        deadline = time.monotonic() + time_limit if time_limit is not None else None
+        batch = self.batch
+        registers = batch.registers
+        limit = batch.size - 4
+        instructions = iter(program) if isinstance(program, DecodedProgram) else iter_fields(program)
+        sizes = isa.SIZES
+        step = 0
+
+        while len(self._rows):
+            try:
+                pc, opcode, B, C, D, E = next(instructions)
+            except StopIteration:
+                break
+            except ValueError as e:
+                self._fail(self._rows, step, f"Ошибка выполнения на адресе {self.pc}: {e}")
+                break
+            self.pc = pc
+            if max_steps is not None and step >= max_steps:
+                self.steps[self._rows] = step
+                raise ExecutionLimitError(f"Превышен лимит шагов ({max_steps}) на адресе {pc}")
+            if deadline is not None and time.monotonic() > deadline:
+                self.steps[self._rows] = step
+                raise ExecutionLimitError(f"Превышен лимит времени выполнения на адресе {pc}")
+
+            rows = self._rows
+            if opcode == 2:
+                registers[rows, B] = C
+            elif opcode == 7:
+                address = registers[rows, C].astype(np.int64)
+                ok, raw = self._fetch(rows, address, limit, step)
+                registers[rows[ok], B] = raw.view('<u4').reshape(-1)
+            elif opcode == 5:
+                address = registers[rows, C].astype(np.int64)
+                raw = registers[rows, B].astype('<u4').view(np.uint8).reshape(-1, 4)
+                self._store(rows, address, raw, limit, step)
+            else:
+                source = registers[rows, E].astype(np.int64) + C
+                target = registers[rows, B].astype(np.int64) + D
+                ok, raw = self._fetch(rows, source, limit, step)
+                self._store(rows[ok], target[ok], raw[:, ::-1], limit, step)
+            self.pc = pc + sizes[opcode]
+            step += 1
+
+        self.steps[self._rows] = step
+
+    def _fetch(self, rows, address, limit: int, step: int):
+        """
+        Читает слова по адресам экземпляров rows.
+
+        Returns:
+            (маска успешных чтений, байты слов K x 4); экземпляры с адресом
+            вне памяти останавливаются
+        """
+        ok = address <= limit
+        if not ok.all():
+            bad = ~ok
+            for row, addr in zip(rows[bad].tolist(), address[bad].tolist()):
+                self._fail(row, step, self._address_error(max(addr, self.batch.size)))
+            rows, address = rows[ok], address[ok]
+        index = (rows * self.batch.size + address)[:, None] + self._offsets
+        return ok, self._flat[index]
+
+    def _store(self, rows, address, raw, limit: int, step: int):
+        """Записывает слова (байты K x 4) по адресам экземпляров rows."""
+        ok = address <= limit
+        if not ok.all():
+            # Как Memory.write_word: байты в границах записываются до ошибки
+            size = self.batch.size
+            bad = ~ok
+            for row, addr, word in zip(rows[bad].tolist(), address[bad].tolist(), raw[bad]):
+                for k in range(max(0, size - addr)):
+                    self.batch.data[row, addr + k] = word[k]
+                self._fail(row, step, self._address_error(max(addr, size)))
+            rows, address, raw = rows[ok], address[ok], raw[ok]
+        index = (rows * self.batch.size + address)[:, None] + self._offsets
+        self._flat[index] = raw
+
+    def _address_error(self, address: int) -> str:
+        return f"Ошибка выполнения на адресе {self.pc}: Адрес памяти вне диапазона: {address}"
+
+    def _fail(self, rows, step: int, message: str):
+        """Останавливает экземпляры rows с ошибкой на шаге step."""
+        rows = np.atleast_1d(rows)
+        self.steps[rows] = step
+        for row in rows.tolist():
+            self.errors[row] = message
+        self._rows = np.setdiff1d(self._rows, rows)
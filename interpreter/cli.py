@@ -3,12 +3,53 @@
 import argparse
 import sys
 from pathlib import Path
-import xml.etree.ElementTree as ET
+from typing import Dict, List, TYPE_CHECKING
 from interpreter.memory import Memory
 from interpreter.cpu import CPU
+from interpreter.loader import load_binary
+from uvm.timings import Report
 
+if TYPE_CHECKING:
+    import xml.etree.ElementTree as ET
 
-def create_memory_dump(memory: Memory, start_addr: int, end_addr: int) -> ET.Element:
+
+def load_symbol_map(path: str) -> Dict[int, List[str]]:
+    """
+    Загружает карту символов, созданную ассемблером (--symbols).
+    
+    Args:
+        path: Путь к JSON файлу карты символов
+        
+    Returns:
+        Словарь: адрес -> список имен символов (метки и константы)
+    """
+    import json
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    if not isinstance(data, dict) or data.get('format') != 'uvm-symbols':
+        raise ValueError(f"Файл {path} не является картой символов УВМ")
+    
+    return symbols_by_address(data)
+
+
+def symbols_by_address(data: Dict) -> Dict[int, List[str]]:
+    """
+    Преобразует карту символов ассемблера в словарь адрес -> имена.
+    
+    Адресами считаются только метки и адреса сегментов данных: значения
+    прочих констант (например, счетчиков) не являются адресами.
+    """
+    by_address: Dict[int, List[str]] = {}
+    for section in ('labels', 'data'):
+        for name, value in data.get(section, {}).items():
+            by_address.setdefault(value, []).append(name)
+    return by_address
+
+
+def create_memory_dump(memory: Memory, start_addr: int, end_addr: int,
+                       symbols: Dict[int, List[str]] = None) -> 'ET.Element':
     """
     Создает XML дамп памяти.
     
@@ -16,73 +57,147 @@ def create_memory_dump(memory: Memory, start_addr: int, end_addr: int) -> ET.Ele
         memory: Объект памяти
         start_addr: Начальный адрес
         end_addr: Конечный адрес
+        symbols: Карта символов (адрес -> имена) для подписи записей дампа
         
     Returns:
         XML элемент с дампом памяти
     """
+    import xml.etree.ElementTree as ET
+    
     root = ET.Element('memory_dump')
     root.set('start', str(start_addr))
     root.set('end', str(end_addr))
     
+    # Символ подписывает слово дампа, в которое попадает его адрес
+    entry_symbols: Dict[int, List[str]] = {}
+    for address, names in (symbols or {}).items():
+        if start_addr <= address <= end_addr:
+            entry_addr = start_addr + (address - start_addr) // 4 * 4
+            entry_symbols.setdefault(entry_addr, []).extend(names)
+    
     for addr in range(start_addr, min(end_addr + 1, memory.size), 4):
         value = memory.read_word(addr)
         entry = ET.SubElement(root, 'entry')
         entry.set('address', f'0x{addr:04X}')
         entry.set('value', f'0x{value:08X}')
+        if addr in entry_symbols:
+            entry.set('symbol', ','.join(entry_symbols[addr]))
         entry.text = str(value)
     
     return root
 
 
+def save_memory_dump(dump_root: 'ET.Element', dump_path: Path):
+    """
+    Сохраняет XML дамп памяти в файл.
+    
+    Args:
+        dump_root: XML элемент с дампом памяти
+        dump_path: Путь к файлу дампа
+    """
+    import xml.etree.ElementTree as ET
+    
+    dump_path.parent.mkdir(parents=True, exist_ok=True)
+    tree = ET.ElementTree(dump_root)
+    ET.indent(tree, space='  ')
+    tree.write(dump_path, encoding='utf-8', xml_declaration=True)
+
+
 def main():
     """Главная функция CLI интерпретатора."""
+    report = Report('interpreter')  # Общее время отсчитывается от начала main()
     parser = argparse.ArgumentParser(description='Интерпретатор для учебной виртуальной машины')
     parser.add_argument('program_file', type=str, help='Путь к бинарному файлу программы')
     parser.add_argument('dump_file', type=str, help='Путь к файлу для сохранения дампа памяти')
     parser.add_argument('--start', type=int, default=0, help='Начальный адрес для дампа')
     parser.add_argument('--end', type=int, default=1024, help='Конечный адрес для дампа')
+    parser.add_argument('--symbols', type=str, default=None,
+                        help='Карта символов ассемблера для подписи записей дампа')
+    parser.add_argument('--cache', type=str, nargs='?', const='', default=None, metavar='DIR',
+                        help='Кэш декодированных программ (по умолчанию - $UVM_CACHE_DIR '
+                             'или ~/.cache/uvm)')
+    parser.add_argument('--cache-size', type=int, default=None,
+                        help='Максимальный размер кэша в байтах')
+    parser.add_argument('--report', type=str, default=None, metavar='FILE',
+                        help='Записать JSON отчет: длительности этапов, счетчики, пиковая память')
     
     args = parser.parse_args()
     
+    def fail(message: str):
+        """Сообщает об ошибке, записывает отчет и завершает работу."""
+        print(message, file=sys.stderr)
+        if args.report:
+            report.fail(message)
+            report.save(Path(args.report))
+        sys.exit(1)
+    
     # Читаем программу
     try:
-        with open(args.program_file, 'rb') as f:
-            program_bytes = f.read()
+        with report.phase('read'):
+            with open(args.program_file, 'rb') as f:
+                program_bytes = f.read()
     except FileNotFoundError:
-        print(f"Ошибка: файл {args.program_file} не найден", file=sys.stderr)
-        sys.exit(1)
+        fail(f"Ошибка: файл {args.program_file} не найден")
     except Exception as e:
-        print(f"Ошибка при чтении файла: {e}", file=sys.stderr)
-        sys.exit(1)
+        fail(f"Ошибка при чтении файла: {e}")
+    
+    # Читаем карту символов
+    symbols = None
+    if args.symbols:
+        try:
+            with report.phase('symbols'):
+                symbols = load_symbol_map(args.symbols)
+        except Exception as e:
+            fail(f"Ошибка при чтении карты символов: {e}")
     
     # Создаем память и CPU
     memory = Memory()
     cpu = CPU(memory)
     
-    # Загружаем программу в память
-    memory.load_program(program_bytes)
-    
-    # Выполняем программу
+    # Загружаем программу в память (объектный файл или сырой машинный код)
     try:
-        cpu.execute(program_bytes)
+        with report.phase('load'):
+            code, embedded_symbols = load_binary(memory, program_bytes)
     except Exception as e:
-        print(f"Ошибка выполнения программы: {e}", file=sys.stderr)
-        sys.exit(1)
+        fail(f"Ошибка при загрузке программы: {e}")
+    if symbols is None and embedded_symbols is not None:
+        symbols = symbols_by_address(embedded_symbols)
+    report.count('code_bytes', len(code))
     
-    # Создаем дамп памяти
-    dump_root = create_memory_dump(memory, args.start, args.end)
+    # Декодированная программа из кэша (при первом запуске - декодируется и сохраняется)
+    decoded = None
+    if args.cache is not None:
+        from interpreter.predecode import ProgramCache, DEFAULT_CACHE_SIZE
+        cache = ProgramCache(args.cache or None, args.cache_size or DEFAULT_CACHE_SIZE)
+        try:
+            with report.phase('cache'):
+                decoded = cache.load(code)
+        except OSError as e:
+            print(f"Предупреждение: кэш недоступен: {e}", file=sys.stderr)
     
-    # Сохраняем дамп
+    # Выполняем программу: подготовка (проверка верификатором) и выполнение
     try:
-        dump_path = Path(args.dump_file)
-        dump_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        tree = ET.ElementTree(dump_root)
-        ET.indent(tree, space='  ')
-        tree.write(dump_path, encoding='utf-8', xml_declaration=True)
+        with report.phase('prepare'):
+            cpu.load(code, decoded)
+        with report.phase('execute'):
+            cpu.run()
     except Exception as e:
-        print(f"Ошибка при сохранении дампа: {e}", file=sys.stderr)
-        sys.exit(1)
+        report.count('steps', cpu.steps)
+        fail(f"Ошибка выполнения программы: {e}")
+    report.count('steps', cpu.steps)
+    report.count('verified', int(cpu.verified))
+    report.rate('steps_per_second', cpu.steps, 'execute')
+    
+    # Создаем и сохраняем дамп памяти
+    try:
+        with report.phase('dump'):
+            dump_root = create_memory_dump(memory, args.start, args.end, symbols)
+            save_memory_dump(dump_root, Path(args.dump_file))
+    except Exception as e:
+        fail(f"Ошибка при сохранении дампа: {e}")
+    report.count('dump_words', len(dump_root))
+    if args.report:
+        report.save(Path(args.report))
     
     print(f"Программа выполнена успешно")
     print(f"Дамп памяти сохранен в: {args.dump_file}")
@@ -90,4 +205,3 @@ def main():
 
 if __name__ == '__main__':
     main()
-
@@ -1,13 +1,38 @@
 """CPU интерпретатора УВМ."""
 
-from typing import List, Dict
+import time
+from typing import Callable, Dict, NamedTuple, Optional
 from interpreter.memory import Memory
 from interpreter.instructions import InstructionExecutor
+from interpreter.verifier import verify
+from interpreter.journal import write_effect, op_effect, decoded_effect
+from interpreter.predecode import DecodedProgram
+from interpreter.debugger import (Hooks, HookEvent, Watchpoint, memory_accesses,
+                                  BREAKPOINT, OPCODE, WRITE, ACCESS)
+from uvm import isa
+
+
+class ExecutionLimitError(RuntimeError):
+    """Превышен лимит числа шагов или времени выполнения программы."""
+
+
+class RunState(NamedTuple):
+    """Состояние выполнения после CPU.run() (продолжение выполнения)."""
+    pc: int
+    steps: int
+    finished: bool
+    event: Optional[HookEvent] = None  # Событие перехватчика, остановившее выполнение
 
 
 class CPU:
     """CPU интерпретатора УВМ."""
     
+    # Период проверки лимита времени (в командах)
+    TIME_CHECK_INTERVAL = 1024
+    
+    # Выполнять доказанные верификатором программы без проверок границ
+    USE_VERIFIER = True
+    
     def __init__(self, memory: Memory):
         """
         Инициализирует CPU.
@@ -18,6 +43,17 @@ class CPU:
         self.memory = memory
         self.executor = InstructionExecutor(memory)
         self.pc = 0  # Program Counter
+        self.steps = 0  # Число выполненных команд
+        self.verified = False  # Программа выполняется без проверок
+        self.program = b''  # Загруженная программа
+        self.journal = None  # Журнал записей (interpreter.journal.Journal)
+        self.hooks: Optional[Hooks] = None  # Отладочные перехватчики
+        self.stop_event: Optional[HookEvent] = None
+        self._resume_pc = None  # Команда, перед которой произошла остановка
+        self._verified_program = None
+        self._verified_state = None  # (шаг, регистры), для которых верна проверка
+        self._journaled = None  # Журнал, начатый для загруженной программы
+        self._decoded = None  # Декодированная программа (DecodedProgram)
     
     def decode_instruction(self, bytes_data: bytes, offset: int) -> tuple:
         """
@@ -46,7 +82,7 @@ class CPU:
             byte4 = bytes_data[offset + 4]
             
             B_low = (byte0 >> 4) & 0x0F
-            B_high = (byte1 >> 5) & 0x07
+            B_high = byte1 & 0x07  # биты 8-10
             B = B_low | (B_high << 4)
             
             C_part1 = (byte1 >> 3) & 0x1F
@@ -65,7 +101,7 @@ class CPU:
             byte2 = bytes_data[offset + 2]
             
             B_low = (byte0 >> 4) & 0x0F
-            B_high = (byte1 >> 5) & 0x07
+            B_high = byte1 & 0x07  # биты 8-10
             B = B_low | (B_high << 4)
             
             C_part1 = (byte1 >> 3) & 0x1F
@@ -82,7 +118,7 @@ class CPU:
             byte2 = bytes_data[offset + 2]
             
             B_low = (byte0 >> 4) & 0x0F
-            B_high = (byte1 >> 5) & 0x07
+            B_high = byte1 & 0x07  # биты 8-10
             B = B_low | (B_high << 4)
             
             C_part1 = (byte1 >> 3) & 0x1F
@@ -102,7 +138,7 @@ class CPU:
             byte5 = bytes_data[offset + 5]
             
             B_low = (byte0 >> 4) & 0x0F
-            B_high = (byte1 >> 5) & 0x07
+            B_high = byte1 & 0x07  # биты 8-10
             B = B_low | (B_high << 4)
             
             # C (operand_offset) биты 11-22 (12 бит)
@@ -131,46 +167,379 @@ class CPU:
         else:
             raise ValueError(f"Неизвестный код операции: {opcode}")
     
-    def execute(self, program_bytes: bytes):
+    def load(self, program_bytes: bytes, decoded: Optional[DecodedProgram] = None):
         """
-        Выполняет программу.
+        Подготавливает программу к пошаговому выполнению через run().
+        
+        Если верификатор доказывает, что все обращения к памяти лежат в
+        границах, программа будет выполняться без проверок; иначе - обычным
+        путем с проверками.
         
         Args:
             program_bytes: Байты программы
+            decoded: Декодированная программа (например, из ProgramCache);
+                если задана, команды не декодируются повторно
         """
+        self.program = program_bytes
+        self._decoded = decoded
         self.pc = 0
+        self.steps = 0
+        self.verified = False
+        self._verified_program = None
+        self.stop_event = None
+        self._resume_pc = None
+        
+        if self.USE_VERIFIER:
+            self._verified_program = verify(decoded if decoded is not None else program_bytes,
+                                            self.memory.registers, self.memory.size)
+            self.verified = self._verified_program is not None
+            self._verified_state = (0, list(self.memory.registers))
+        self._journaled = None
+        if self.journal is not None:
+            self._begin_journal()
+    
+    @property
+    def finished(self) -> bool:
+        """Программа выполнена до конца."""
+        return self.pc >= len(self.program)
+    
+    def run(self, max_steps: Optional[int] = None,
+            deadline: Optional[float] = None) -> RunState:
+        """
+        Продолжает выполнение загруженной программы.
         
-        while self.pc < len(program_bytes):
+        Выполнение можно возобновлять повторными вызовами: состояние
+        (счетчик команд, число шагов) хранится в CPU.
+        
+        Args:
+            max_steps: Максимальное число команд в этом вызове
+            deadline: Момент time.monotonic(), после которого выполнение
+                прерывается с ошибкой
+            
+        Returns:
+            Состояние выполнения после вызова (event - событие перехватчика,
+            если выполнение остановлено им)
+            
+        Raises:
+            ExecutionLimitError: Если истек deadline
+        """
+        end = None if max_steps is None else self.steps + max_steps
+        if self._verified_program is not None and not self._verified_current():
+            # Состояние изменено вне проверенного пути: продолжаем с проверками
+            self._verified_program = None
+            self.verified = False
+        if self.journal is not None and self._journaled is not self.journal:
+            self._begin_journal()
+        if self.hooks is not None:
+            self._run_hooked(end, deadline)
+        elif self._verified_program is not None:
+            self._run_verified(end, deadline)
+        elif self._decoded is not None:
+            self._run_predecoded(end, deadline)
+        else:
+            self._run_checked(end, deadline)
+        return RunState(self.pc, self.steps, self.finished, self.stop_event)
+    
+    def execute(self, program_bytes: bytes, max_steps: Optional[int] = None,
+                time_limit: Optional[float] = None,
+                decoded: Optional[DecodedProgram] = None):
+        """
+        Выполняет программу до конца (или до остановки перехватчиком,
+        см. stop_event; выполнение продолжается вызовом run()).
+        
+        Args:
+            program_bytes: Байты программы
+            max_steps: Максимальное число выполняемых команд
+            time_limit: Максимальное время выполнения в секундах
+            decoded: Декодированная программа (см. load)
+            
+        Raises:
+            ExecutionLimitError: Если превышен лимит шагов или времени
+        """
+        deadline = time.monotonic() + time_limit if time_limit is not None else None
+        self.load(program_bytes, decoded)
+        self.run(max_steps, deadline)
+        if not self.finished and self.stop_event is None:
+            self._check_limits(max_steps, None)
+    
+    def _run_checked(self, end: Optional[int], deadline: Optional[float]):
+        """Выполняет команды с декодированием и проверками до шага end."""
+        program_bytes = self.program
+        while self.pc < len(program_bytes) and (end is None or self.steps < end):
+            if deadline is not None:
+                self._check_limits(None, deadline)
             try:
                 decoded = self.decode_instruction(program_bytes, self.pc)
-                if decoded is None:
-                    break
-                
-                opcode, fields, size = decoded
-                
-                # Выполняем инструкцию
+            except Exception as e:
+                raise RuntimeError(f"Ошибка выполнения на адресе {self.pc}: {e}")
+            if decoded is None:
+                break
+            self._execute_decoded(*decoded)
+    
+    def _record_partial(self, address: int, source: Optional[int] = None):
+        """
+        Записывает в журнал частичную запись слова по адресу address после ошибки.
+        
+        Args:
+            address: Адрес записи
+            source: Адрес чтения bswap; если чтение вышло за память, запись
+                не начиналась и в журнал ничего не добавляется
+        """
+        if source is None or source <= self.memory.size - 4:
+            self.journal.record_partial(self.memory, self.pc, address)
+    
+    def _execute_decoded(self, opcode: int, fields: Dict[str, int], size: int):
+        """Выполняет команду, декодированную decode_instruction, и переходит к следующей."""
+        try:
+            if opcode == 2:
+                self.executor.execute_load_const(
+                    fields['address'], fields['constant']
+                )
+            elif opcode == 7:
+                self.executor.execute_read_mem(
+                    fields['result_addr'], fields['source_addr']
+                )
+            elif opcode == 5:
+                self.executor.execute_write_mem(
+                    fields['source_addr'], fields['result_addr']
+                )
+            elif opcode == 13:
+                self.executor.execute_bswap(
+                    fields['result_addr'],
+                    fields['result_offset'],
+                    fields['operand_offset'],
+                    fields['operand_addr']
+                )
+            
+            if self.journal is not None:
+                self.journal.record(self.memory, self.pc,
+                                    *write_effect(self.memory, opcode, fields))
+        except Exception as e:
+            if self.journal is not None and opcode in (5, 13):
+                registers = self.memory.registers
+                source = (registers[fields['operand_addr']] + fields['operand_offset']
+                          if opcode == 13 else None)
+                self._record_partial(registers[fields['result_addr']]
+                                     + fields.get('result_offset', 0), source)
+            raise RuntimeError(f"Ошибка выполнения на адресе {self.pc}: {e}")
+        
+        self.pc += size
+        self.steps += 1
+    
+    def _run_predecoded(self, end: Optional[int], deadline: Optional[float]):
+        """Выполняет декодированную программу с проверками до шага end."""
+        decoded = self._decoded
+        executor = self.executor
+        journal = self.journal
+        total = len(decoded) if end is None else min(len(decoded), end)
+        
+        while self.steps < total:
+            step = self.steps
+            self.pc = decoded.offsets[step]
+            if deadline is not None:
+                self._check_limits(None, deadline)
+            opcode, B, C = decoded.opcodes[step], decoded.B[step], decoded.C[step]
+            try:
                 if opcode == 2:
-                    self.executor.execute_load_const(
-                        fields['address'], fields['constant']
-                    )
+                    executor.execute_load_const(B, C)
                 elif opcode == 7:
-                    self.executor.execute_read_mem(
-                        fields['result_addr'], fields['source_addr']
-                    )
+                    executor.execute_read_mem(B, C)
                 elif opcode == 5:
-                    self.executor.execute_write_mem(
-                        fields['source_addr'], fields['result_addr']
-                    )
-                elif opcode == 13:
-                    self.executor.execute_bswap(
-                        fields['result_addr'],
-                        fields['result_offset'],
-                        fields['operand_offset'],
-                        fields['operand_addr']
-                    )
-                
-                self.pc += size
-                
+                    executor.execute_write_mem(B, C)
+                else:
+                    executor.execute_bswap(B, decoded.D[step], C, decoded.E[step])
             except Exception as e:
+                if journal is not None and opcode in (5, 13):
+                    registers = self.memory.registers
+                    if opcode == 5:
+                        self._record_partial(registers[C])
+                    else:
+                        self._record_partial(registers[B] + decoded.D[step],
+                                             registers[decoded.E[step]] + C)
                 raise RuntimeError(f"Ошибка выполнения на адресе {self.pc}: {e}")
-
+            
+            if journal is not None:
+                journal.record(self.memory, self.pc,
+                               *decoded_effect(self.memory, opcode, B, C, decoded.D[step]))
+            self.steps = step + 1
+        
+        if self.steps < len(decoded):
+            self.pc = decoded.offsets[self.steps]
+        else:
+            self.pc = decoded.size
+    
+    def _begin_journal(self):
+        """Начинает журнал; журнал нельзя подключить после начала выполнения."""
+        if self.steps:
+            raise ValueError("Журнал должен быть подключен до выполнения первой команды")
+        self.journal.begin(self.memory)
+        self._journaled = self.journal
+    
+    def _verified_current(self) -> bool:
+        """
+        Проверяет, что шаг и регистры совпадают с оставленными проверенным
+        путем: доказательство верификатора опирается на значения регистров,
+        которые между вызовами run() могут изменить вызывающий код или
+        выполнение другим путем (перехватчики).
+        """
+        step, registers = self._verified_state
+        return step == self.steps and registers == list(self.memory.registers)
+    
+    def _run_verified(self, end: Optional[int], deadline: Optional[float]):
+        """Выполняет проверенную программу порциями до шага end."""
+        program = self._verified_program
+        total = len(program) if end is None else min(len(program), end)
+        interval = self.TIME_CHECK_INTERVAL if deadline is not None else max(total, 1)
+        
+        try:
+            while self.steps < total:
+                self.pc = program.offsets[self.steps]
+                if deadline is not None and time.monotonic() > deadline:
+                    raise ExecutionLimitError(
+                        f"Превышен лимит времени выполнения на адресе {self.pc}"
+                    )
+                stop = min(self.steps + interval, total)
+                if self.journal is None:
+                    program.run(self.memory, self.steps, stop)
+                else:
+                    self._run_journaled(program, stop)
+                self.steps = stop
+        finally:
+            self._verified_state = (self.steps, list(self.memory.registers))
+        
+        if self.steps < len(program):
+            self.pc = program.offsets[self.steps]
+        else:
+            self.pc = program.size
+    
+    def _run_journaled(self, program, stop: int):
+        """Выполняет проверенную программу по одной операции с записью в журнал."""
+        for step in range(self.steps, stop):
+            program.run(self.memory, step, step + 1)
+            self.journal.record(self.memory, program.offsets[step],
+                                *op_effect(self.memory, program.ops[step]))
+    
+    def add_breakpoint(self, pc: int, callback: Optional[Callable] = None):
+        """
+        Устанавливает точку останова перед командой по адресу pc.
+        
+        Args:
+            pc: Смещение команды в машинном коде
+            callback: Обработчик callback(cpu, event); остановка, если он
+                возвращает истину или не задан
+        """
+        self._hooks().breakpoints[pc] = callback
+    
+    def add_watchpoint(self, start: int, end: int, access: str = WRITE,
+                       callback: Optional[Callable] = None) -> Watchpoint:
+        """
+        Устанавливает точку наблюдения за адресами памяти [start, end).
+        
+        Событие возникает после выполнения команды, обратившейся к слову,
+        которое пересекается с диапазоном.
+        
+        Args:
+            start: Начальный адрес
+            end: Адрес за концом диапазона
+            access: 'write', 'read' или 'access' (чтение и запись)
+            callback: Обработчик callback(cpu, event)
+            
+        Returns:
+            Точка наблюдения (для remove_watchpoint)
+        """
+        if access not in ('read', WRITE, ACCESS):
+            raise ValueError(f"Неизвестный вид доступа: {access}")
+        watchpoint = Watchpoint(start, end, access, callback)
+        self._hooks().watchpoints.add(watchpoint)
+        return watchpoint
+    
+    def remove_watchpoint(self, watchpoint: Watchpoint):
+        """
+        Удаляет точку наблюдения.
+        
+        После удаления последнего перехватчика выполнение возвращается на
+        быстрый путь, как после clear_hooks.
+        """
+        self._hooks().watchpoints.remove(watchpoint)
+        if not self.hooks:
+            self.hooks = None
+    
+    def on_opcode(self, opcode, callback: Callable):
+        """
+        Регистрирует обработчик, вызываемый перед каждой командой с кодом opcode.
+        
+        Args:
+            opcode: Код операции или имя команды
+            callback: Обработчик callback(cpu, event); остановка перед
+                командой, если он возвращает истину
+        """
+        opcode = isa.OPCODES.get(opcode, opcode)
+        self._hooks().opcodes.setdefault(opcode, []).append(callback)
+    
+    def clear_hooks(self):
+        """Удаляет все перехватчики (выполнение возвращается на быстрый путь)."""
+        self.hooks = None
+    
+    def _hooks(self) -> Hooks:
+        if self.hooks is None:
+            self.hooks = Hooks()
+        return self.hooks
+    
+    def _run_hooked(self, end: Optional[int], deadline: Optional[float]):
+        """Выполняет команды по одной с вызовом перехватчиков."""
+        hooks = self.hooks
+        fire = hooks.fire
+        self.stop_event = None
+        # После остановки перед командой не срабатываем на ней повторно
+        skip = self._resume_pc
+        self._resume_pc = None
+        
+        while not self.finished and (end is None or self.steps < end):
+            pc = self.pc
+            try:
+                opcode, fields, size = self.decode_instruction(self.program, pc)
+            except ValueError:
+                # Ошибку с адресом команды сообщает обычный путь
+                self._run_checked(self.steps + 1, deadline)
+                continue
+            
+            if pc != skip:
+                if pc in hooks.breakpoints:
+                    event = HookEvent(BREAKPOINT, pc, opcode)
+                    if fire(hooks.breakpoints[pc], self, event):
+                        self.stop_event, self._resume_pc = event, pc
+                        return
+                for callback in hooks.opcodes.get(opcode, ()):
+                    event = HookEvent(OPCODE, pc, opcode)
+                    if callback(self, event):
+                        self.stop_event, self._resume_pc = event, pc
+                        return
+            skip = None
+            
+            accesses = memory_accesses(self.memory, opcode, fields) if hooks.watchpoints else ()
+            if deadline is not None:
+                self._check_limits(None, deadline)
+            self._execute_decoded(opcode, fields, size)
+            
+            stop = None
+            for kind, address in accesses:
+                for watchpoint in hooks.watchpoints.find(address, address + 4):
+                    if watchpoint.matches(kind):
+                        event = HookEvent(kind, pc, opcode, address)
+                        if fire(watchpoint.callback, self, event) and stop is None:
+                            stop = event
+            if stop is not None:
+                self.stop_event = stop
+                return
+    
+    def _check_limits(self, max_steps: Optional[int], deadline: Optional[float]):
+        """Проверяет лимиты шагов и времени перед очередной командой."""
+        if max_steps is not None and self.steps >= max_steps:
+            raise ExecutionLimitError(
+                f"Превышен лимит шагов ({max_steps}) на адресе {self.pc}"
+            )
+        if (deadline is not None and self.steps % self.TIME_CHECK_INTERVAL == 0
+                and time.monotonic() > deadline):
+            raise ExecutionLimitError(
+                f"Превышен лимит времени выполнения на адресе {self.pc}"
+            )
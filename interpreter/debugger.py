@@ -0,0 +1,147 @@
+"""
+Отладочные перехватчики УВМ: точки останова, точки наблюдения и
+обработчики команд.
+
+Перехватчики регистрируются через CPU (add_breakpoint, add_watchpoint,
+on_opcode). Пока ни один не зарегистрирован, CPU.hooks равен None и
+выполнение идет прежним путем без дополнительных проверок. Точки
+наблюдения хранятся в интервальном индексе, поэтому поиск не зависит
+линейно от их числа.
+
+Обработчик вызывается как callback(cpu, event); если он возвращает
+истину (или не задан), выполнение останавливается, а CPU.run() возвращает
+состояние с событием. Повторный вызов run() продолжает выполнение.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+# Виды событий
+BREAKPOINT = 'breakpoint'
+OPCODE = 'opcode'
+READ = 'read'
+WRITE = 'write'
+
+# Вид точки наблюдения: чтение и запись
+ACCESS = 'access'
+
+
+class HookEvent(NamedTuple):
+    """Событие перехватчика."""
+    kind: str
+    pc: int
+    opcode: Optional[int]
+    address: Optional[int] = None
+
+
+class Watchpoint:
+    """Точка наблюдения за диапазоном адресов [start, end)."""
+
+    __slots__ = ('start', 'end', 'access', 'callback')
+
+    def __init__(self, start: int, end: int, access: str, callback: Optional[Callable]):
+        """
+        Args:
+            start: Начальный адрес
+            end: Адрес за концом диапазона
+            access: READ, WRITE или ACCESS (чтение и запись)
+            callback: Обработчик
+        """
+        self.start = start
+        self.end = end
+        self.access = access
+        self.callback = callback
+
+    def matches(self, kind: str) -> bool:
+        return self.access == kind or self.access == ACCESS
+
+    def __repr__(self):
+        return f"Watchpoint({self.start:#x}, {self.end:#x}, {self.access!r})"
+
+
+class IntervalIndex:
+    """
+    Индекс интервалов [start, end).
+
+    Интервалы разбиты на группы по длине (степени двойки); в каждой группе
+    хранится отсортированный по началу список. Добавление и удаление -
+    вставка в список по bisect. При поиске в группе с длинами меньше 2^k
+    просматриваются только интервалы с началом в [start - 2^k, end), поэтому
+    поиск не зависит линейно от числа интервалов.
+    """
+
+    def __init__(self):
+        # Группа k (длина < 2^k) -> (ключи (start, номер), интервалы)
+        self._groups: Dict[int, Tuple[List[Tuple[int, int]], List[Watchpoint]]] = {}
+        self._keys: Dict[int, Tuple[int, Tuple[int, int]]] = {}  # id -> (группа, ключ)
+        self._counter = 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, item: Watchpoint):
+        self._counter += 1
+        group = max(item.end - item.start, 0).bit_length()
+        key = (item.start, self._counter)
+        self._keys[id(item)] = (group, key)
+        if item.end <= item.start:
+            return  # Пустой интервал ни с чем не пересекается
+        keys, items = self._groups.setdefault(group, ([], []))
+        i = bisect_left(keys, key)
+        keys.insert(i, key)
+        items.insert(i, item)
+
+    def remove(self, item: Watchpoint):
+        group, key = self._keys.pop(id(item))
+        if group not in self._groups:
+            return
+        keys, items = self._groups[group]
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            del keys[i]
+            del items[i]
+            if not keys:
+                del self._groups[group]
+
+    def find(self, start: int, end: int) -> List[Watchpoint]:
+        """Возвращает интервалы, пересекающиеся с [start, end)."""
+        found = []
+        for group, (keys, items) in self._groups.items():
+            lo = bisect_left(keys, (start - (1 << group) + 1,))
+            hi = bisect_left(keys, (end,))
+            for i in range(lo, hi):
+                if items[i].end > start:
+                    found.append(items[i])
+        return found
+
+
+def memory_accesses(memory, opcode: int, fields: Dict[str, int]) -> List[Tuple[str, int]]:
+    """Возвращает обращения команды к памяти (вид, адрес слова) до ее выполнения."""
+    registers = memory.registers
+    if opcode == 7:
+        return [(READ, registers[fields['source_addr']])]
+    if opcode == 5:
+        return [(WRITE, registers[fields['result_addr']])]
+    if opcode == 13:
+        return [(READ, registers[fields['operand_addr']] + fields['operand_offset']),
+                (WRITE, registers[fields['result_addr']] + fields['result_offset'])]
+    return []
+
+
+class Hooks:
+    """Набор перехватчиков одного CPU."""
+
+    def __init__(self):
+        self.breakpoints: Dict[int, Optional[Callable]] = {}
+        self.watchpoints = IntervalIndex()
+        self.opcodes: Dict[int, List[Callable]] = {}
+
+    def __bool__(self) -> bool:
+        """True, если задан хотя бы один перехватчик."""
+        return bool(self.breakpoints or self.watchpoints or self.opcodes)
+
+    @staticmethod
+    def fire(callback: Optional[Callable], cpu, event: HookEvent) -> bool:
+        """Вызывает обработчик; возвращает True, если нужно остановиться."""
+        return callback is None or bool(callback(cpu, event))
@@ -0,0 +1,169 @@
+"""
+Журнал записей УВМ для воспроизведения и восстановления состояния.
+
+Каждая команда УВМ выполняет ровно одну запись - в регистр или в слово
+памяти, поэтому журнал хранит по одной записи (pc, адрес, значение) на
+шаг в массивах array('I'). Номер записи совпадает с номером шага.
+Периодически сохраняются полные снимки памяти и регистров; состояние на
+любом шаге восстанавливается от ближайшего предыдущего снимка применением
+записей, без повторного выполнения команд. Если команда записи в память
+завершилась ошибкой, успев записать байты в границах памяти, эти байты
+записываются отдельной последней записью (record_partial), поэтому
+state_at(len(journal)) совпадает с памятью после ошибки:
+
+    journal = Journal(snapshot_interval=4096)
+    cpu.journal = journal
+    cpu.execute(code)
+    memory = journal.state_at(1000)  # состояние перед шагом 1000
+"""
+
+from array import array
+from typing import Dict, Iterator, Tuple
+from interpreter.memory import Memory
+from interpreter.verifier import OP_LOAD, OP_READ, OP_WRITE
+
+
+# Признак записи в регистр в поле адреса (иначе - адрес слова памяти)
+REGISTER_FLAG = 0x80000000
+
+
+def write_effect(memory: Memory, opcode: int, fields: Dict[str, int]) -> Tuple[int, int]:
+    """
+    Возвращает (адрес, значение) записи, выполненной командой.
+
+    Вызывается после выполнения команды, декодированной CPU.decode_instruction.
+    """
+    if opcode == 2:
+        return REGISTER_FLAG | fields['address'], fields['constant']
+    if opcode == 7:
+        register = fields['result_addr']
+        return REGISTER_FLAG | register, memory.registers[register]
+    if opcode == 5:
+        address = memory.registers[fields['result_addr']]
+        return address, memory.registers[fields['source_addr']]
+    address = memory.registers[fields['result_addr']] + fields['result_offset']
+    return address, memory.read_word(address)
+
+
+def decoded_effect(memory: Memory, opcode: int, B: int, C: int, D: int) -> Tuple[int, int]:
+    """Возвращает (адрес, значение) записи команды DecodedProgram (поля B, C, D)."""
+    if opcode == 2:
+        return REGISTER_FLAG | B, C
+    if opcode == 7:
+        return REGISTER_FLAG | B, memory.registers[B]
+    if opcode == 5:
+        return memory.registers[C], memory.registers[B]
+    address = memory.registers[B] + D
+    return address, memory.read_word(address)
+
+
+def op_effect(memory: Memory, op: Tuple[int, int, int]) -> Tuple[int, int]:
+    """Возвращает (адрес, значение) записи, выполненной операцией VerifiedProgram."""
+    kind, x, y = op
+    if kind == OP_LOAD:
+        return REGISTER_FLAG | x, y
+    if kind == OP_READ:
+        return REGISTER_FLAG | x, memory.registers[x]
+    if kind == OP_WRITE:
+        return y, memory.registers[x]
+    return y, memory.read_word(y)
+
+
+class Journal:
+    """Журнал записей с периодическими снимками состояния."""
+
+    def __init__(self, snapshot_interval: int = 4096):
+        """
+        Args:
+            snapshot_interval: Период полных снимков (в шагах)
+        """
+        if snapshot_interval < 1:
+            raise ValueError("Период снимков должен быть положительным")
+        self.snapshot_interval = snapshot_interval
+        self.pcs = array('I')
+        self.addresses = array('I')
+        self.values = array('I')
+        # Снимки: номер шага -> (байты памяти, регистры)
+        self.snapshots: Dict[int, Tuple[bytes, array]] = {}
+        self.memory_size = 0
+
+    def __len__(self) -> int:
+        """Число записанных шагов."""
+        return len(self.pcs)
+
+    def begin(self, memory: Memory):
+        """Очищает журнал и сохраняет начальный снимок."""
+        self.pcs = array('I')
+        self.addresses = array('I')
+        self.values = array('I')
+        self.snapshots = {}
+        self.memory_size = memory.size
+        self._snapshot(memory)
+
+    def _snapshot(self, memory: Memory):
+        self.snapshots[len(self.pcs)] = (bytes(memory.data), array('I', memory.registers))
+
+    def record(self, memory: Memory, pc: int, address: int, value: int):
+        """
+        Записывает шаг (вызывается после выполнения команды).
+
+        Args:
+            memory: Память после выполнения команды
+            pc: Адрес выполненной команды
+            address: Адрес записи (REGISTER_FLAG | номер для регистров)
+            value: Записанное значение
+        """
+        self.pcs.append(pc)
+        self.addresses.append(address)
+        self.values.append(value)
+        if len(self.pcs) % self.snapshot_interval == 0:
+            self._snapshot(memory)
+
+    def record_partial(self, memory: Memory, pc: int, address: int):
+        """
+        Записывает частичный эффект команды, запись слова которой по адресу
+        address вышла за конец памяти (байты в границах уже записаны).
+        Вызывается после ошибки; если в границах ничего не записано - ничего
+        не делает.
+        """
+        if not memory.size - 4 < address < memory.size:
+            return
+        value = int.from_bytes(bytes(memory.data[address:memory.size]), 'little')
+        self.record(memory, pc, address, value)
+
+    def records(self, start: int = 0, stop: int = None) -> Iterator[Tuple[int, int, int, int]]:
+        """Итерирует записи (шаг, pc, адрес, значение) в диапазоне шагов."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for step in range(start, stop):
+            yield step, self.pcs[step], self.addresses[step], self.values[step]
+
+    def state_at(self, step: int) -> Memory:
+        """
+        Восстанавливает состояние перед выполнением шага step.
+
+        Args:
+            step: Номер шага (0 - начальное состояние, len(journal) - итоговое)
+
+        Returns:
+            Новый объект памяти с восстановленными памятью и регистрами
+        """
+        if not 0 <= step <= len(self) or not self.snapshots:
+            raise IndexError(f"Шаг вне журнала: {step}")
+
+        base = step - step % self.snapshot_interval
+        data, registers = self.snapshots[base]
+        memory = Memory(self.memory_size)
+        memory.data[:] = data
+        memory.registers[:] = registers
+
+        for i in range(base, step):
+            address = self.addresses[i]
+            if address & REGISTER_FLAG:
+                memory.registers[address & ~REGISTER_FLAG] = self.values[i]
+            elif address + 4 > self.memory_size:
+                # Частичная запись у конца памяти
+                for k in range(self.memory_size - address):
+                    memory.data[address + k] = (self.values[i] >> (8 * k)) & 0xFF
+            else:
+                memory.write_word(address, self.values[i])
+        return memory
@@ -0,0 +1,30 @@
+"""Загрузка программ УВМ в память (объектный формат и сырой машинный код)."""
+
+from typing import Dict, Optional, Tuple
+from interpreter.memory import Memory
+from uvm.objfile import ObjectFile, is_object_file
+
+
+def load_binary(memory: Memory, blob: bytes) -> Tuple[bytes, Optional[Dict]]:
+    """
+    Загружает программу в память, автоматически определяя формат файла.
+    
+    Объектный файл: секция кода размещается с адреса 0, сегменты данных -
+    по своим адресам. Сырой машинный код загружается с адреса 0 целиком.
+    
+    Args:
+        memory: Объект памяти
+        blob: Содержимое файла программы
+        
+    Returns:
+        Кортеж (машинный код для выполнения, карта символов или None)
+    """
+    if not is_object_file(blob):
+        memory.load_program(blob)
+        return blob, None
+    
+    obj = ObjectFile.from_bytes(blob)
+    memory.load_program(obj.code)
+    for address, segment in obj.data:
+        memory.load_program(segment, address)
+    return obj.code, obj.symbols
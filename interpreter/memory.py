@@ -55,6 +55,11 @@ class Memory:
             raise IndexError(f"Адрес регистра вне диапазона: {address}")
         self.registers[address] = value & 0xFFFFFFFF
     
+    def reset(self):
+        """Обнуляет память и регистры (для повторного использования объекта)."""
+        self.data[:] = bytes(self.size)
+        self.registers[:] = bytes(128)
+    
     def load_program(self, program_bytes: bytes, offset: int = 0):
         """Загружает программу в память."""
         for i, byte_val in enumerate(program_bytes):
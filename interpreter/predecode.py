@@ -0,0 +1,288 @@
+"""
+Предварительно декодированные программы УВМ и их кэш на диске.
+
+Декодированная программа хранится столбцами array (код операции, смещение
+и поля B-E каждой команды), как IRBuffer ассемблера. Кэш хранит такие
+программы в файлах, названных по SHA-256 машинного кода и версии системы
+команд; при повторном запуске того же бинарного файла декодирование
+пропускается. Заголовок файла хранит SHA-256 машинного кода и CRC32
+столбцов: файл, поврежденный на диске или записанный для другого кода,
+отбрасывается и программа декодируется заново. Общий размер кэша ограничен: при превышении удаляются
+файлы, которые дольше всего не использовались.
+"""
+
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from itertools import accumulate
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from uvm import isa
+
+
+# Заголовок файла кэша: сигнатура, версия формата, версия ISA, число команд, размер кода,
+# SHA-256 машинного кода, CRC32 столбцов
+_MAGIC = b'UVMD'
+_FORMAT_VERSION = 2
+_HEADER = struct.Struct('<4sHHII32sI')
+
+# Число регистров УВМ (поля B и E всегда адресуют регистры)
+_REGISTERS = 128
+
+# Столбцы декодированной программы: (имя, тип элементов array)
+_COLUMNS = (('opcodes', 'B'), ('offsets', 'I'), ('B', 'B'), ('C', 'I'), ('D', 'H'), ('E', 'B'))
+
+# Размер кэша по умолчанию (байт)
+DEFAULT_CACHE_SIZE = 64 * 1024 * 1024
+
+
+def iter_fields(program_bytes: bytes) -> Iterator[Tuple[int, int, int, int, int, int]]:
+    """
+    Декодирует команды в кортежи (смещение, код операции, B, C, D, E).
+
+    Поля разбираются так же, как в CPU.decode_instruction, но сразу из
+    целого слова команды; значения полей bswap: B - result_addr,
+    C - operand_offset, D - result_offset, E - operand_addr.
+
+    Raises:
+        ValueError: Неизвестный код операции или обрезанная команда
+    """
+    sizes = isa.SIZES
+    length = len(program_bytes)
+    pc = 0
+    while pc < length:
+        opcode = program_bytes[pc] & 0x0F
+        size = sizes.get(opcode)
+        if size is None:
+            raise ValueError(f"Неизвестный код операции: {opcode}")
+        if pc + size > length:
+            raise ValueError(f"Обрезанная команда по смещению {pc}")
+        word = int.from_bytes(program_bytes[pc:pc + size], 'little')
+        B = (word >> 4) & 0x7F
+        if opcode == 2:
+            yield pc, opcode, B, (word >> 11) & 0x7FFFFFF, 0, 0
+        elif opcode == 13:
+            yield (pc, opcode, B, (word >> 11) & 0x1FF,
+                   ((word >> 20) & 0xFFF) | (((word >> 37) & 0x07) << 12),
+                   ((word >> 34) & 0x07) | (((word >> 40) & 0x0F) << 3))
+        else:
+            yield pc, opcode, B, (word >> 11) & 0x7F, 0, 0
+        pc += size
+
+
+class DecodedProgram:
+    """Декодированная программа: столбцы полей команд в array."""
+
+    def __init__(self, size: int):
+        """
+        Args:
+            size: Размер машинного кода в байтах
+        """
+        self.size = size
+        for name, typecode in _COLUMNS:
+            setattr(self, name, array(typecode))
+
+    def __len__(self) -> int:
+        return len(self.opcodes)
+
+    def __iter__(self) -> Iterator[Tuple[int, int, int, int, int, int]]:
+        """Итерирует кортежи (смещение, код операции, B, C, D, E)."""
+        return zip(self.offsets, self.opcodes, self.B, self.C, self.D, self.E)
+
+    @classmethod
+    def from_code(cls, program_bytes: bytes) -> 'DecodedProgram':
+        """
+        Декодирует машинный код.
+
+        Raises:
+            ValueError: Если код некорректен
+        """
+        decoded = cls(len(program_bytes))
+        columns = [getattr(decoded, name).append for name, _ in _COLUMNS]
+        add_opcode, add_offset, add_B, add_C, add_D, add_E = columns
+        for pc, opcode, B, C, D, E in iter_fields(program_bytes):
+            add_opcode(opcode)
+            add_offset(pc)
+            add_B(B)
+            add_C(C)
+            add_D(D)
+            add_E(E)
+        return decoded
+
+    def to_bytes(self, code_digest: bytes = bytes(32)) -> bytes:
+        """
+        Сериализует программу (little-endian).
+
+        Args:
+            code_digest: SHA-256 машинного кода, по которому проверяется
+                соответствие файла коду при чтении
+        """
+        parts = []
+        for name, _ in _COLUMNS:
+            column = getattr(self, name)
+            if sys.byteorder == 'big':
+                column = array(column.typecode, column)
+                column.byteswap()
+            parts.append(column.tobytes())
+        body = b''.join(parts)
+        header = _HEADER.pack(_MAGIC, _FORMAT_VERSION, isa.ISA_VERSION, len(self), self.size,
+                              code_digest, zlib.crc32(body))
+        return header + body
+
+    @classmethod
+    def from_bytes(cls, blob: bytes, code_digest: Optional[bytes] = None) -> 'DecodedProgram':
+        """
+        Читает сериализованную программу.
+
+        Args:
+            blob: Сериализованная программа
+            code_digest: Ожидаемый SHA-256 машинного кода (None - не проверять)
+
+        Raises:
+            ValueError: Если формат, версия ISA, размер, SHA-256 кода или
+                контрольная сумма не совпадают либо поля команд некорректны
+        """
+        if len(blob) < _HEADER.size:
+            raise ValueError("Обрезанный файл декодированной программы")
+        magic, version, isa_version, count, size, digest, crc = _HEADER.unpack_from(blob, 0)
+        if magic != _MAGIC or version != _FORMAT_VERSION or isa_version != isa.ISA_VERSION:
+            raise ValueError("Неподдерживаемый формат декодированной программы")
+        if code_digest is not None and digest != code_digest:
+            raise ValueError("Декодированная программа записана для другого машинного кода")
+
+        view = memoryview(blob)[_HEADER.size:]
+        if len(view) != count * sum(array(typecode).itemsize for _, typecode in _COLUMNS):
+            raise ValueError("Обрезанный файл декодированной программы")
+        if zlib.crc32(view) != crc:
+            raise ValueError("Контрольная сумма декодированной программы не совпадает")
+
+        decoded = cls(size)
+        pos = 0
+        for name, _ in _COLUMNS:
+            column = getattr(decoded, name)
+            end = pos + count * column.itemsize
+            column.frombytes(view[pos:end])
+            if sys.byteorder == 'big':
+                column.byteswap()
+            pos = end
+        decoded._validate()
+        return decoded
+
+    def _validate(self):
+        """
+        Проверяет коды операций, номера регистров и смещения команд.
+
+        Raises:
+            ValueError: Если поля не могли быть получены декодированием кода
+        """
+        sizes = isa.SIZES
+        if not set(self.opcodes) <= sizes.keys():
+            raise ValueError("Некорректная декодированная программа: неизвестный код операции")
+        # B и E - всегда номера регистров, C - номер регистра у read_mem/write_mem
+        if (max(self.B, default=0) >= _REGISTERS or max(self.E, default=0) >= _REGISTERS
+                or any(C >= _REGISTERS for opcode, C in zip(self.opcodes, self.C)
+                       if opcode == 7 or opcode == 5)):
+            raise ValueError("Некорректная декодированная программа: номер регистра вне диапазона")
+        # Команды следуют друг за другом с нулевого смещения и заканчиваются в конце кода
+        ends = array('Q', accumulate(map(sizes.__getitem__, self.opcodes), initial=0))
+        if ends[:-1] != array('Q', self.offsets) or ends[-1] != self.size:
+            raise ValueError("Некорректная декодированная программа: смещения не совпадают с кодом")
+
+
+def default_cache_dir() -> Path:
+    """Каталог кэша: переменная окружения UVM_CACHE_DIR или ~/.cache/uvm."""
+    return Path(os.environ.get('UVM_CACHE_DIR') or Path.home() / '.cache' / 'uvm')
+
+
+class ProgramCache:
+    """Кэш декодированных программ на диске с ограничением общего размера."""
+
+    SUFFIX = '.uvmd'
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: int = DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            directory: Каталог кэша (по умолчанию - default_cache_dir())
+            max_bytes: Максимальный общий размер файлов кэша
+        """
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def path_for(self, program_bytes: bytes) -> Path:
+        """Возвращает путь файла кэша для машинного кода."""
+        return self._path(hashlib.sha256(program_bytes).digest())
+
+    def _path(self, digest: bytes) -> Path:
+        return self.directory / f"{digest.hex()}-isa{isa.ISA_VERSION}{self.SUFFIX}"
+
+    def get(self, program_bytes: bytes) -> Optional[DecodedProgram]:
+        """Возвращает программу из кэша или None (в том числе для поврежденного файла)."""
+        digest = hashlib.sha256(program_bytes).digest()
+        path = self._path(digest)
+        try:
+            decoded = DecodedProgram.from_bytes(path.read_bytes(), digest)
+        except (OSError, ValueError):
+            return None
+        if decoded.size != len(program_bytes):
+            return None
+        try:
+            os.utime(path)  # Отметка использования для вытеснения
+        except OSError:
+            pass
+        return decoded
+
+    def put(self, program_bytes: bytes, decoded: DecodedProgram):
+        """Сохраняет программу в кэш и вытесняет старые файлы при превышении размера."""
+        digest = hashlib.sha256(program_bytes).digest()
+        blob = decoded.to_bytes(digest)
+        if len(blob) > self.max_bytes:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(digest)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(blob)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def load(self, program_bytes: bytes) -> Optional[DecodedProgram]:
+        """
+        Возвращает декодированную программу из кэша или декодирует и сохраняет ее.
+
+        Returns:
+            Декодированная программа или None, если код некорректен (ошибку
+            сообщит обычный путь выполнения)
+        """
+        decoded = self.get(program_bytes)
+        if decoded is None:
+            try:
+                decoded = DecodedProgram.from_code(program_bytes)
+            except ValueError:
+                return None
+            self.put(program_bytes, decoded)
+        return decoded
+
+    def evict(self):
+        """Удаляет давно не использованные файлы, пока размер кэша превышает лимит."""
+        entries = []
+        for path in self.directory.glob('*' + self.SUFFIX):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,165 @@
+"""
+Кооперативный планировщик выполнения многих программ УВМ в одном процессе.
+
+Каждое задание - своя пара Memory/CPU. Планировщик выполняет задания
+квантами по quantum команд через возобновляемый CPU.run(), поэтому
+большая программа не задерживает небольшие задания, поставленные после нее:
+
+    scheduler = Scheduler(quantum=1024)
+    big = scheduler.submit(big_program)
+    small = scheduler.submit(small_program, priority=1)
+    for task in scheduler.run():
+        print(task.name, task.steps)
+"""
+
+import heapq
+import itertools
+from collections import deque
+from typing import Iterator, List, Optional
+from interpreter.memory import Memory
+from interpreter.cpu import CPU, ExecutionLimitError
+from interpreter.loader import load_binary
+
+
+ROUND_ROBIN = 'round_robin'
+PRIORITY = 'priority'
+
+
+class Task:
+    """Задание планировщика: программа и машина, на которой она выполняется."""
+
+    def __init__(self, name: str, cpu: CPU, priority: int = 0,
+                 max_steps: Optional[int] = None):
+        """
+        Args:
+            name: Имя задания
+            cpu: CPU с загруженной программой
+            priority: Приоритет (больше - раньше)
+            max_steps: Лимит общего числа команд
+        """
+        self.name = name
+        self.cpu = cpu
+        self.priority = priority
+        self.max_steps = max_steps
+        self.slices = 0  # Число выделенных квантов
+        self.error: Optional[Exception] = None
+        self.done = False
+
+    @property
+    def memory(self) -> Memory:
+        return self.cpu.memory
+
+    @property
+    def steps(self) -> int:
+        return self.cpu.steps
+
+    def __repr__(self):
+        status = 'ошибка' if self.error else ('завершено' if self.done else 'выполняется')
+        return f"Task({self.name!r}, steps={self.steps}, {status})"
+
+
+class Scheduler:
+    """
+    Планировщик заданий с разделением времени.
+
+    Политика ROUND_ROBIN выделяет кванты заданиям по очереди. Политика
+    PRIORITY всегда выполняет готовое задание с наибольшим приоритетом,
+    задания с равным приоритетом чередуются.
+    """
+
+    def __init__(self, quantum: int = 1024, policy: str = ROUND_ROBIN,
+                 memory_size: int = 65536):
+        """
+        Args:
+            quantum: Число команд в одном кванте
+            policy: ROUND_ROBIN или PRIORITY
+            memory_size: Размер памяти новых заданий в байтах
+        """
+        if policy not in (ROUND_ROBIN, PRIORITY):
+            raise ValueError(f"Неизвестная политика планирования: {policy}")
+        if quantum < 1:
+            raise ValueError("Квант должен быть положительным")
+        self.quantum = quantum
+        self.policy = policy
+        self.memory_size = memory_size
+        self._queue = deque()
+        self._heap: List = []
+        self._order = itertools.count()
+        self._names = itertools.count(1)
+
+    def __len__(self) -> int:
+        """Число незавершенных заданий."""
+        return len(self._queue) + len(self._heap)
+
+    def submit(self, program: bytes, name: Optional[str] = None, priority: int = 0,
+               max_steps: Optional[int] = None, memory: Optional[Memory] = None) -> Task:
+        """
+        Ставит программу в очередь.
+
+        Args:
+            program: Содержимое бинарного файла (объектного или сырого)
+            name: Имя задания (по умолчанию - порядковый номер)
+            priority: Приоритет для политики PRIORITY (больше - раньше)
+            max_steps: Лимит общего числа команд
+            memory: Память задания (по умолчанию создается новая)
+
+        Returns:
+            Задание
+        """
+        if memory is None:
+            memory = Memory(self.memory_size)
+        cpu = CPU(memory)
+        code, _ = load_binary(memory, program)
+        cpu.load(code)
+        task = Task(name or f"task{next(self._names)}", cpu, priority, max_steps)
+        self._push(task)
+        return task
+
+    def _push(self, task: Task):
+        if self.policy == PRIORITY:
+            heapq.heappush(self._heap, (-task.priority, next(self._order), task))
+        else:
+            self._queue.append(task)
+
+    def _pop(self) -> Task:
+        if self.policy == PRIORITY:
+            return heapq.heappop(self._heap)[2]
+        return self._queue.popleft()
+
+    def step(self) -> Optional[Task]:
+        """
+        Выделяет один квант очередному заданию.
+
+        Returns:
+            Задание, если оно завершилось (успешно или с ошибкой) в этом
+            кванте, иначе None
+        """
+        task = self._pop()
+        task.slices += 1
+        budget = self.quantum
+        if task.max_steps is not None:
+            budget = min(budget, task.max_steps - task.steps)
+
+        try:
+            state = task.cpu.run(budget)
+            if not state.finished and task.max_steps is not None and state.steps >= task.max_steps:
+                raise ExecutionLimitError(
+                    f"Превышен лимит шагов ({task.max_steps}) на адресе {state.pc}"
+                )
+        except Exception as e:
+            task.error = e
+            task.done = True
+            return task
+
+        if state.finished:
+            task.done = True
+            return task
+        self._push(task)
+        return None
+
+    def run(self) -> Iterator[Task]:
+        """Выполняет все задания, выдавая их в порядке завершения."""
+        while len(self):
+            task = self.step()
+            if task is not None:
+                yield task
@@ -0,0 +1,253 @@
+"""
+Долгоживущий сервер выполнения программ УВМ.
+
+Протокол - JSON-строки (по одному объекту на строку) через stdin/stdout
+или Unix-сокет. Запрос:
+
+    {"id": 1, "program": "<base64>" | "path": "prog.bin",
+     "start": 0, "end": 1024,          # диапазон дампа (необязательно)
+     "words": [4096, 4100],            # отдельные слова (необязательно)
+     "max_steps": 100000, "timeout": 1.0}
+
+Ответ:
+
+    {"id": 1, "ok": true, "steps": 26,
+     "dump": [[4096, 305419896], ...], "words": {"4096": 305419896}}
+    {"id": 1, "ok": false, "error": "..."}
+
+Объекты Memory/CPU переиспользуются между запросами, запросы могут
+выполняться в нескольких рабочих процессах.
+"""
+
+import argparse
+import base64
+import json
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from interpreter.memory import Memory
+from interpreter.cpu import CPU
+from interpreter.loader import load_binary
+
+
+# Ограничение размера дампа в одном ответе (в словах)
+MAX_DUMP_WORDS = 1 << 16
+
+
+class MachinePool:
+    """Пул пар (Memory, CPU) для повторного использования между запросами."""
+
+    def __init__(self, memory_size: int = 65536):
+        self.memory_size = memory_size
+        self._free: List[Tuple[Memory, CPU]] = []
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Tuple[Memory, CPU]:
+        """Возвращает чистую пару (Memory, CPU)."""
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+        memory = Memory(self.memory_size)
+        return memory, CPU(memory)
+
+    def release(self, machine: Tuple[Memory, CPU]):
+        """Возвращает пару в пул, предварительно очистив память."""
+        machine[0].reset()
+        with self._lock:
+            self._free.append(machine)
+
+
+# Пул текущего процесса (в рабочих процессах создается инициализатором)
+_pool: Optional[MachinePool] = None
+
+
+def _init_worker(memory_size: int):
+    """Инициализирует пул в рабочем процессе."""
+    global _pool
+    _pool = MachinePool(memory_size)
+
+
+def read_program(request: Dict) -> bytes:
+    """Возвращает содержимое программы из запроса (base64 или путь к файлу)."""
+    if 'program' in request:
+        return base64.b64decode(request['program'])
+    if 'path' in request:
+        return Path(request['path']).read_bytes()
+    raise ValueError("Запрос должен содержать поле 'program' или 'path'")
+
+
+def run_job(program: bytes, dump_range: Optional[Tuple[int, int]] = None,
+            words: List[int] = (), max_steps: Optional[int] = None,
+            time_limit: Optional[float] = None, pool: MachinePool = None) -> Dict:
+    """
+    Выполняет программу на машине из пула.
+
+    Args:
+        program: Содержимое бинарного файла (объектного или сырого)
+        dump_range: Диапазон дампа (начальный, конечный адрес включительно)
+        words: Адреса отдельных слов для чтения
+        max_steps: Лимит числа команд
+        time_limit: Лимит времени выполнения в секундах
+        pool: Пул машин (по умолчанию - пул текущего процесса)
+
+    Returns:
+        Словарь: steps - число команд, region - байты диапазона дампа
+        (или None), words - значения запрошенных слов
+    """
+    global _pool
+    if pool is None:
+        if _pool is None:
+            _pool = MachinePool()
+        pool = _pool
+
+    memory, cpu = machine = pool.acquire()
+    try:
+        code, _ = load_binary(memory, program)
+        cpu.execute(code, max_steps, time_limit)
+
+        region = None
+        if dump_range is not None:
+            start, end = dump_range
+            end = min(end, memory.size - 4)
+            if start < 0 or (end - start) // 4 >= MAX_DUMP_WORDS:
+                raise ValueError(f"Некорректный диапазон дампа или он превышает {MAX_DUMP_WORDS} слов")
+            # Байты слов start, start+4, ..., не превышающих end
+            last = start + max(end - start, -4) // 4 * 4
+            region = bytes(memory.data[start:last + 4])
+        return {
+            'steps': cpu.steps,
+            'region': region,
+            'words': {addr: memory.read_word(addr) for addr in words},
+        }
+    finally:
+        pool.release(machine)
+
+
+def execute_request(request: Dict, pool: MachinePool = None) -> Dict:
+    """
+    Выполняет один запрос и формирует ответ.
+
+    Args:
+        request: Разобранный JSON запрос
+        pool: Пул машин (по умолчанию - пул текущего процесса)
+
+    Returns:
+        Словарь ответа
+    """
+    response = {'id': request.get('id')}
+    try:
+        dump_range = None
+        if 'start' in request or 'end' in request:
+            dump_range = (request.get('start', 0), request.get('end', 1024))
+        result = run_job(read_program(request), dump_range, request.get('words', ()),
+                         request.get('max_steps'), request.get('timeout'), pool)
+
+        response['ok'] = True
+        response['steps'] = result['steps']
+        if result['region'] is not None:
+            start = dump_range[0]
+            region = result['region']
+            response['dump'] = [[start + i, int.from_bytes(region[i:i + 4], 'little')]
+                                for i in range(0, len(region), 4)]
+        if 'words' in request:
+            response['words'] = {str(addr): value for addr, value in result['words'].items()}
+    except Exception as e:
+        response = {'id': request.get('id'), 'ok': False, 'error': str(e)}
+    return response
+
+
+def handle_line(line: str, pool: MachinePool = None) -> str:
+    """Обрабатывает одну строку запроса и возвращает строку ответа."""
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("Запрос должен быть JSON объектом")
+    except ValueError as e:
+        return json.dumps({'id': None, 'ok': False, 'error': f"Некорректный запрос: {e}"})
+    return json.dumps(execute_request(request, pool))
+
+
+class Server:
+    """Сервер выполнения: в текущем процессе или в пуле рабочих процессов."""
+
+    def __init__(self, workers: int = 0, memory_size: int = 65536):
+        self.workers = workers
+        self.pool = MachinePool(memory_size)
+        self.process_pool = None
+        if workers > 0:
+            import multiprocessing
+            self.process_pool = multiprocessing.Pool(
+                workers, initializer=_init_worker, initargs=(memory_size,)
+            )
+
+    def handle(self, line: str) -> str:
+        """Обрабатывает строку запроса (блокирующе)."""
+        if self.process_pool is not None:
+            return self.process_pool.apply(handle_line, (line,))
+        return handle_line(line, self.pool)
+
+    def serve_stdio(self, stdin=sys.stdin, stdout=sys.stdout):
+        """Читает запросы из stdin и пишет ответы в stdout по мере готовности."""
+        lines = (line for line in stdin if line.strip())
+        if self.process_pool is not None:
+            # Ответы приходят в порядке завершения; сопоставление - по id
+            responses = self.process_pool.imap_unordered(handle_line, lines)
+        else:
+            responses = (handle_line(line, self.pool) for line in lines)
+        for response in responses:
+            stdout.write(response + '\n')
+            stdout.flush()
+
+    def serve_socket(self, path: str):
+        """Принимает соединения на Unix-сокете; каждое соединение - поток JSON-строк."""
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for raw in self.rfile:
+                    line = raw.decode('utf-8').strip()
+                    if not line:
+                        continue
+                    self.wfile.write((server.handle(line) + '\n').encode('utf-8'))
+                    self.wfile.flush()
+
+        Path(path).unlink(missing_ok=True)
+        with socketserver.ThreadingUnixStreamServer(path, Handler) as unix_server:
+            unix_server.daemon_threads = True
+            unix_server.serve_forever()
+
+    def close(self):
+        """Завершает рабочие процессы."""
+        if self.process_pool is not None:
+            self.process_pool.close()
+            self.process_pool.join()
+
+
+def main():
+    """Главная функция сервера интерпретатора."""
+    parser = argparse.ArgumentParser(description='Сервер выполнения программ УВМ')
+    parser.add_argument('--socket', type=str, default=None,
+                        help='Путь к Unix-сокету (по умолчанию - stdin/stdout)')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Число рабочих процессов (0 - выполнение в текущем процессе)')
+    parser.add_argument('--memory-size', type=int, default=65536,
+                        help='Размер памяти УВМ в байтах')
+
+    args = parser.parse_args()
+
+    server = Server(args.workers, args.memory_size)
+    try:
+        if args.socket:
+            server.serve_socket(args.socket)
+        else:
+            server.serve_stdio()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,170 @@
+"""
+Память УВМ в блоке разделяемой памяти (multiprocessing.shared_memory).
+
+Родительский процесс готовит образ памяти один раз, рабочие процессы
+подключаются к нему по имени без копирования, а результаты родитель
+читает прямо из блока, без сериализации:
+
+    images = run_batch(programs, template=image, workers=4)
+    for image in images:
+        print(image.read_word(0x1000))
+        image.close()
+        image.unlink()
+
+Объект SharedMemoryImage передается в другой процесс по имени блока
+(при сериализации pickle копируется только имя).
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence
+from interpreter.memory import Memory
+from interpreter.cpu import CPU
+from interpreter.loader import load_binary
+
+
+# Размер блока регистров: 128 регистров по 4 байта
+REGISTERS_SIZE = 128 * 4
+
+
+class SharedMemoryImage(Memory):
+    """
+    Память УВМ в блоке разделяемой памяти.
+
+    Блок содержит байты памяти (data - memoryview) и за ними регистры
+    (registers - memoryview формата 'I'), поэтому состояние машины целиком
+    доступно любому подключенному процессу.
+    """
+
+    def __init__(self, size: int = 65536, name: Optional[str] = None, create: bool = True):
+        """
+        Args:
+            size: Размер памяти в байтах
+            name: Имя блока (по умолчанию выбирается системой)
+            create: Создать новый блок (False - подключиться к существующему)
+        """
+        self.size = size
+        self._shm = shared_memory.SharedMemory(name, create, size + REGISTERS_SIZE)
+        self.data = self._shm.buf[:size]
+        self.registers = self._shm.buf[size:size + REGISTERS_SIZE].cast('I')
+
+    @classmethod
+    def attach(cls, name: str, size: int = 65536) -> 'SharedMemoryImage':
+        """Подключается к существующему блоку по имени."""
+        return cls(size, name, create=False)
+
+    @classmethod
+    def from_memory(cls, memory: Memory) -> 'SharedMemoryImage':
+        """Создает блок с копией памяти и регистров."""
+        image = cls(memory.size)
+        image.copy_from(memory)
+        return image
+
+    @property
+    def name(self) -> str:
+        """Имя блока разделяемой памяти."""
+        return self._shm.name
+
+    def copy_from(self, memory: Memory):
+        """Копирует память и регистры из другого объекта памяти того же размера."""
+        if memory.size != self.size:
+            raise ValueError(f"Размеры памяти не совпадают: {memory.size} и {self.size}")
+        self.data[:] = bytes(memory.data)
+        for i, value in enumerate(memory.registers):
+            self.registers[i] = value
+
+    def reset(self):
+        """Обнуляет память и регистры."""
+        self._shm.buf[:self.size + REGISTERS_SIZE] = bytes(self.size + REGISTERS_SIZE)
+
+    def load_program(self, program_bytes: bytes, offset: int = 0):
+        """Загружает программу в память (байты за границей памяти отбрасываются)."""
+        count = max(0, min(len(program_bytes), self.size - offset))
+        self.data[offset:offset + count] = bytes(program_bytes[:count])
+
+    def close(self):
+        """Отключается от блока (блок продолжает существовать)."""
+        self.registers.release()
+        self.data.release()
+        self._shm.close()
+
+    def unlink(self):
+        """Удаляет блок (после отключения всех процессов память освобождается)."""
+        self._shm.unlink()
+
+    def __reduce__(self):
+        return (self.attach, (self.name, self.size))
+
+    def __enter__(self) -> 'SharedMemoryImage':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def run_shared(name: str, size: int, program: bytes, max_steps: Optional[int] = None,
+               time_limit: Optional[float] = None) -> int:
+    """
+    Выполняет программу в существующем блоке разделяемой памяти.
+
+    Args:
+        name: Имя блока
+        size: Размер памяти в байтах
+        program: Содержимое бинарного файла (объектного или сырого)
+        max_steps: Лимит числа команд
+        time_limit: Лимит времени выполнения в секундах
+
+    Returns:
+        Число выполненных команд
+    """
+    with SharedMemoryImage.attach(name, size) as memory:
+        cpu = CPU(memory)
+        code, _ = load_binary(memory, program)
+        cpu.execute(code, max_steps, time_limit)
+        # Освобождаем ссылки CPU на память до отключения от блока
+        steps = cpu.steps
+        del cpu
+        return steps
+
+
+def run_batch(programs: Sequence[bytes], template: Optional[Memory] = None,
+              workers: Optional[int] = None, memory_size: int = 65536,
+              max_steps: Optional[int] = None) -> List[SharedMemoryImage]:
+    """
+    Выполняет программы в пуле процессов, каждую в своем блоке памяти.
+
+    Начальный образ копируется из template в блоки внутри родительского
+    процесса; рабочим процессам передаются только имена блоков.
+    Вызывающий код должен закрыть (close) и удалить (unlink) блоки.
+
+    Args:
+        programs: Содержимое бинарных файлов программ
+        template: Начальный образ памяти (по умолчанию - нулевая память)
+        workers: Число рабочих процессов (по умолчанию - число ядер)
+        memory_size: Размер памяти, если template не задан
+        max_steps: Лимит числа команд каждой программы
+
+    Returns:
+        Блоки с итоговым состоянием памяти, в порядке программ
+    """
+    size = template.size if template is not None else memory_size
+    images = []
+    try:
+        for _ in programs:
+            image = SharedMemoryImage(size)
+            images.append(image)
+            if template is not None:
+                image.copy_from(template)
+
+        with ProcessPoolExecutor(workers or os.cpu_count() or 1) as pool:
+            futures = [pool.submit(run_shared, image.name, size, program, max_steps)
+                       for image, program in zip(images, programs)]
+            for future in futures:
+                future.result()
+    except BaseException:
+        for image in images:
+            image.close()
+            image.unlink()
+        raise
+    return images
@@ -0,0 +1,126 @@
+"""
+Статическая проверка программ УВМ и выполнение без проверок границ.
+
+В УВМ нет команд перехода, поэтому программа выполняется строго
+последовательно и значения регистров можно отслеживать статически:
+load_const задает известное значение, read_mem - неизвестное. Если для
+каждого обращения к памяти адрес известен и лежит в границах памяти,
+программа считается доказанной и компилируется в список операций с
+абсолютными адресами, которые выполняются без проверок.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from interpreter.predecode import DecodedProgram, iter_fields
+
+
+# Виды операций проверенной программы
+OP_LOAD = 0   # (OP_LOAD, регистр, значение)
+OP_READ = 1   # (OP_READ, регистр, адрес)
+OP_WRITE = 2  # (OP_WRITE, регистр, адрес)
+OP_BSWAP = 3  # (OP_BSWAP, адрес операнда, адрес результата)
+
+
+class VerifiedProgram:
+    """Программа с доказанными границами: операции с абсолютными адресами."""
+
+    def __init__(self, ops: List[Tuple[int, int, int]], offsets: List[int], size: int):
+        """
+        Args:
+            ops: Операции программы
+            offsets: Смещения команд в машинном коде
+            size: Размер машинного кода в байтах
+        """
+        self.ops = ops
+        self.offsets = offsets
+        self.size = size
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def run(self, memory, start: int = 0, stop: Optional[int] = None):
+        """
+        Выполняет операции [start, stop) без проверок границ.
+
+        Args:
+            memory: Объект памяти, для которого программа была проверена
+            start: Номер первой операции
+            stop: Номер операции, перед которой выполнение останавливается
+        """
+        data = memory.data
+        regs = memory.registers
+        for kind, x, y in self.ops[start:stop]:
+            if kind == OP_LOAD:
+                regs[x] = y
+            elif kind == OP_READ:
+                regs[x] = data[y] | (data[y + 1] << 8) | (data[y + 2] << 16) | (data[y + 3] << 24)
+            elif kind == OP_WRITE:
+                value = regs[x]
+                data[y] = value & 0xFF
+                data[y + 1] = (value >> 8) & 0xFF
+                data[y + 2] = (value >> 16) & 0xFF
+                data[y + 3] = value >> 24
+            else:
+                data[y:y + 4] = data[x:x + 4][::-1]
+
+
+def verify(program, registers: Sequence[int],
+           memory_size: int) -> Optional[VerifiedProgram]:
+    """
+    Доказывает, что все обращения к памяти программы лежат в границах.
+
+    Args:
+        program: Машинный код или декодированная программа (DecodedProgram)
+        registers: Начальные значения регистров
+        memory_size: Размер памяти в байтах
+
+    Returns:
+        Проверенная программа или None, если доказать границы не удалось
+        (адрес зависит от прочитанных из памяти данных, выходит за границы
+        или код некорректен)
+    """
+    if isinstance(program, DecodedProgram):
+        instructions = iter(program)
+        size = program.size
+    else:
+        instructions = iter_fields(program)
+        size = len(program)
+
+    known: List[Optional[int]] = list(registers)
+    limit = memory_size - 4
+    ops = []
+    offsets = []
+
+    try:
+        for pc, opcode, B, C, D, E in instructions:
+            if opcode == 2:  # load_const
+                known[B] = C
+                op = (OP_LOAD, B, C)
+            elif opcode == 7:  # read_mem
+                address = known[C]
+                if address is None or not 0 <= address <= limit:
+                    return None
+                known[B] = None
+                op = (OP_READ, B, address)
+            elif opcode == 5:  # write_mem
+                address = known[C]
+                if address is None or not 0 <= address <= limit:
+                    return None
+                op = (OP_WRITE, B, address)
+            else:  # bswap
+                operand = known[E]
+                result = known[B]
+                if operand is None or result is None:
+                    return None
+                operand += C
+                result += D
+                if not (0 <= operand <= limit and 0 <= result <= limit):
+                    return None
+                op = (OP_BSWAP, operand, result)
+
+            ops.append(op)
+            offsets.append(pc)
+    except ValueError:
+        return None
+
+    return VerifiedProgram(ops, offsets, size)
@@ -40,6 +40,25 @@ if __name__ == '__main__':
         'tests/test2.py',
         'tests/test3.py',
         'tests/test4.py',
+        'tests/test5.py',
+        'tests/test6.py',
+        'tests/test7.py',
+        'tests/test8.py',
+        'tests/test9.py',
+        'tests/test10.py',
+        'tests/test11.py',
+        'tests/test12.py',
+        'tests/test13.py',
+        'tests/test14.py',
+        'tests/test15.py',
+        'tests/test16.py',
+        'tests/test17.py',
+        'tests/test18.py',
+        'tests/test19.py',
+        'tests/test20.py',
+        'tests/test21.py',
+        'tests/test22.py',
+        'tests/test23.py',
     ]
     
     results = []
@@ -0,0 +1,55 @@
+"""Тест 10: Проверка сервера выполнения (JSON-строки, пул машин, лимиты)."""
+
+import base64
+import io
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from interpreter.server import Server
+
+
+def test_server():
+    """Тестирует обработку запросов сервером в текущем процессе."""
+    # load_const r0=0x100; load_const r1=0x1234; write_mem r1 -> [r0]
+    program = bytes([0x02, 0x00, 0x08, 0x00, 0x00,
+                     0x12, 0xA0, 0x91, 0x00, 0x00,
+                     0x15, 0x00, 0x00])
+    encoded = base64.b64encode(program).decode('ascii')
+    requests = [
+        {'id': 1, 'program': encoded, 'words': [0x100]},
+        {'id': 2, 'program': encoded, 'start': 0x100, 'end': 0x104},
+        {'id': 3, 'program': encoded, 'max_steps': 2},
+    ]
+    stdin = io.StringIO(''.join(json.dumps(r) + '\n' for r in requests) + 'oops\n')
+    stdout = io.StringIO()
+    
+    server = Server(workers=0)
+    server.serve_stdio(stdin, stdout)
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    
+    # Память переиспользуется, но не сохраняет состояние между запросами
+    memory, _ = server.pool.acquire()
+    pool_clean = memory.read_word(0x100) == 0
+    
+    print("Тест сервера:")
+    for response in responses:
+        print(f"  {response}")
+    
+    if (responses[0] == {'id': 1, 'ok': True, 'steps': 3, 'words': {'256': 0x1234}}
+            and responses[1]['dump'] == [[0x100, 0x1234], [0x104, 0]]
+            and responses[2]['ok'] is False
+            and responses[3]['ok'] is False and responses[3]['id'] is None
+            and pool_clean):
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_server()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,82 @@
+"""Тест 11: Проверка асинхронного интерфейса выполнения (asyncio)."""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from interpreter import aio
+from interpreter.aio import AsyncExecutor
+from interpreter.cpu import ExecutionLimitError
+
+
+# load_const r0=0x100; load_const r1=0x1234; write_mem r1 -> [r0]
+PROGRAM = bytes([0x02, 0x00, 0x08, 0x00, 0x00,
+                 0x12, 0xA0, 0x91, 0x00, 0x00,
+                 0x15, 0x00, 0x00])
+
+
+async def run_jobs():
+    """Запускает несколько заданий параллельно и поток дампа."""
+    async with AsyncExecutor(workers=2, max_pending=2) as executor:
+        results = await asyncio.gather(*[
+            executor.submit(PROGRAM, (0x100, 0x104)) for _ in range(4)
+        ])
+        chunks = [chunk async for chunk in executor.stream(PROGRAM, (0x0F8, 0x104), chunk_words=2)]
+        # Дамп всей памяти порциями из разделяемой памяти; ошибка задания
+        full = [len(chunk) async for chunk in executor.stream(PROGRAM, (0, 0xFFFF))]
+        try:
+            async for _ in executor.stream(PROGRAM, (0, 0x10), max_steps=1):
+                pass
+            full = None
+        except ExecutionLimitError:
+            pass
+        try:
+            await executor.submit(PROGRAM, max_steps=1)
+            limit_ok = False
+        except ExecutionLimitError:
+            limit_ok = True
+    return results, chunks, full, limit_ok
+
+
+async def run_default():
+    """Выполняет задание на общем исполнителе."""
+    result = await aio.submit(PROGRAM, (0x100, 0x104))
+    return result.dump()
+
+
+def test_async_executor():
+    """Тестирует submit, stream и лимиты асинхронного исполнителя."""
+    results, chunks, full, limit_ok = asyncio.run(run_jobs())
+    
+    # Общий исполнитель: пул завершается обработчиком atexit, после чего
+    # при следующем обращении создается новый
+    first = asyncio.run(run_default())
+    executor = aio.default_executor()
+    aio.shutdown_default_executor()
+    default_ok = (first == [(0x100, 0x1234), (0x104, 0)] and aio._default_executor is None
+                  and aio.default_executor() is not executor)
+    aio.shutdown_default_executor()
+    
+    print("Тест asyncio интерфейса:")
+    print(f"  Дампы: {[r.dump() for r in results]}")
+    print(f"  Порции: {chunks}")
+    print(f"  Дамп всей памяти (слов в порциях): {full and sorted(set(full))}, порций: {full and len(full)}")
+    print(f"  Лимит шагов: {limit_ok}")
+    print(f"  Общий исполнитель: {default_ok}")
+    
+    if (all(r.dump() == [(0x100, 0x1234), (0x104, 0)] for r in results)
+            and chunks == [[(0x0F8, 0), (0x0FC, 0)], [(0x100, 0x1234), (0x104, 0)]]
+            and full == [1024] * 16
+            and limit_ok and default_ok):
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_async_executor()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,115 @@
+"""Тест 12: Проверка статического верификатора и выполнения без проверок границ."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from uvm import api
+from interpreter.memory import Memory
+from interpreter.cpu import CPU, ExecutionLimitError
+from interpreter.loader import load_binary
+
+
+def run_program(blob: bytes, use_verifier: bool, max_steps: int = None):
+    """Выполняет программу и возвращает (признак проверки, память, регистры, шаги, ошибка)."""
+    memory = Memory()
+    cpu = CPU(memory)
+    cpu.USE_VERIFIER = use_verifier
+    code, _ = load_binary(memory, blob)
+    error = None
+    try:
+        cpu.execute(code, max_steps)
+    except (ExecutionLimitError, RuntimeError) as e:
+        error = type(e).__name__
+    return cpu.verified, memory.data, memory.registers, cpu.steps, cpu.pc, error
+
+
+def test_verifier():
+    """Сравнивает быстрый и обычный пути выполнения."""
+    proven = api.assemble("""
+symbols:
+  src: 0x1000
+  dst: 0x2000
+instructions:
+  - opcode: load_const
+    address: 1
+    constant: src
+  - opcode: load_const
+    address: 2
+    constant: dst
+  - opcode: load_const
+    address: 3
+    constant: 0x1234567
+  - repeat: 4
+    var: i
+    body:
+      - opcode: write_mem
+        source_addr: 3
+        result_addr: 1
+      - opcode: read_mem
+        result_addr: 4
+        source_addr: 1
+      - opcode: bswap
+        result_addr: 2
+        result_offset: 4 * i
+        operand_offset: 0
+        operand_addr: 1
+""").to_bytes()
+    
+    # Адрес зависит от прочитанного из памяти значения: доказать нельзя
+    unproven = api.assemble("""
+instructions:
+  - opcode: load_const
+    address: 1
+    constant: 0x100
+  - opcode: read_mem
+    result_addr: 2
+    source_addr: 1
+  - opcode: write_mem
+    source_addr: 1
+    result_addr: 2
+""").to_bytes()
+    
+    # Адрес за границей памяти: проверенный путь должен сообщить об ошибке
+    out_of_range = api.assemble("""
+instructions:
+  - opcode: load_const
+    address: 1
+    constant: 0xFFFE
+  - opcode: write_mem
+    source_addr: 1
+    result_addr: 1
+""").to_bytes()
+    
+    fast = run_program(proven, True)
+    checked = run_program(proven, False)
+    same_state = fast[1:] == checked[1:]
+    
+    fast_limited = run_program(proven, True, max_steps=5)
+    checked_limited = run_program(proven, False, max_steps=5)
+    same_limited = fast_limited[1:] == checked_limited[1:]
+    
+    fallback = run_program(unproven, True)
+    failure = run_program(out_of_range, True)
+    
+    print("Тест верификатора:")
+    print(f"  Доказана: {fast[0]}, совпадает с обычным путем: {same_state}")
+    print(f"  Лимит шагов: {fast_limited[5]} на шаге {fast_limited[3]}, совпадает: {same_limited}")
+    print(f"  Адрес из памяти: доказана {fallback[0]}, ошибка {fallback[5]}")
+    print(f"  Выход за границы: доказана {failure[0]}, ошибка {failure[5]}")
+    
+    if (fast[0] and not checked[0] and same_state and fast[5] is None
+            and fast_limited[0] and fast_limited[5] == 'ExecutionLimitError' and same_limited
+            and not fallback[0] and fallback[5] is None
+            and not failure[0] and failure[5] == 'RuntimeError'):
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_verifier()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,111 @@
+"""Тест 13: Проверка возобновляемого выполнения и планировщика заданий."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from uvm import api
+from interpreter.memory import Memory
+from interpreter.cpu import CPU
+from interpreter.scheduler import Scheduler, PRIORITY
+
+
+def make_program(count: int, base: int) -> bytes:
+    """Программа из count пар команд, пишущих слова начиная с адреса base."""
+    return api.assemble(f"""
+instructions:
+  - repeat: {count}
+    var: i
+    body:
+      - opcode: load_const
+        address: 1
+        constant: {base} + 4 * (i % 256)
+      - opcode: write_mem
+        source_addr: 1
+        result_addr: 1
+""").to_bytes()
+
+
+def test_scheduler():
+    """Тестирует run() по частям и порядок завершения заданий."""
+    program = make_program(50, 0x1000)
+    
+    # Выполнение по 7 команд совпадает с выполнением целиком
+    results = []
+    for use_verifier in (True, False):
+        memory = Memory()
+        cpu = CPU(memory)
+        cpu.USE_VERIFIER = use_verifier
+        cpu.load(api.load(program, memory))
+        slices = 0
+        while not cpu.run(7).finished:
+            slices += 1
+        results.append((memory.data, slices, cpu.steps))
+    whole = api.run(program)
+    resumable_ok = (results[0] == results[1] and results[0][0] == whole.data
+                    and results[0][1] == 100 // 7 and results[0][2] == 100)
+    
+    # Изменение регистра между частями: запись идет по новому адресу
+    edited = []
+    program = api.assemble("""
+instructions:
+  - opcode: load_const
+    address: 1
+    constant: 0x1000
+  - opcode: load_const
+    address: 2
+    constant: 7
+  - opcode: write_mem
+    source_addr: 2
+    result_addr: 1
+  - opcode: write_mem
+    source_addr: 2
+    result_addr: 1
+""").to_bytes()
+    for use_verifier in (True, False):
+        memory = Memory()
+        cpu = CPU(memory)
+        cpu.USE_VERIFIER = use_verifier
+        cpu.load(api.load(program, memory))
+        cpu.run(max_steps=3)
+        memory.registers[1] = 0x2000
+        cpu.run(max_steps=1)
+        edited.append((memory.read_word(0x1000), memory.read_word(0x2000), cpu.verified))
+    edit_ok = edited == [(7, 7, False), (7, 7, False)]
+    
+    # Небольшое задание завершается раньше большого, поставленного до него
+    scheduler = Scheduler(quantum=100)
+    big = scheduler.submit(make_program(5000, 0x2000), name='big')
+    small = scheduler.submit(make_program(10, 0x3000), name='small')
+    limited = scheduler.submit(make_program(1000, 0x4000), name='limited', max_steps=500)
+    order = [task.name for task in scheduler.run()]
+    round_robin_ok = (order == ['small', 'limited', 'big'] and big.steps == 10000
+                      and big.memory.read_word(0x2004) == 0x2004 and small.slices == 1
+                      and limited.error is not None and limited.steps == 500)
+    
+    # Приоритетное задание выполняется первым
+    scheduler = Scheduler(quantum=100, policy=PRIORITY)
+    for name in ('a', 'b'):
+        scheduler.submit(make_program(200, 0x1000), name=name)
+    scheduler.submit(make_program(200, 0x1000), name='urgent', priority=5)
+    priority_order = [task.name for task in scheduler.run()]
+    priority_ok = priority_order == ['urgent', 'a', 'b']
+    
+    print("Тест планировщика:")
+    print(f"  Возобновляемое выполнение: {resumable_ok}")
+    print(f"  Изменение регистров между частями: {edit_ok}")
+    print(f"  Порядок завершения (round robin): {order}")
+    print(f"  Порядок завершения (priority): {priority_order}")
+    
+    if resumable_ok and edit_ok and round_robin_ok and priority_ok:
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_scheduler()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,83 @@
+"""Тест 14: Проверка памяти УВМ в разделяемой памяти и пакетного выполнения."""
+
+import pickle
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from uvm import api
+from interpreter.memory import Memory
+from interpreter.cpu import CPU
+from interpreter.shared import SharedMemoryImage, run_batch
+
+
+def bswap_program(offset: int) -> bytes:
+    """Программа: обратить байты слова 0x1000 и записать в 0x2000 + offset."""
+    return api.assemble(f"""
+instructions:
+  - opcode: load_const
+    address: 1
+    constant: 0x1000
+  - opcode: load_const
+    address: 2
+    constant: 0x2000
+  - opcode: bswap
+    result_addr: 2
+    result_offset: {offset}
+    operand_offset: 0
+    operand_addr: 1
+  - opcode: read_mem
+    result_addr: 3
+    source_addr: 1
+""").to_bytes()
+
+
+def test_shared_memory():
+    """Тестирует образ в разделяемой памяти, подключение по имени и пакетный запуск."""
+    # Образ готовится родителем один раз
+    template = SharedMemoryImage()
+    template.write_word(0x1000, 0x12345678)
+    
+    # Подключение по имени (pickle передает только имя блока)
+    attached = pickle.loads(pickle.dumps(template))
+    attach_ok = attached.name == template.name and attached.read_word(0x1000) == 0x12345678
+    attached.close()
+    
+    # Результаты совпадают с обычной памятью
+    memory = Memory()
+    memory.write_word(0x1000, 0x12345678)
+    CPU(memory).execute(api.load(bswap_program(0), memory))
+    
+    images = run_batch([bswap_program(0), bswap_program(8)], template, workers=2)
+    try:
+        results = [(image.read_word(0x2000), image.read_word(0x2008), image.registers[3])
+                   for image in images]
+        same_state = bytes(images[0].data) == bytes(memory.data) and \
+            list(images[0].registers) == memory.registers
+    finally:
+        for image in images:
+            image.close()
+            image.unlink()
+    
+    template_clean = template.read_word(0x2000) == 0
+    template.close()
+    template.unlink()
+    
+    print("Тест разделяемой памяти:")
+    print(f"  Подключение по имени: {attach_ok}")
+    print(f"  Результаты: {[[hex(v) for v in r] for r in results]}")
+    print(f"  Совпадает с обычной памятью: {same_state}, образ не изменен: {template_clean}")
+    
+    if (attach_ok and same_state and template_clean
+            and results == [(0x78563412, 0, 0x12345678), (0, 0x78563412, 0x12345678)]):
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_shared_memory()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,191 @@
+"""Тест 15: Проверка журнала записей и восстановления состояния по шагам."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from uvm import api
+from interpreter.memory import Memory
+from interpreter.cpu import CPU, ExecutionLimitError
+from interpreter.journal import Journal
+
+
+def run_program(program: bytes, use_verifier: bool, max_steps: int = None,
+                journal: Journal = None):
+    """Выполняет программу и возвращает (память, CPU)."""
+    memory = Memory()
+    cpu = CPU(memory)
+    cpu.USE_VERIFIER = use_verifier
+    cpu.journal = journal
+    code = api.load(program, memory)
+    try:
+        cpu.execute(code, max_steps)
+    except (ExecutionLimitError, RuntimeError):
+        pass
+    return memory, cpu
+
+
+def test_journal():
+    """Сравнивает восстановленное состояние с выполнением до заданного шага."""
+    program = api.assemble("""
+data:
+  - address: 0x1000
+    words: [0x11223344, 0x55667788]
+instructions:
+  - opcode: load_const
+    address: 1
+    constant: 0x1000
+  - opcode: load_const
+    address: 2
+    constant: 0x2000
+  - repeat: 3
+    var: i
+    body:
+      - opcode: read_mem
+        result_addr: 3
+        source_addr: 1
+      - opcode: write_mem
+        source_addr: 3
+        result_addr: 2
+      - opcode: bswap
+        result_addr: 2
+        result_offset: 4 + 4 * i
+        operand_offset: 4
+        operand_addr: 1
+""").to_bytes()
+    
+    # Запись за границу памяти на последнем шаге
+    failing = api.assemble("""
+instructions:
+  - opcode: load_const
+    address: 1
+    constant: 0x100
+  - opcode: write_mem
+    source_addr: 1
+    result_addr: 1
+  - opcode: read_mem
+    result_addr: 2
+    source_addr: 1
+  - opcode: write_mem
+    source_addr: 1
+    result_addr: 2
+  - opcode: load_const
+    address: 1
+    constant: 0x10000
+  - opcode: write_mem
+    source_addr: 1
+    result_addr: 1
+""").to_bytes()
+    
+    replay_ok = True
+    for use_verifier in (True, False):
+        journal = Journal(snapshot_interval=3)
+        _, cpu = run_program(program, use_verifier, journal=journal)
+        for step in range(len(journal) + 1):
+            expected, _ = run_program(program, False, max_steps=step)
+            state = journal.state_at(step)
+            if state.data != expected.data or state.registers != expected.registers:
+                replay_ok = False
+        replay_ok = replay_ok and len(journal) == cpu.steps == 11
+    
+    journal = Journal(snapshot_interval=4)
+    memory, cpu = run_program(failing, True, journal=journal)
+    last = list(journal.records(len(journal) - 1))
+    failure_ok = (not cpu.verified and len(journal) == 5 and cpu.pc == 19
+                  and journal.state_at(5).data == memory.data
+                  and journal.state_at(5).registers == memory.registers
+                  and last == [(4, 14, 0x80000001, 0x10000)])
+    
+    # Частичная запись у конца памяти (write_mem и bswap), в том числе по
+    # декодированной программе
+    from interpreter.predecode import DecodedProgram
+    partial_ok = True
+    for opcode_line in ("  - opcode: write_mem\n    source_addr: 2\n    result_addr: 1\n",
+                        "  - opcode: bswap\n    result_addr: 1\n    result_offset: 1\n"
+                        "    operand_offset: 0\n    operand_addr: 3\n"):
+        code = bytes(api.assemble("""
+instructions:
+  - opcode: load_const
+    address: 1
+    constant: 0xFFFE
+  - opcode: load_const
+    address: 2
+    constant: 0x1223344
+  - opcode: load_const
+    address: 3
+    constant: 0x100
+  - opcode: write_mem
+    source_addr: 2
+    result_addr: 3
+""" + opcode_line).code)
+        for decoded in (None, DecodedProgram.from_code(code)):
+            partial_memory = Memory()
+            partial_cpu = CPU(partial_memory)
+            partial_cpu.USE_VERIFIER = False
+            partial_cpu.journal = Journal(snapshot_interval=2)
+            try:
+                partial_cpu.execute(code, decoded=decoded)
+            except RuntimeError:
+                pass
+            state = partial_cpu.journal.state_at(len(partial_cpu.journal))
+            partial_ok = (partial_ok and partial_memory.data[0xFFFE:] != [0, 0]
+                          and state.data == partial_memory.data and len(partial_cpu.journal) == 5)
+    
+    # bswap с источником за концом памяти ничего не записывает: шаг не журналируется
+    code = bytes(api.assemble("""
+instructions:
+  - opcode: load_const
+    address: 1
+    constant: 0xFFFE
+  - opcode: bswap
+    result_addr: 1
+    result_offset: 1
+    operand_offset: 0
+    operand_addr: 1
+""").code)
+    for decoded in (None, DecodedProgram.from_code(code)):
+        partial_memory = Memory()
+        partial_cpu = CPU(partial_memory)
+        partial_cpu.USE_VERIFIER = False
+        partial_cpu.journal = Journal(snapshot_interval=2)
+        try:
+            partial_cpu.execute(code, decoded=decoded)
+        except RuntimeError:
+            pass
+        partial_ok = (partial_ok and len(partial_cpu.journal) == partial_cpu.steps == 1
+                      and partial_memory.data[0xFFFF] == 0)
+    
+    # Журнал, подключенный после load(), начинается перед первым шагом
+    late_memory = Memory()
+    late = CPU(late_memory)
+    late.load(api.load(program, late_memory))
+    late.journal = Journal()
+    late.run()
+    late_ok = len(late.journal) == 11 and late.journal.state_at(11).data == late_memory.data
+    late.load(late.program)
+    late.run(max_steps=2)
+    late.journal = Journal()
+    try:
+        late.run()
+        late_ok = False
+    except ValueError:
+        pass
+    
+    print("Тест журнала:")
+    print(f"  Частичная запись у конца памяти: {partial_ok}")
+    print(f"  Подключение журнала после load(): {late_ok}")
+    print(f"  Восстановление состояния на каждом шаге: {replay_ok}")
+    print(f"  Ошибка на адресе {cpu.pc}, шагов в журнале: {len(journal)}, последняя запись: {last}")
+    
+    if replay_ok and failure_ok and partial_ok and late_ok:
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_journal()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,69 @@
+"""Тест 16: Проверка дифференциального сравнения исполнителей и сокращения программ."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from uvm import api, conformance
+from interpreter.memory import Memory
+from interpreter.instructions import InstructionExecutor
+
+
+class CopyingExecutor(InstructionExecutor):
+    """Исполнитель с ошибкой: bswap копирует слово без обращения байтов."""
+    
+    def execute_bswap(self, result_addr, result_offset, operand_offset, operand_addr):
+        address = self.memory.get_register(operand_addr) + operand_offset
+        target = self.memory.get_register(result_addr) + result_offset
+        self.memory.write_word(target, self.memory.read_word(address))
+
+
+def broken_engine(code: bytes, memory_size: int) -> conformance.Outcome:
+    """Исполнитель для проверки: обычный CPU с ошибочной командой bswap."""
+    memory = Memory(memory_size)
+    
+    def configure(cpu):
+        cpu.USE_VERIFIER = False
+        cpu.executor = CopyingExecutor(memory)
+    return conformance._run_cpu(code, memory, configure)
+
+
+def test_conformance():
+    """Тестирует отсутствие расхождений и поиск ошибки в исполнителе."""
+    clean = conformance.run(programs=200, workers=2)
+    
+    conformance.register_engine('broken', broken_engine)
+    result = conformance.run(programs=20, workers=1, engines=['broken'])
+    failures = result['failures']
+    
+    # Минимальная программа ассемблируется и воспроизводит расхождение
+    reproduced = False
+    minimal_size = None
+    if failures:
+        minimal = failures[0]['minimal']
+        minimal_size = minimal.count('opcode:')
+        code = api.assemble(minimal).code
+        expected = conformance.ENGINES['checked'](bytes(code), 4096)
+        actual = broken_engine(bytes(code), 4096)
+        reproduced = bool(conformance.diff_outcomes('broken', expected, actual))
+    
+    print("Тест сравнения исполнителей:")
+    print(f"  Проверено: {clean['checked']}, расхождений: {len(clean['failures'])}")
+    print(f"  Ошибочный исполнитель: расхождений {len(failures)}, "
+          f"минимальная программа из {minimal_size} команд")
+    if failures:
+        print(failures[0]['minimal'])
+    
+    if (clean['checked'] == 200 and not clean['failures'] and failures
+            and minimal_size <= 3 and reproduced):
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_conformance()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,138 @@
+"""Тест 17: Проверка точек останова, точек наблюдения и обработчиков команд."""
+
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from uvm import api
+from interpreter.memory import Memory
+from interpreter.cpu import CPU
+from interpreter.debugger import IntervalIndex, Watchpoint
+
+
+PROGRAM = """
+instructions:
+  - opcode: load_const
+    address: 1
+    constant: 0x1000
+  - opcode: load_const
+    address: 2
+    constant: 0xABCD
+  - label: store
+  - opcode: write_mem
+    source_addr: 2
+    result_addr: 1
+  - opcode: read_mem
+    result_addr: 3
+    source_addr: 1
+  - opcode: bswap
+    result_addr: 1
+    result_offset: 0x100
+    operand_offset: 0
+    operand_addr: 1
+"""
+
+
+def new_cpu():
+    """Создает CPU с загруженной программой."""
+    obj = api.assemble(PROGRAM)
+    memory = Memory()
+    cpu = CPU(memory)
+    cpu.load(api.load(obj, memory))
+    return cpu, obj.symbols['labels']['store']
+
+
+def test_debugger():
+    """Тестирует остановки, продолжение выполнения и интервальный индекс."""
+    # Точка останова: остановка перед командой, затем продолжение
+    cpu, store = new_cpu()
+    cpu.add_breakpoint(store)
+    first = cpu.run()
+    second = cpu.run()
+    breakpoint_ok = (first.event is not None and first.pc == store and first.steps == 2
+                     and not first.finished and second.finished and second.steps == 5)
+    
+    # Точка наблюдения за записью: остановка после записи
+    cpu, _ = new_cpu()
+    cpu.add_watchpoint(0x1100, 0x1104, 'write')
+    reads = []
+    cpu.add_watchpoint(0x1002, 0x1003, 'read', lambda c, e: reads.append(e.pc))
+    opcodes = []
+    cpu.on_opcode('bswap', lambda c, e: opcodes.append(e.pc))
+    state = cpu.run()
+    watch_ok = (state.event.kind == 'write' and state.event.address == 0x1100
+                and cpu.memory.read_word(0x1100) == 0xCDAB0000 and state.finished
+                and reads == [store + 3, store + 6] and opcodes == [store + 6])
+    
+    # Без перехватчиков - прежний (проверенный) путь выполнения
+    cpu, _ = new_cpu()
+    cpu.add_breakpoint(0)
+    cpu.clear_hooks()
+    state = cpu.run()
+    fast_ok = cpu.hooks is None and cpu.verified and state.finished and state.event is None
+    
+    # Удаление последней точки наблюдения тоже возвращает быстрый путь
+    cpu, _ = new_cpu()
+    cpu.remove_watchpoint(cpu.add_watchpoint(0x1100, 0x1104))
+    state = cpu.run()
+    fast_ok = fast_ok and cpu.hooks is None and cpu.verified and state.finished
+    
+    # Изменение регистров при остановке: продолжение идет с новыми адресами
+    resumed = []
+    for address in (0x2000, 0xFFFF0):
+        cpu, store = new_cpu()
+        cpu.add_breakpoint(store)
+        cpu.run()
+        cpu.memory.registers[1] = address
+        cpu.clear_hooks()
+        try:
+            cpu.run()
+            resumed.append((cpu.memory.read_word(0x1000), cpu.memory.read_word(0x2000)))
+        except RuntimeError:
+            resumed.append('error')
+    resume_ok = resumed == [(0, 0xABCD), 'error']
+    
+    # Интервальный индекс совпадает с линейным поиском
+    rng = random.Random(1)
+    index = IntervalIndex()
+    items = []
+    for _ in range(300):
+        start = rng.randrange(0, 10000)
+        item = Watchpoint(start, start + rng.randrange(1, 50), 'write', None)
+        items.append(item)
+        index.add(item)
+    # Длинный и пустой интервалы, удаление из середины
+    for item in (Watchpoint(500, 9000, 'write', None), Watchpoint(700, 700, 'write', None)):
+        items.append(item)
+        index.add(item)
+    for _ in range(50):
+        index.remove(items.pop(rng.randrange(len(items))))
+    index_ok = True
+    for _ in range(2000):
+        address = rng.randrange(-10, 10100)
+        expected = {id(i) for i in items
+                    if i.start < i.end and i.start < address + 4 and address < i.end}
+        found = index.find(address, address + 4)
+        if len(found) != len(expected) or {id(i) for i in found} != expected:
+            index_ok = False
+    
+    print("Тест отладочных перехватчиков:")
+    print(f"  Точка останова: {breakpoint_ok}")
+    print(f"  Точки наблюдения и обработчики команд: {watch_ok}")
+    print(f"  Без перехватчиков - быстрый путь: {fast_ok}")
+    print(f"  Продолжение после изменения регистров: {resume_ok}")
+    print(f"  Интервальный индекс: {index_ok}")
+    
+    if breakpoint_ok and watch_ok and fast_ok and resume_ok and index_ok:
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_debugger()
+    sys.exit(0 if success else 1)
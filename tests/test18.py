@@ -0,0 +1,120 @@
+"""Тест 18: Проверка кэша декодированных программ."""
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from uvm import api
+from interpreter.memory import Memory
+from interpreter.cpu import CPU
+from interpreter.predecode import DecodedProgram, ProgramCache
+
+
+def make_code(count: int) -> bytes:
+    """Машинный код программы из count пар команд записи."""
+    return bytes(api.assemble(f"""
+instructions:
+  - repeat: {count}
+    var: i
+    body:
+      - opcode: load_const
+        address: 1
+        constant: 0x1000 + 4 * i
+      - opcode: write_mem
+        source_addr: 1
+        result_addr: 1
+      - opcode: bswap
+        result_addr: 1
+        result_offset: 0x100
+        operand_offset: 0
+        operand_addr: 1
+""").code)
+
+
+def run(code: bytes, decoded=None, use_verifier=True):
+    """Выполняет код и возвращает (память, регистры, шаги)."""
+    memory = Memory()
+    cpu = CPU(memory)
+    cpu.USE_VERIFIER = use_verifier
+    memory.load_program(code)
+    cpu.execute(code, decoded=decoded)
+    return memory.data, memory.registers, cpu.steps, cpu.pc
+
+
+def test_cache():
+    """Тестирует сохранение, загрузку, выполнение и вытеснение."""
+    code = make_code(50)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ProgramCache(directory)
+        cold = cache.load(code)
+        warm = cache.get(code)
+        path = cache.path_for(code)
+        roundtrip_ok = (warm is not None and path.exists() and len(warm) == 150
+                        and list(warm) == list(cold) and warm.size == len(code))
+        
+        # Выполнение по декодированной программе совпадает с обычным
+        expected = run(code)
+        same_ok = run(code, warm) == expected and run(code, warm, use_verifier=False) == expected
+        
+        # Поврежденный файл игнорируется: обрезанный, с измененным байтом столбцов,
+        # записанный для другого кода того же размера
+        blob = path.read_bytes()
+        path.write_bytes(blob[:40])
+        truncated_ok = cache.get(code) is None and cache.load(code) is not None
+        flipped = bytearray(blob)
+        flipped[len(blob) - 200] ^= 0x01
+        path.write_bytes(bytes(flipped))
+        flipped_ok = cache.get(code) is None and cache.load(code) is not None
+        other = code.replace(bytes([code[0]]), bytes([code[0] ^ 0x10]), 1)
+        cache.path_for(other).write_bytes(path.read_bytes())
+        other_ok = cache.get(other) is None and list(cache.load(other)) != list(cold)
+        
+        # Поля, которые не могли получиться декодированием, отвергаются
+        invalid = []
+        # Команда 1 - write_mem: C у нее номер регистра
+        for column, index, value in (('opcodes', 0, 3), ('B', 0, 200), ('C', 1, 200),
+                                     ('offsets', 1, cold.offsets[1] + 1)):
+            broken = DecodedProgram.from_bytes(cold.to_bytes())
+            getattr(broken, column)[index] = value
+            try:
+                DecodedProgram.from_bytes(broken.to_bytes())
+                invalid.append(False)
+            except ValueError:
+                invalid.append(True)
+        corrupt_ok = truncated_ok and flipped_ok and other_ok and all(invalid)
+        
+        # Вытеснение: в кэш помещаются две программы, удаляется давно не использованная
+        small = ProgramCache(directory, max_bytes=2 * len(cold.to_bytes()) + 100)
+        codes = [make_code(50 + i) for i in range(3)]
+        small.load(codes[0])
+        small.load(codes[1])
+        old = time.time() - 100
+        os.utime(small.path_for(codes[1]), (old, old))
+        small.get(codes[0])
+        small.load(codes[2])
+        kept = [small.path_for(c).exists() for c in codes]
+        evict_ok = kept == [True, False, True]
+    
+    print("Тест кэша декодированных программ:")
+    print(f"  Сохранение и загрузка: {roundtrip_ok}")
+    print(f"  Выполнение совпадает: {same_ok}")
+    print(f"  Поврежденный файл (обрезан, изменен, чужой, поля): "
+          f"{[truncated_ok, flipped_ok, other_ok, invalid]}")
+    print(f"  Вытеснение (оставлены): {kept}")
+    
+    if roundtrip_ok and same_ok and corrupt_ok and evict_ok:
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_cache()
+    sys.exit(0 if success else 1)
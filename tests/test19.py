@@ -0,0 +1,101 @@
+"""Тест 19: Проверка JSON отчетов ассемблера и интерпретатора (--report)."""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from assembler import cli as assembler_cli
+from interpreter import cli as interpreter_cli
+
+
+SOURCE = """
+instructions:
+  - repeat: 20
+    var: i
+    body:
+      - opcode: load_const
+        address: 1
+        constant: 0x100 + 4 * i
+      - opcode: write_mem
+        source_addr: 1
+        result_addr: 1
+"""
+
+
+def run_main(main, *argv) -> int:
+    """Вызывает main() CLI с аргументами и возвращает код завершения."""
+    saved = sys.argv
+    sys.argv = ['uvm'] + [str(arg) for arg in argv]
+    try:
+        main()
+        return 0
+    except SystemExit as e:
+        return e.code or 0
+    finally:
+        sys.argv = saved
+
+
+def test_reports():
+    """Тестирует отчеты обоих CLI, в том числе при ошибке выполнения."""
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        source = directory / 'program.yaml'
+        source.write_text(SOURCE, encoding='utf-8')
+        binary = directory / 'program.bin'
+
+        # Ассемблер: обычный и потоковый режимы
+        symbols = directory / 'program.json'
+        run_main(assembler_cli.main, source, binary, '--symbols', symbols,
+                 '--report', directory / 'asm.json')
+        asm = json.loads((directory / 'asm.json').read_text(encoding='utf-8'))
+        asm_ok = (asm['format'] == 'uvm-report' and asm['tool'] == 'assembler'
+                  and asm['status'] == 'ok'
+                  and {'read', 'parse', 'translate', 'codegen', 'write'} <= set(asm['phases'])
+                  and asm['counts']['instructions'] == 40
+                  and asm['counts']['code_bytes'] == binary.stat().st_size
+                  and asm['peak_rss_bytes'] > 0)
+
+        run_main(assembler_cli.main, source, directory / 'stream.bin', '--stream',
+                 '--report', directory / 'stream.json')
+        stream = json.loads((directory / 'stream.json').read_text(encoding='utf-8'))
+        stream_ok = ('assemble' in stream['phases']
+                     and stream['counts']['instructions'] == 40)
+
+        # Интерпретатор
+        run_main(interpreter_cli.main, binary, directory / 'dump.xml', '--symbols', symbols,
+                 '--report', directory / 'run.json')
+        run = json.loads((directory / 'run.json').read_text(encoding='utf-8'))
+        run_ok = (run['tool'] == 'interpreter' and run['status'] == 'ok'
+                  and {'read', 'symbols', 'load', 'prepare', 'execute', 'dump'} <= set(run['phases'])
+                  and run['counts']['steps'] == 40
+                  and run['counts']['verified'] == 1
+                  and run['total_seconds'] >= sum(run['phases'].values()))
+
+        # Ошибка выполнения: отчет записывается со статусом error
+        bad = directory / 'bad.bin'
+        bad.write_bytes(b'\x0F')
+        code = run_main(interpreter_cli.main, bad, directory / 'bad.xml',
+                        '--report', directory / 'bad.json')
+        failed = json.loads((directory / 'bad.json').read_text(encoding='utf-8'))
+        error_ok = code == 1 and failed['status'] == 'error' and 'error' in failed
+
+    print("Тест отчетов --report:")
+    print(f"  Ассемблер: {asm_ok} (этапы: {', '.join(asm['phases'])})")
+    print(f"  Потоковый режим: {stream_ok}")
+    print(f"  Интерпретатор: {run_ok} (этапы: {', '.join(run['phases'])})")
+    print(f"  Отчет при ошибке: {error_ok}")
+
+    if asm_ok and stream_ok and run_ok and error_ok:
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_reports()
+    sys.exit(0 if success else 1)
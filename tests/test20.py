@@ -0,0 +1,102 @@
+"""Тест 20: Проверка пакетного выполнения (NumPy) над множеством образов памяти."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from uvm import api
+from interpreter.memory import Memory
+from interpreter.cpu import CPU
+
+
+SOURCE = """
+instructions:
+  - repeat: 8
+    var: i
+    body:
+      - opcode: load_const
+        address: 1
+        constant: 0x100 + 4 * i
+      - opcode: read_mem
+        result_addr: 2
+        source_addr: 1
+      - opcode: bswap
+        result_addr: 1
+        result_offset: 0x100
+        operand_offset: 0
+        operand_addr: 1
+  - opcode: write_mem
+    source_addr: 2
+    result_addr: 3
+"""
+
+
+def make_images(code: bytes, count: int):
+    """Образы памяти с разными входными данными; в двух последних адрес записи вне памяти."""
+    images = []
+    for k in range(count):
+        memory = Memory(4096)
+        memory.load_program(code)
+        for i in range(8):
+            memory.write_word(0x100 + 4 * i, (k * 0x01020304 + i) & 0xFFFFFFFF)
+        memory.registers[3] = 0x400 if k < count - 2 else 4094 + k % 2 * 10
+        images.append(memory)
+    return images
+
+
+def test_batch():
+    """Тестирует совпадение пакетного выполнения с CPU для каждого экземпляра."""
+    try:
+        from interpreter.batch import BatchMemory, BatchCPU
+        BatchMemory(1, 4)
+    except ImportError:
+        print("Тест пакетного выполнения: NumPy не установлен, тест пропущен")
+        return True
+
+    code = bytes(api.assemble(SOURCE).code)
+    images = make_images(code, 6)
+    batch = BatchMemory.from_memories(images)
+    cpu = BatchCPU(batch)
+    cpu.execute(code)
+
+    same = []
+    for k, memory in enumerate(images):
+        reference = CPU(memory)
+        error = None
+        try:
+            reference.execute(code)
+        except RuntimeError as e:
+            error = str(e)
+        result = batch.memory(k)
+        same.append(result.data == memory.data and result.registers == memory.registers
+                     and int(cpu.steps[k]) == reference.steps and cpu.errors[k] == error)
+    same_ok = all(same)
+    errors_ok = cpu.active == 4 and cpu.errors[-1] is not None and cpu.errors[0] is None
+
+    # Копии одного образа и лимит шагов
+    from interpreter.cpu import ExecutionLimitError
+    copies = BatchMemory.from_memory(images[0], 3)
+    limited = BatchCPU(copies)
+    try:
+        limited.execute(code, max_steps=5)
+        limit_ok = False
+    except ExecutionLimitError:
+        limit_ok = list(limited.steps) == [5, 5, 5]
+
+    print("Тест пакетного выполнения:")
+    print(f"  Совпадение с CPU по экземплярам: {same}")
+    print(f"  Ошибки экземпляров: {errors_ok}")
+    print(f"  Лимит шагов: {limit_ok}")
+
+    if same_ok and errors_ok and limit_ok:
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_batch()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,112 @@
+"""Тест 21: Проверка потокового режима ассемблера (--stream)."""
+
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from assembler import cli as assembler_cli
+
+
+CODE = """
+macros:
+  store:
+    params: [addr]
+    body:
+      - opcode: load_const
+        address: 1
+        constant: addr
+      - opcode: write_mem
+        source_addr: 1
+        result_addr: 1
+instructions:
+  - label: start
+  - repeat: 300
+    var: i
+    body:
+      - macro: store
+        args: {addr: 0x1000 + 4 * i}
+      - opcode: bswap
+        result_addr: 1
+        result_offset: 0x100
+        operand_offset: 0
+        operand_addr: 1
+  - label: end
+  - opcode: load_const
+    address: 2
+    constant: end - start
+"""
+
+DATA = """
+data:
+  - address: 0x2000
+    name: table
+    words: [1, 2, 3]
+"""
+
+FAILING = """
+instructions:
+  - repeat: 20000
+    body:
+      - opcode: load_const
+        address: 1
+        constant: 5
+  - opcode: load_const
+    address: 1
+    constant: undefined_name
+"""
+
+
+def run_main(*argv) -> int:
+    """Вызывает main() ассемблера с аргументами и возвращает код завершения."""
+    saved = sys.argv
+    sys.argv = ['assembler'] + [str(arg) for arg in argv]
+    try:
+        assembler_cli.main()
+        return 0
+    except SystemExit as e:
+        return e.code or 0
+    finally:
+        sys.argv = saved
+
+
+def test_stream():
+    """Сравнивает потоковый и обычный режимы и проверяет удаление файла при ошибке."""
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        source = directory / 'program.yaml'
+
+        results = {}
+        for name, text, options in (('raw', CODE, []),
+                                    ('object', CODE + DATA, ['--format', 'object', '--index'])):
+            source.write_text(text, encoding='utf-8')
+            outputs = []
+            for stream in ([], ['--stream']):
+                output = directory / f'{name}{len(stream)}.bin'
+                symbols = directory / f'{name}{len(stream)}.json'
+                code = run_main(source, output, '--symbols', symbols, *options, *stream)
+                outputs.append((code, output.read_bytes(), symbols.read_text(encoding='utf-8')))
+            results[name] = outputs[0] == outputs[1] and outputs[0][0] == 0
+
+        # Ошибка во втором проходе: частично записанный файл удаляется
+        source.write_text(FAILING, encoding='utf-8')
+        output = directory / 'failing.bin'
+        code = run_main(source, output, '--stream')
+        cleanup_ok = code == 1 and not output.exists()
+
+    print("Тест потокового режима ассемблера:")
+    print(f"  Совпадение с обычным режимом: {results}")
+    print(f"  Удаление файла при ошибке: {cleanup_ok}")
+
+    if all(results.values()) and cleanup_ok:
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_stream()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,70 @@
+"""Тест 22: Проверка компактного промежуточного представления (IRBuffer)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from assembler.parser import Parser
+from assembler.translator import Translator
+from assembler.codegen import CodeGenerator
+from assembler.ir import format_fields
+
+
+YAML = """
+instructions:
+  - repeat: 2000
+    var: i
+    body:
+      - opcode: load_const
+        address: i % 128
+        constant: 0x1000 + i
+      - opcode: read_mem
+        result_addr: 2
+        source_addr: i % 128
+      - opcode: write_mem
+        source_addr: 3
+        result_addr: 4
+      - opcode: bswap
+        result_addr: 1
+        result_offset: i
+        operand_offset: i % 512
+        operand_addr: 5
+"""
+
+
+def test_ir():
+    """Сравнивает IRBuffer со списком команд и проверяет выигрыш по памяти."""
+    instructions = Parser().parse(YAML)
+    translator = Translator()
+    plain = translator.translate(instructions)
+    compact = translator.translate_compact(instructions)
+
+    same_ok = len(compact) == len(plain) == 8000 and list(compact) == plain
+    codegen = CodeGenerator()
+    code_ok = codegen.generate(compact) == codegen.generate(plain)
+    format_ok = (format_fields(compact[0]) == "A=2, B=0, C=4096"
+                 and format_fields(compact[3]) == "A=13, B=1, C=0, D=0, E=5")
+
+    # Представление словарями (поле -> значение), по 8 байт на ссылку в списке
+    dict_size = sum(sys.getsizeof(dict(zip(instr._fields, instr))) + 8 for instr in plain)
+    ratio = dict_size / compact.nbytes()
+    ratio_ok = ratio >= 5
+
+    print("Тест компактного промежуточного представления:")
+    print(f"  Совпадение с translate: {same_ok}")
+    print(f"  Совпадение машинного кода: {code_ok}")
+    print(f"  Форматирование полей: {format_ok}")
+    print(f"  Память: {compact.nbytes()} байт против {dict_size} (в {ratio:.1f} раза меньше)")
+
+    if same_ok and code_ok and format_ok and ratio_ok:
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_ir()
+    sys.exit(0 if success else 1)
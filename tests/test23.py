@@ -0,0 +1,74 @@
+"""Тест 23: Проверка декодирования старших битов поля B в CPU."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from assembler.parser import Parser
+from assembler.translator import Translator
+from assembler.codegen import CodeGenerator
+from interpreter.memory import Memory
+from interpreter.cpu import CPU
+
+
+def test_decode_high_bits():
+    """Тестирует поле B с ненулевыми старшими битами при разных соседних полях."""
+    # Старшие биты B (биты 8-10) - младшие биты второго байта; биты 11-15
+    # того же байта заняты полем C
+    yaml_content = """
+instructions:
+  - opcode: load_const
+    address: 116
+    constant: 0x1000
+  - opcode: read_mem
+    result_addr: 117
+    source_addr: 116
+  - opcode: write_mem
+    source_addr: 117
+    result_addr: 3
+  - opcode: bswap
+    result_addr: 118
+    result_offset: 4
+    operand_offset: 0
+    operand_addr: 116
+"""
+    instructions = Parser().parse(yaml_content)
+    machine_code = CodeGenerator().generate(Translator().translate(instructions))
+
+    memory = Memory()
+    cpu = CPU(memory)
+    fields = []
+    offset = 0
+    while offset < len(machine_code):
+        opcode, decoded, size = cpu.decode_instruction(machine_code, offset)
+        fields.append(tuple(decoded.values()))
+        offset += size
+    expected = [(116, 0x1000), (117, 116), (117, 3), (118, 0, 4, 116)]
+
+    # Выполнение: константа попадает в регистр 116, а не в регистр с искаженным номером
+    memory.load_program(machine_code)
+    memory.write_word(0x1000, 0x11223344)
+    memory.registers[3] = 0x2000
+    memory.registers[118] = 0x3000
+    cpu.execute(machine_code)
+    execute_ok = (memory.registers[116] == 0x1000 and memory.registers[117] == 0x11223344
+                  and memory.read_word(0x2000) == 0x11223344
+                  and memory.read_word(0x3004) == 0x44332211)
+
+    print("Тест декодирования поля B:")
+    print(f"  Ожидается: {expected}")
+    print(f"  Получено:   {fields}")
+    print(f"  Выполнение: {execute_ok}")
+
+    if fields == expected and execute_ok:
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_decode_high_bits()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,80 @@
+"""Тест 5: Проверка блоков repeat и macro."""
+
+import sys
+import types
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from assembler.parser import Parser
+from assembler.translator import Translator
+from assembler.codegen import CodeGenerator
+
+
+def test_repeat_macro():
+    """Тестирует раскрытие repeat/macro и ленивость конвейера."""
+    yaml_content = """
+macros:
+  store:
+    params: [reg, value]
+    body:
+      - opcode: load_const
+        address: reg
+        constant: value
+instructions:
+  - repeat: 2
+    var: i
+    body:
+      - macro: store
+        args: {reg: 124, value: 828 + i}
+"""
+    expected_yaml = """
+instructions:
+  - opcode: load_const
+    address: 124
+    constant: 828
+  - opcode: load_const
+    address: 124
+    constant: 829
+"""
+    
+    def assemble(content):
+        instructions = Parser().parse(content)
+        intermediate = Translator().translate(instructions)
+        return CodeGenerator().generate(intermediate)
+    
+    machine_code = assemble(yaml_content)
+    expected = assemble(expected_yaml)
+    
+    # Огромное число повторений не должно материализоваться в список
+    huge_yaml = """
+instructions:
+  - repeat: 1000000000
+    body:
+      - opcode: read_mem
+        result_addr: 1
+        source_addr: 2
+"""
+    stream = CodeGenerator().iter_generate(
+        Translator().iter_translate(Parser().iter_parse(huge_yaml))
+    )
+    lazy_ok = isinstance(stream, types.GeneratorType) and next(stream) == assemble(
+        "instructions:\n  - opcode: read_mem\n    result_addr: 1\n    source_addr: 2\n"
+    )
+    
+    print("Тест repeat/macro:")
+    print(f"  Ожидается: {[hex(b) for b in expected]}")
+    print(f"  Получено:   {[hex(b) for b in machine_code]}")
+    print(f"  Ленивое раскрытие: {lazy_ok}")
+    
+    if machine_code == expected and lazy_ok:
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_repeat_macro()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,135 @@
+"""Тест 6: Проверка меток и символьных констант."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from assembler.parser import Parser
+from assembler.translator import Translator
+from assembler.codegen import CodeGenerator
+from interpreter.cli import symbols_by_address
+
+
+def test_labels_symbols():
+    """Тестирует двухпроходное разрешение меток и констант."""
+    yaml_content = """
+symbols:
+  base: 0x1000
+  next: base + 4
+instructions:
+  - opcode: load_const
+    address: 1
+    constant: data_end
+  - repeat: 3
+    body:
+      - opcode: read_mem
+        result_addr: 2
+        source_addr: 1
+  - label: data_end
+  - opcode: load_const
+    address: 3
+    constant: next
+"""
+    expected_yaml = """
+instructions:
+  - opcode: load_const
+    address: 1
+    constant: 14
+  - opcode: read_mem
+    result_addr: 2
+    source_addr: 1
+  - opcode: read_mem
+    result_addr: 2
+    source_addr: 1
+  - opcode: read_mem
+    result_addr: 2
+    source_addr: 1
+  - opcode: load_const
+    address: 3
+    constant: 0x1004
+"""
+    
+    def assemble(parser, content):
+        instructions = parser.parse(content)
+        intermediate = Translator().translate(instructions)
+        return CodeGenerator().generate(intermediate)
+    
+    parser = Parser()
+    machine_code = assemble(parser, yaml_content)
+    expected = assemble(Parser(), expected_yaml)
+    symbols = parser.symbols.to_dict()
+    symbols_ok = (symbols['labels'] == {'data_end': 14}
+                  and symbols['constants'] == {'base': 0x1000, 'next': 0x1004})
+    
+    # Метки в телах repeat/macro и аргументы макроса не словарем отвергаются
+    rejected = []
+    for body in ("""
+instructions:
+  - repeat: 2
+    body:
+      - label: inner
+""", """
+macros:
+  m:
+    params: [a]
+    body:
+      - label: inner
+instructions:
+  - macro: m
+    args: {a: 1}
+""", """
+macros:
+  m:
+    params: [a]
+    body:
+      - opcode: load_const
+        address: 1
+        constant: a
+instructions:
+  - macro: m
+    args: [1, 2]
+"""):
+        try:
+            Parser().parse(body)
+            rejected.append(False)
+        except ValueError:
+            rejected.append(True)
+    rejected_ok = all(rejected)
+    
+    # Дамп подписывается только метками и адресами сегментов данных
+    data_parser = Parser()
+    data_parser.parse("""
+symbols:
+  count: 16
+data:
+  - name: table
+    address: 0x1000
+    words: [1]
+instructions:
+  - label: start
+  - opcode: load_const
+    address: 1
+    constant: count
+""")
+    by_address = symbols_by_address(data_parser.symbols.to_dict())
+    tags_ok = by_address == {0: ['start'], 0x1000: ['table']}
+    
+    print("Тест меток и символов:")
+    print(f"  Ожидается: {[hex(b) for b in expected]}")
+    print(f"  Получено:   {[hex(b) for b in machine_code]}")
+    print(f"  Карта символов: {symbols}")
+    print(f"  Метки в repeat/macro и аргументы списком отвергнуты: {rejected}")
+    print(f"  Подписи дампа: {by_address}")
+    
+    if machine_code == expected and symbols_ok and rejected_ok and tags_ok:
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_labels_symbols()
+    sys.exit(0 if success else 1)
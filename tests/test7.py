@@ -0,0 +1,65 @@
+"""Тест 7: Проверка объектного формата программ."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from uvm.objfile import ObjectFile, ObjectFormatError, is_object_file
+from interpreter.memory import Memory
+from interpreter.loader import load_binary
+
+
+def test_object_format():
+    """Тестирует запись/чтение объектного файла, индекс и контрольную сумму."""
+    # load_const (5 байт), read_mem (3 байта), bswap (6 байт)
+    code = bytes([0xC2, 0xE7, 0x19, 0x00, 0x00,
+                  0x47, 0x22, 0x02,
+                  0x2D, 0xFD, 0xC6, 0x31, 0x14, 0x00])
+    data = [(0x1000, bytes([0x78, 0x56, 0x34, 0x12]))]
+    symbols = {'format': 'uvm-symbols', 'version': 1,
+               'labels': {}, 'constants': {'src': 0x1000}}
+    
+    blob = ObjectFile(code, data, symbols).to_bytes(with_index=True)
+    obj = ObjectFile.from_bytes(blob)
+    
+    format_ok = (is_object_file(blob) and not is_object_file(code)
+                 and bytes(obj.code) == code
+                 and [(a, bytes(s)) for a, s in obj.data] == data
+                 and obj.symbols == symbols
+                 and list(obj.index) == [0, 5, 8]
+                 and bytes(obj.instruction_bytes(1)) == code[5:8])
+    
+    # Поврежденный файл отвергается
+    corrupted = bytearray(blob)
+    corrupted[-1] ^= 0xFF
+    try:
+        ObjectFile.from_bytes(bytes(corrupted))
+        checksum_ok = False
+    except ObjectFormatError:
+        checksum_ok = True
+    
+    # Загрузчик размещает данные и принимает сырой код
+    memory = Memory()
+    loaded_code, loaded_symbols = load_binary(memory, blob)
+    raw_code, raw_symbols = load_binary(Memory(), code)
+    loader_ok = (memory.read_word(0x1000) == 0x12345678
+                 and bytes(loaded_code) == code and loaded_symbols == symbols
+                 and raw_code == code and raw_symbols is None)
+    
+    print("Тест объектного формата:")
+    print(f"  Формат и индекс: {format_ok}")
+    print(f"  Контрольная сумма: {checksum_ok}")
+    print(f"  Загрузчик: {loader_ok}")
+    
+    if format_ok and checksum_ok and loader_ok:
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_object_format()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,154 @@
+"""Тест 8: Проверка дизассемблера (обратимость ассемблирования)."""
+
+import gc
+import io
+import sys
+import tempfile
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from assembler.parser import Parser
+from assembler.translator import Translator
+from assembler.codegen import CodeGenerator
+from disassembler import cli as disassembler_cli
+from disassembler.decoder import iter_decode, iter_decode_stream
+from disassembler.formatter import iter_yaml
+from interpreter.cpu import CPU
+from interpreter.memory import Memory
+from assembler import cli as assembler_cli
+from uvm.objfile import ObjectFile
+
+
+OBJECT_SOURCE = """
+symbols:
+  base: 0x100
+data:
+  - address: 0x1000
+    name: table
+    words: [1, 2, 3]
+  - address: 0x1100
+    bytes: [7, 8, 9]
+instructions:
+  - label: start
+  - opcode: load_const
+    address: 1
+    constant: table + base
+  - opcode: read_mem
+    result_addr: 2
+    source_addr: 1
+  - label: end
+"""
+
+
+def run_main(main, *argv):
+    """Вызывает main() CLI с аргументами."""
+    saved = sys.argv
+    sys.argv = ['uvm'] + [str(arg) for arg in argv]
+    try:
+        main()
+    except SystemExit as e:
+        if e.code:
+            raise
+    finally:
+        sys.argv = saved
+
+
+def object_roundtrip(directory: Path) -> bool:
+    """Объектный файл: ассемблирование -> дизассемблирование -> ассемблирование."""
+    source = directory / 'object.yaml'
+    source.write_text(OBJECT_SOURCE, encoding='utf-8')
+    first, text, second = directory / 'first.bin', directory / 'restored.yaml', directory / 'second.bin'
+    run_main(assembler_cli.main, source, first, '--format', 'object', '--index')
+    run_main(disassembler_cli.main, first, text)
+    run_main(assembler_cli.main, text, second, '--format', 'object', '--index')
+    a, b = (ObjectFile.from_bytes(path.read_bytes()) for path in (first, second))
+    return (bytes(a.code) == bytes(b.code)
+            and [(address, bytes(data)) for address, data in a.data]
+            == [(address, bytes(data)) for address, data in b.data]
+            and a.symbols == b.symbols and a.symbols['data'] == {'table': 0x1000}
+            and list(a.index) == list(b.index))
+
+
+def test_disassembler():
+    """Тестирует цикл ассемблирование -> дизассемблирование -> ассемблирование."""
+    yaml_content = """
+instructions:
+  - opcode: load_const
+    address: 124
+    constant: 828
+  - opcode: read_mem
+    result_addr: 116
+    source_addr: 68
+  - opcode: write_mem
+    source_addr: 56
+    result_addr: 49
+  - opcode: bswap
+    result_addr: 82
+    result_offset: 796
+    operand_offset: 135
+    operand_addr: 5
+"""
+    
+    def assemble(content):
+        instructions = Parser().parse(content)
+        return CodeGenerator().generate(Translator().translate(instructions))
+    
+    machine_code = assemble(yaml_content)
+    decoded = list(iter_decode(machine_code))
+    restored = assemble(''.join(iter_yaml(decoded)))
+    
+    # Потоковое чтение малыми порциями дает тот же результат
+    streamed = list(iter_decode_stream(io.BytesIO(machine_code), chunk_size=4))
+    
+    # Декодер CPU согласован с дизассемблером
+    cpu = CPU(Memory())
+    cpu_fields = []
+    offset = 0
+    while offset < len(machine_code):
+        opcode, fields, size = cpu.decode_instruction(machine_code, offset)
+        cpu_fields.append(tuple(fields.values()))
+        offset += size
+    expected_fields = [(124, 828), (116, 68), (56, 49), (82, 135, 796, 5)]
+    
+    # CLI закрывает отображение файла и поток --chunked
+    closed = []
+    with tempfile.TemporaryDirectory() as directory, warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always', ResourceWarning)
+        binary = Path(directory) / 'program.bin'
+        binary.write_bytes(machine_code)
+        open_mapped = disassembler_cli.open_mapped
+        saved = sys.argv
+        try:
+            disassembler_cli.open_mapped = lambda path: closed.append(open_mapped(path)) or closed[-1]
+            for options in ([], ['--chunked']):
+                sys.argv = ['disassembler', str(binary), str(Path(directory) / 'out.yaml'), *options]
+                disassembler_cli.main()
+            gc.collect()
+        finally:
+            disassembler_cli.open_mapped = open_mapped
+            sys.argv = saved
+        object_ok = object_roundtrip(Path(directory))
+    files_ok = (len(closed) == 2 and all(mapped.closed for mapped in closed)
+                and not [w for w in caught if issubclass(w.category, ResourceWarning)])
+    
+    print("Тест дизассемблера:")
+    print(f"  Исходный код: {[hex(b) for b in machine_code]}")
+    print(f"  После цикла:  {[hex(b) for b in restored]}")
+    print(f"  Декодер CPU:  {cpu_fields}")
+    print(f"  Закрытие файлов CLI: {files_ok}")
+    print(f"  Объектный файл после цикла: {object_ok}")
+    
+    if (restored == machine_code and streamed == decoded and cpu_fields == expected_fields
+            and files_ok and object_ok):
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_disassembler()
+    sys.exit(0 if success else 1)
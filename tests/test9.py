@@ -0,0 +1,55 @@
+"""Тест 9: Проверка выполнения программы в одном процессе (uvm.api)."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from uvm import api
+
+
+def test_api_run():
+    """Тестирует путь от исходного текста до состояния памяти без файлов."""
+    yaml_content = """
+symbols:
+  dst: 0x2000
+data:
+  - name: src
+    address: 0x1000
+    words: [0x12345678]
+instructions:
+  - opcode: load_const
+    address: 20
+    constant: src
+  - opcode: load_const
+    address: 21
+    constant: dst
+  - opcode: bswap
+    result_addr: 21
+    result_offset: 4
+    operand_offset: 0
+    operand_addr: 20
+"""
+    
+    memory = api.run(yaml_content)
+    result = memory.read_word(0x2004)
+    
+    # Тот же результат для сериализованного объектного файла
+    blob = api.assemble(yaml_content).to_bytes()
+    result_blob = api.run(blob).read_word(0x2004)
+    
+    print("Тест uvm.api:")
+    print(f"  Ожидается: 0x78563412")
+    print(f"  Получено:   0x{result:08X}, из файла: 0x{result_blob:08X}")
+    
+    if result == 0x78563412 and result_blob == 0x78563412:
+        print("  [OK] ТЕСТ ПРОЙДЕН")
+        return True
+    else:
+        print("  [FAIL] ТЕСТ НЕ ПРОЙДЕН")
+        return False
+
+
+if __name__ == '__main__':
+    success = test_api_run()
+    sys.exit(0 if success else 1)
@@ -0,0 +1 @@
+"""Общие компоненты УВМ (описание системы команд, формат объектных файлов)."""
@@ -0,0 +1,5 @@
+"""Точка входа: python -m uvm."""
+
+from uvm.cli import main
+
+main()
@@ -0,0 +1,73 @@
+"""
+Программный интерфейс УВМ: от исходного текста до состояния памяти без файлов.
+
+Модули ассемблера (и PyYAML) импортируются только при ассемблировании,
+поэтому выполнение готовых бинарных программ не платит за их загрузку.
+"""
+
+from typing import Union
+from interpreter.memory import Memory
+from interpreter.cpu import CPU
+from interpreter.loader import load_binary
+from uvm.objfile import ObjectFile
+
+
+def assemble(source: str) -> ObjectFile:
+    """
+    Ассемблирует исходный текст в памяти.
+    
+    Args:
+        source: Исходный текст программы (YAML)
+        
+    Returns:
+        Объектный файл (код, сегменты данных и карта символов), не сериализованный
+    """
+    from assembler.parser import Parser
+    from assembler.translator import Translator
+    from assembler.codegen import CodeGenerator
+    
+    parser = Parser()
+    instructions = parser.iter_parse(source)
+    code = CodeGenerator().generate(Translator().iter_translate(instructions))
+    return ObjectFile(code, parser.data, parser.symbols.to_dict())
+
+
+def load(program: Union[ObjectFile, bytes], memory: Memory) -> bytes:
+    """
+    Загружает программу в память.
+    
+    Args:
+        program: Объектный файл в памяти или содержимое бинарного файла
+            (объектного или сырого)
+        memory: Объект памяти
+        
+    Returns:
+        Машинный код для выполнения
+    """
+    if isinstance(program, ObjectFile):
+        memory.load_program(program.code)
+        for address, segment in program.data:
+            memory.load_program(segment, address)
+        return program.code
+    code, _ = load_binary(memory, program)
+    return code
+
+
+def run(program: Union[str, ObjectFile, bytes], memory_size: int = 65536) -> Memory:
+    """
+    Выполняет программу и возвращает итоговое состояние памяти.
+    
+    Args:
+        program: Исходный текст (str), объектный файл или бинарный файл (bytes)
+        memory_size: Размер памяти в байтах
+        
+    Returns:
+        Память после выполнения программы
+    """
+    if isinstance(program, str):
+        program = assemble(program)
+    
+    memory = Memory(memory_size)
+    code = load(program, memory)
+    CPU(memory).execute(code)
+    return memory
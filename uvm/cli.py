@@ -0,0 +1,164 @@
+"""CLI УВМ: выполнение программы в одном процессе и проверка соответствия исполнителей."""
+
+import time
+
+# Момент начала импорта CLI - оценка времени старта, если момент запуска
+# процесса недоступен
+_START = time.perf_counter()
+
+import argparse
+import sys
+from pathlib import Path
+from uvm.timings import PhaseTimer, process_age
+
+
+# Расширения файлов с исходным текстом (остальные считаются бинарными)
+SOURCE_SUFFIXES = ('.yaml', '.yml')
+
+
+def run_command(args) -> int:
+    """Выполняет команду run: исходный текст или бинарный файл -> дамп памяти."""
+    timer = PhaseTimer()
+    age = process_age()
+    if age is not None:
+        timer.add('старт', age)
+    else:
+        timer.add('старт (с импорта CLI)', time.perf_counter() - _START)
+    
+    path = Path(args.program_file)
+    is_source = path.suffix.lower() in SOURCE_SUFFIXES
+    
+    # Читаем программу
+    try:
+        with timer.phase('чтение файла'):
+            if is_source:
+                program = path.read_text(encoding='utf-8')
+            else:
+                program = path.read_bytes()
+    except FileNotFoundError:
+        print(f"Ошибка: файл {args.program_file} не найден", file=sys.stderr)
+        return 1
+    except Exception as e:
+        print(f"Ошибка при чтении файла: {e}", file=sys.stderr)
+        return 1
+    
+    with timer.phase('импорт интерпретатора'):
+        from interpreter.memory import Memory
+        from interpreter.cpu import CPU
+        from uvm import api
+    
+    # Ассемблируем в памяти, без промежуточного файла
+    if is_source:
+        with timer.phase('импорт ассемблера'):
+            import yaml  # noqa: F401 - загрузка PyYAML учитывается отдельно
+            import assembler.parser  # noqa: F401
+        try:
+            with timer.phase('ассемблирование'):
+                program = api.assemble(program)
+        except Exception as e:
+            print(f"Ошибка при ассемблировании: {e}", file=sys.stderr)
+            return 1
+    
+    memory = Memory()
+    cpu = CPU(memory)
+    try:
+        with timer.phase('загрузка'):
+            code = api.load(program, memory)
+    except Exception as e:
+        print(f"Ошибка при загрузке программы: {e}", file=sys.stderr)
+        return 1
+    
+    try:
+        with timer.phase('выполнение'):
+            cpu.execute(code)
+    except Exception as e:
+        print(f"Ошибка выполнения программы: {e}", file=sys.stderr)
+        return 1
+    
+    if args.dump_file:
+        from interpreter.cli import create_memory_dump, save_memory_dump, symbols_by_address
+        try:
+            with timer.phase('дамп памяти'):
+                symbols = getattr(program, 'symbols', None)
+                symbols = symbols_by_address(symbols) if symbols else None
+                dump_root = create_memory_dump(memory, args.start, args.end, symbols)
+                save_memory_dump(dump_root, Path(args.dump_file))
+        except Exception as e:
+            print(f"Ошибка при сохранении дампа: {e}", file=sys.stderr)
+            return 1
+    
+    print("Программа выполнена успешно")
+    if args.dump_file:
+        print(f"Дамп памяти сохранен в: {args.dump_file}")
+    if args.timings:
+        print("Время этапов:")
+        print(timer.format())
+    return 0
+
+
+def conformance_command(args) -> int:
+    """Выполняет команду conformance: дифференциальная проверка исполнителей."""
+    from uvm import conformance
+    
+    engines = args.engines.split(',') if args.engines else None
+    unknown = [name for name in engines or () if name not in conformance.ENGINES]
+    if unknown:
+        print(f"Ошибка: неизвестные исполнители: {', '.join(unknown)} "
+              f"(доступны: {', '.join(conformance.ENGINES)})", file=sys.stderr)
+        return 1
+    
+    result = conformance.run(args.programs, args.seed, args.length, args.memory_size,
+                             args.workers, engines)
+    for failure in result['failures']:
+        print(f"Расхождение в программе {failure['seed']}:")
+        for problem in failure['problems']:
+            print(f"  {problem}")
+        print("Минимальная программа:")
+        print(failure['minimal'])
+    
+    print(f"Проверено программ: {result['checked']}, расхождений: {len(result['failures'])}")
+    return 1 if result['failures'] else 0
+
+
+def main():
+    """Главная функция CLI УВМ."""
+    parser = argparse.ArgumentParser(description='Учебная виртуальная машина')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    run_parser = subparsers.add_parser(
+        'run', help='Ассемблировать (при необходимости) и выполнить программу в одном процессе'
+    )
+    run_parser.add_argument('program_file', type=str,
+                            help='Исходный YAML файл (.yaml/.yml) или бинарный файл программы')
+    run_parser.add_argument('dump_file', type=str, nargs='?', default=None,
+                            help='Путь к файлу для сохранения дампа памяти')
+    run_parser.add_argument('--start', type=int, default=0, help='Начальный адрес для дампа')
+    run_parser.add_argument('--end', type=int, default=1024, help='Конечный адрес для дампа')
+    run_parser.add_argument('--timings', action='store_true',
+                            help='Вывести длительность этапов (старт, ассемблирование, выполнение...)')
+    
+    conformance_parser = subparsers.add_parser(
+        'conformance', help='Сравнить кодирование, декодирование и исполнители на случайных программах'
+    )
+    conformance_parser.add_argument('--programs', type=int, default=1000, help='Число программ')
+    conformance_parser.add_argument('--seed', type=int, default=0, help='Номер первой программы')
+    conformance_parser.add_argument('--length', type=int, default=32, help='Число команд в программе')
+    conformance_parser.add_argument('--memory-size', type=int, default=4096,
+                                    help='Размер памяти УВМ в байтах')
+    conformance_parser.add_argument('--workers', type=int, default=None,
+                                    help='Число процессов (по умолчанию - число ядер)')
+    conformance_parser.add_argument('--engines', type=str, default=None,
+                                    help='Исполнители через запятую (по умолчанию - все)')
+    
+    args = parser.parse_args()
+    if args.command == 'run':
+        sys.exit(run_command(args))
+    if args.command == 'conformance':
+        from uvm.conformance import ADDRESS_MARGIN
+        if args.memory_size <= ADDRESS_MARGIN:
+            conformance_parser.error(f"--memory-size должен быть больше {ADDRESS_MARGIN}")
+        sys.exit(conformance_command(args))
+
+
+if __name__ == '__main__':
+    main()
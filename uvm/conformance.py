@@ -0,0 +1,433 @@
+"""
+Дифференциальная проверка соответствия кодировщика, декодеров и исполнителей.
+
+Генерирует случайные корректные программы, кодирует их CodeGenerator,
+декодирует CPU.decode_instruction и дизассемблером и выполняет на всех
+зарегистрированных исполнителях. Итоговые память и регистры сравниваются
+с эталонным исполнителем пословно; расходящиеся программы сокращаются до
+минимального воспроизводящего примера. Серии программ выполняются
+параллельно в нескольких процессах:
+
+    python -m uvm conformance --programs 1000 --workers 4
+"""
+
+import importlib.util
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from uvm import isa
+
+
+# Программа: список команд (код операции, значения полей в порядке isa.FIELD_NAMES)
+Program = List[Tuple[int, tuple]]
+
+# Разрядность полей команд в порядке isa.FIELD_NAMES
+FIELD_BITS = {
+    2: (7, 27),
+    7: (7, 7),
+    5: (7, 7),
+    13: (7, 15, 9, 7),
+}
+
+# Эталонный исполнитель, с которым сравниваются остальные
+REFERENCE = 'checked'
+
+# Число различий, выводимых для одной пары исполнителей
+MAX_DIFFS = 8
+
+# Запас в конце памяти: обычные адреса генерируются в [0, memory_size - ADDRESS_MARGIN)
+ADDRESS_MARGIN = 128
+
+
+class Outcome(NamedTuple):
+    """Результат выполнения программы одним исполнителем."""
+    data: bytes
+    registers: tuple
+    steps: int
+    error: Optional[str]
+
+
+# Исполнители: имя -> функция (машинный код, размер памяти) -> Outcome
+ENGINES: Dict[str, Callable[[bytes, int], Outcome]] = {}
+
+
+def register_engine(name: str, engine: Callable[[bytes, int], Outcome]):
+    """
+    Регистрирует исполнитель для сравнения.
+
+    Серии программ выполняются в дочерних процессах, которые видят только
+    исполнители, зарегистрированные при импорте модуля. Исполнитель,
+    зарегистрированный во время работы, попадет в них лишь при запуске
+    процессов методом fork (по умолчанию в Linux); при spawn/forkserver
+    (Windows, macOS) его нужно регистрировать при импорте модуля, который
+    импортируется в дочернем процессе, или запускать проверку с workers=1.
+    """
+    ENGINES[name] = engine
+
+
+def _run_cpu(code: bytes, memory, configure=None) -> Outcome:
+    """Выполняет код на CPU и возвращает результат."""
+    from interpreter.cpu import CPU
+
+    cpu = CPU(memory)
+    if configure is not None:
+        configure(cpu)
+    memory.load_program(code)
+    error = None
+    try:
+        cpu.execute(code)
+    except Exception as e:
+        error = type(e).__name__
+    return Outcome(bytes(memory.data), tuple(memory.registers), cpu.steps, error)
+
+
+def _engine_checked(code: bytes, memory_size: int) -> Outcome:
+    from interpreter.memory import Memory
+
+    def configure(cpu):
+        cpu.USE_VERIFIER = False
+    return _run_cpu(code, Memory(memory_size), configure)
+
+
+def _engine_verified(code: bytes, memory_size: int) -> Outcome:
+    from interpreter.memory import Memory
+    return _run_cpu(code, Memory(memory_size))
+
+
+def _engine_sliced(code: bytes, memory_size: int) -> Outcome:
+    from interpreter.memory import Memory
+    from interpreter.cpu import CPU
+
+    memory = Memory(memory_size)
+    cpu = CPU(memory)
+    memory.load_program(code)
+    cpu.load(code)
+    error = None
+    try:
+        while not cpu.run(3).finished:
+            pass
+    except Exception as e:
+        error = type(e).__name__
+    return Outcome(bytes(memory.data), tuple(memory.registers), cpu.steps, error)
+
+
+def _engine_shared(code: bytes, memory_size: int) -> Outcome:
+    from interpreter.shared import SharedMemoryImage
+
+    memory = SharedMemoryImage(memory_size)
+    try:
+        return _run_cpu(code, memory)
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def _engine_journal(code: bytes, memory_size: int) -> Outcome:
+    """Выполнение с журналом; итог без ошибки восстанавливается из журнала."""
+    from interpreter.memory import Memory
+    from interpreter.journal import Journal
+
+    journal = Journal(snapshot_interval=4)
+
+    def configure(cpu):
+        cpu.journal = journal
+    outcome = _run_cpu(code, Memory(memory_size), configure)
+    if outcome.error is not None:
+        return outcome
+    state = journal.state_at(len(journal))
+    return outcome._replace(data=bytes(state.data), registers=tuple(state.registers))
+
+
+def _engine_predecoded(code: bytes, memory_size: int) -> Outcome:
+    """Выполнение декодированной программы (DecodedProgram) без верификатора."""
+    from interpreter.memory import Memory
+    from interpreter.cpu import CPU
+    from interpreter.predecode import DecodedProgram
+
+    memory = Memory(memory_size)
+    cpu = CPU(memory)
+    cpu.USE_VERIFIER = False
+    memory.load_program(code)
+    error = None
+    try:
+        decoded = DecodedProgram.from_bytes(DecodedProgram.from_code(code).to_bytes())
+        cpu.execute(code, decoded=decoded)
+    except Exception as e:
+        error = type(e).__name__
+    return Outcome(bytes(memory.data), tuple(memory.registers), cpu.steps, error)
+
+
+def _engine_hooked(code: bytes, memory_size: int) -> Outcome:
+    """Выполнение через перехватчики, которые не останавливают выполнение."""
+    from interpreter.memory import Memory
+
+    def configure(cpu):
+        for opcode in isa.SIZES:
+            cpu.on_opcode(opcode, lambda cpu, event: False)
+        cpu.add_watchpoint(0, memory_size, 'access', lambda cpu, event: False)
+    return _run_cpu(code, Memory(memory_size), configure)
+
+
+def _engine_batch(code: bytes, memory_size: int) -> Outcome:
+    """Пакетное выполнение (NumPy) на двух одинаковых образах памяти."""
+    from interpreter.memory import Memory
+    from interpreter.batch import BatchMemory, BatchCPU
+
+    memory = Memory(memory_size)
+    memory.load_program(code)
+    batch = BatchMemory.from_memory(memory, 2)
+    cpu = BatchCPU(batch)
+    cpu.execute(code)
+    result = batch.memory(1)
+    error = None if cpu.errors[1] is None else RuntimeError.__name__
+    return Outcome(bytes(result.data), tuple(result.registers), int(cpu.steps[1]), error)
+
+
+register_engine('checked', _engine_checked)
+register_engine('verified', _engine_verified)
+register_engine('sliced', _engine_sliced)
+register_engine('shared', _engine_shared)
+register_engine('journal', _engine_journal)
+register_engine('hooked', _engine_hooked)
+register_engine('predecoded', _engine_predecoded)
+if importlib.util.find_spec('numpy') is not None:
+    register_engine('batch', _engine_batch)
+
+
+def random_program(rng: random.Random, length: int, memory_size: int,
+                   registers: int = 4) -> Program:
+    """
+    Генерирует случайную программу.
+
+    Регистры 0..registers-1 хранят адреса, следующие registers регистров -
+    данные, поэтому команды зависят друг от друга и большинство программ
+    выполняется без ошибок. Изредка адрес попадает на границу памяти или за
+    нее, используется произвольный регистр или адрес копируется через память
+    (такие программы верификатор доказать не может).
+    """
+    def address_register():
+        return rng.randrange(registers) if rng.random() < 0.95 else rng.randrange(128)
+
+    def data_register():
+        return registers + rng.randrange(registers) if rng.random() < 0.95 else rng.randrange(128)
+
+    def address():
+        if rng.random() < 0.97:
+            return rng.randrange(memory_size - ADDRESS_MARGIN)
+        return memory_size - 8 + rng.randrange(12)
+
+    def offset(bits):
+        return rng.randrange(64) if rng.random() < 0.97 else rng.getrandbits(bits)
+
+    bits = FIELD_BITS[13]
+    program = [(2, (r, address())) for r in range(registers)]
+    while len(program) < length:
+        choice = rng.random()
+        if choice < 0.25:
+            program.append((2, (address_register(), address())))
+        elif choice < 0.4:
+            program.append((2, (data_register(), rng.getrandbits(27))))
+        elif choice < 0.55:
+            program.append((7, (data_register(), address_register())))
+        elif choice < 0.75:
+            program.append((5, (data_register(), address_register())))
+        elif choice < 0.95:
+            program.append((13, (address_register(), offset(bits[1]), offset(bits[2]),
+                                 address_register())))
+        else:
+            # Адрес через память: записать регистр a по адресу b и прочитать обратно
+            a, b, c = address_register(), address_register(), address_register()
+            program.append((5, (a, b)))
+            program.append((7, (c, b)))
+    return program[:length]
+
+
+def encode(program: Program) -> bytes:
+    """Кодирует программу транслятором и генератором кода ассемблера."""
+    from assembler.parser import Instruction
+    from assembler.translator import Translator
+    from assembler.codegen import CodeGenerator
+
+    instructions = (Instruction.from_values(opcode, values) for opcode, values in program)
+    return CodeGenerator().generate(Translator().iter_translate(instructions))
+
+
+def check_codec(program: Program, code: bytes) -> List[str]:
+    """Проверяет, что декодеры восстанавливают поля всех команд."""
+    from interpreter.cpu import CPU
+    from disassembler.decoder import iter_decode
+
+    problems = []
+    decode = CPU(None).decode_instruction
+    decoded = list(iter_decode(code))
+    offset = 0
+    for k, (opcode, values) in enumerate(program):
+        expected = dict(zip(isa.FIELD_NAMES[opcode], values))
+        cpu_opcode, fields, size = decode(code, offset)
+        fields = {name: fields[name] for name in isa.FIELD_NAMES[opcode] if name in fields}
+        if cpu_opcode != opcode or fields != expected or size != isa.SIZES[opcode]:
+            problems.append(f"команда {k}: CPU.decode_instruction {cpu_opcode} {fields}, "
+                            f"ожидалось {opcode} {expected}")
+        if k >= len(decoded) or decoded[k][0] != offset or decoded[k][2] != values:
+            problems.append(f"команда {k}: дизассемблер {decoded[k] if k < len(decoded) else None}, "
+                            f"ожидалось {values}")
+        offset += isa.SIZES[opcode]
+    if offset != len(code):
+        problems.append(f"размер кода {len(code)}, ожидалось {offset}")
+    return problems
+
+
+def diff_outcomes(name: str, expected: Outcome, actual: Outcome) -> List[str]:
+    """Сравнивает результаты исполнителей пословно."""
+    problems = []
+    if (expected.steps, expected.error) != (actual.steps, actual.error):
+        problems.append(f"{name}: шагов {actual.steps}, ошибка {actual.error}; "
+                        f"эталон: шагов {expected.steps}, ошибка {expected.error}")
+    for i, (a, b) in enumerate(zip(expected.registers, actual.registers)):
+        if a != b and len(problems) < MAX_DIFFS:
+            problems.append(f"{name}: регистр {i} = 0x{b:08X}, эталон 0x{a:08X}")
+    for address in range(0, len(expected.data), 4):
+        a = expected.data[address:address + 4]
+        b = actual.data[address:address + 4]
+        if a != b:
+            if len(problems) >= MAX_DIFFS:
+                problems.append(f"{name}: ...")
+                break
+            problems.append(f"{name}: слово 0x{address:04X} = {b.hex()}, эталон {a.hex()}")
+    return problems
+
+
+def check_program(program: Program, memory_size: int,
+                  engines: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    Проверяет одну программу: кодирование, декодирование и все исполнители.
+
+    Returns:
+        Список расхождений (пустой - программа проверена успешно)
+    """
+    code = encode(program)
+    problems = check_codec(program, code)
+    names = engines or list(ENGINES)
+    reference = ENGINES[REFERENCE](code, memory_size)
+    for name in names:
+        if name != REFERENCE:
+            problems += diff_outcomes(name, reference, ENGINES[name](code, memory_size))
+    return problems
+
+
+def shrink(program: Program, fails: Callable[[Program], bool]) -> Program:
+    """
+    Сокращает программу, сохраняя расхождение.
+
+    Поочередно удаляются блоки команд (от половины программы до одной
+    команды) и значения полей заменяются нулем или уменьшаются вдвое,
+    пока программа перестает сокращаться.
+    """
+    changed = True
+    while changed:
+        changed = False
+
+        chunk = max(len(program) // 2, 1)
+        while chunk >= 1:
+            i = 0
+            while i < len(program):
+                candidate = program[:i] + program[i + chunk:]
+                if candidate and fails(candidate):
+                    program, changed = candidate, True
+                else:
+                    i += chunk
+            chunk //= 2
+
+        for k in range(len(program)):
+            opcode, values = program[k]
+            for j in range(len(values)):
+                reduced = True
+                while reduced:
+                    reduced = False
+                    for smaller in (0, values[j] // 2):
+                        if smaller >= values[j]:
+                            continue
+                        trial = values[:j] + (smaller,) + values[j + 1:]
+                        candidate = program[:k] + [(opcode, trial)] + program[k + 1:]
+                        if fails(candidate):
+                            program, values = candidate, trial
+                            reduced = changed = True
+                            break
+    return program
+
+
+def format_program(program: Program) -> str:
+    """Форматирует программу как исходный текст ассемблера (YAML)."""
+    lines = ['instructions:']
+    for opcode, values in program:
+        lines.append(f"  - opcode: {isa.OPCODE_NAMES[opcode]}")
+        for name, value in zip(isa.FIELD_NAMES[opcode], values):
+            lines.append(f"    {name}: {value}")
+    return '\n'.join(lines) + '\n'
+
+
+def run_shard(seed: int, count: int, length: int, memory_size: int,
+              engines: Optional[Sequence[str]] = None) -> Dict:
+    """
+    Проверяет count программ, начиная с номера seed.
+
+    Программа с номером n генерируется random.Random(n), поэтому любой
+    случай воспроизводится по номеру.
+
+    Returns:
+        Словарь: checked - число программ, failures - список расхождений
+        (seed, исходный и сокращенный текст программы, описание)
+    """
+    failures = []
+    for n in range(seed, seed + count):
+        program = random_program(random.Random(n), length, memory_size)
+        problems = check_program(program, memory_size, engines)
+        if problems:
+            minimal = shrink(program, lambda p: bool(check_program(p, memory_size, engines)))
+            failures.append({
+                'seed': n,
+                'program': format_program(program),
+                'minimal': format_program(minimal),
+                'problems': check_program(minimal, memory_size, engines),
+            })
+    return {'checked': count, 'failures': failures}
+
+
+def run(programs: int = 1000, seed: int = 0, length: int = 32, memory_size: int = 4096,
+        workers: Optional[int] = None, engines: Optional[Sequence[str]] = None) -> Dict:
+    """
+    Проверяет programs случайных программ, распределяя серии по процессам.
+
+    Args:
+        programs: Число программ
+        seed: Номер первой программы
+        length: Число команд в программе
+        memory_size: Размер памяти УВМ
+        workers: Число процессов (1 - в текущем процессе)
+        engines: Имена исполнителей (по умолчанию - все зарегистрированные)
+
+    Returns:
+        Словарь: checked - число программ, failures - список расхождений
+
+    Raises:
+        ValueError: Если memory_size не больше ADDRESS_MARGIN
+    """
+    if memory_size <= ADDRESS_MARGIN:
+        raise ValueError(f"Размер памяти должен быть больше {ADDRESS_MARGIN} байт: {memory_size}")
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return run_shard(seed, programs, length, memory_size, engines)
+
+    shards = min(programs, workers * 4) or 1
+    bounds = [seed + programs * i // shards for i in range(shards + 1)]
+    result = {'checked': 0, 'failures': []}
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(run_shard, start, end - start, length, memory_size, engines)
+                   for start, end in zip(bounds, bounds[1:])]
+        for future in futures:
+            shard = future.result()
+            result['checked'] += shard['checked']
+            result['failures'] += shard['failures']
+    return result
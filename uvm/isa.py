@@ -0,0 +1,26 @@
+"""Описание системы команд УВМ."""
+
+# Версия системы команд (меняется при изменении кодирования команд)
+ISA_VERSION = 1
+
+# Маппинг имен команд на коды операций
+OPCODES = {
+    'load_const': 2,
+    'read_mem': 7,
+    'write_mem': 5,
+    'bswap': 13,
+}
+
+# Имена команд по кодам операций
+OPCODE_NAMES = {code: name for name, code in OPCODES.items()}
+
+# Размеры команд в байтах по кодам операций
+SIZES = {2: 5, 7: 3, 5: 3, 13: 6}
+
+# Имена полей исходного текста по кодам операций в порядке их следования
+FIELD_NAMES = {
+    2: ('address', 'constant'),
+    7: ('result_addr', 'source_addr'),
+    5: ('source_addr', 'result_addr'),
+    13: ('result_addr', 'result_offset', 'operand_offset', 'operand_addr'),
+}
@@ -0,0 +1,268 @@
+"""
+Объектный формат программ УВМ.
+
+Структура файла (все числа little-endian):
+
+    Заголовок (24 байта):
+        magic          4 байта   b'\\x7fUVM'
+        version        uint16    версия формата
+        flags          uint16    FLAG_INDEX - есть индекс смещений команд
+        section_count  uint32    число секций
+        table_offset   uint32    смещение таблицы секций
+        checksum       uint32    CRC32 содержимого секций и таблицы секций
+        reserved       uint32
+    Содержимое секций (код, данные, символы, индекс)
+    Таблица секций: section_count записей (type uint16, reserved uint16,
+        offset uint32, size uint32)
+
+Первый байт заголовка (0x7F) не является кодом операции, поэтому объектный
+файл нельзя спутать с прежним «сырым» бинарным файлом.
+"""
+
+import io
+import struct
+import sys
+import zlib
+from array import array
+from typing import BinaryIO, Dict, List, Optional, Tuple
+
+from uvm import isa
+
+
+MAGIC = b'\x7fUVM'
+FORMAT_VERSION = 1
+
+FLAG_INDEX = 0x0001
+
+# Типы секций
+SECTION_CODE = 1
+SECTION_DATA = 2
+SECTION_SYMBOLS = 3
+SECTION_INDEX = 4
+
+_HEADER = struct.Struct('<4sHHIIII')
+_SECTION = struct.Struct('<HHII')
+_SEGMENT = struct.Struct('<II')
+
+
+class ObjectFormatError(ValueError):
+    """Ошибка формата объектного файла."""
+
+
+def is_object_file(blob: bytes) -> bool:
+    """Проверяет, является ли содержимое объектным файлом (а не сырым кодом)."""
+    return bytes(blob[:len(MAGIC)]) == MAGIC
+
+
+def _index_to_bytes(index: array) -> bytes:
+    """Сериализует индекс смещений в little-endian."""
+    if sys.byteorder == 'big':
+        index = array('I', index)
+        index.byteswap()
+    return index.tobytes()
+
+
+class ObjectWriter:
+    """
+    Потоковая запись объектного файла.
+
+    Код записывается порциями через write() (совместимо с CodeGenerator.write),
+    индекс смещений команд строится на лету. Остальные секции и таблица
+    секций дописываются в finish(), после чего заголовок перезаписывается.
+    Поток должен поддерживать seek().
+    """
+
+    def __init__(self, stream: BinaryIO, with_index: bool = False):
+        self.stream = stream
+        self.index: Optional[array] = array('I') if with_index else None
+        self._start = stream.tell()
+        self._sections: List[Tuple[int, int, int]] = []
+        self._crc = 0
+        self._code_size = 0
+        self._next_instr = 0
+        stream.write(b'\0' * _HEADER.size)
+        self._position = _HEADER.size
+
+    def _write_raw(self, chunk: bytes):
+        self.stream.write(chunk)
+        self._crc = zlib.crc32(chunk, self._crc)
+        self._position += len(chunk)
+
+    def write(self, chunk: bytes) -> int:
+        """Дописывает порцию машинного кода в секцию кода."""
+        if self.index is not None:
+            start = self._code_size
+            end = start + len(chunk)
+            pos = self._next_instr
+            while pos < end:
+                self.index.append(pos)
+                opcode = chunk[pos - start] & 0x0F
+                if opcode not in isa.SIZES:
+                    raise ObjectFormatError(
+                        f"Неизвестный код операции {opcode} по смещению {pos}"
+                    )
+                pos += isa.SIZES[opcode]
+            self._next_instr = pos
+
+        self._write_raw(chunk)
+        self._code_size += len(chunk)
+        return len(chunk)
+
+    def _add_section(self, section_type: int, payload: bytes):
+        offset = self._position
+        self._write_raw(payload)
+        self._sections.append((section_type, offset, len(payload)))
+
+    def finish(self, data: List[Tuple[int, bytes]] = (), symbols: Optional[Dict] = None):
+        """
+        Завершает файл: дописывает секции данных, символов, индекса и заголовок.
+
+        Args:
+            data: Сегменты данных (адрес загрузки, байты)
+            symbols: Карта символов ассемблера
+        """
+        self._sections.insert(0, (SECTION_CODE, _HEADER.size, self._code_size))
+
+        if data:
+            payload = bytearray()
+            for address, segment in data:
+                payload += _SEGMENT.pack(address, len(segment))
+                payload += segment
+            self._add_section(SECTION_DATA, bytes(payload))
+
+        if symbols is not None:
+            import json
+            self._add_section(SECTION_SYMBOLS, json.dumps(symbols).encode('utf-8'))
+
+        flags = 0
+        if self.index is not None:
+            flags |= FLAG_INDEX
+            self._add_section(SECTION_INDEX, _index_to_bytes(self.index))
+
+        table_offset = self._position
+        table = b''.join(_SECTION.pack(t, 0, o, s) for t, o, s in self._sections)
+        self._write_raw(table)
+
+        end = self.stream.tell()
+        self.stream.seek(self._start)
+        self.stream.write(_HEADER.pack(MAGIC, FORMAT_VERSION, flags, len(self._sections),
+                                       table_offset, self._crc, 0))
+        self.stream.seek(end)
+
+
+class ObjectFile:
+    """
+    Объектный файл УВМ в памяти.
+
+    При чтении секции кода и данных не копируются, а ссылаются на исходный
+    буфер через memoryview; команды декодируются только по запросу.
+    """
+
+    def __init__(self, code: bytes, data: List[Tuple[int, bytes]] = None,
+                 symbols: Optional[Dict] = None, index: Optional[array] = None):
+        self.code = code
+        self.data = data or []
+        self.symbols = symbols
+        self.index = index
+
+    def to_bytes(self, with_index: bool = None) -> bytes:
+        """Сериализует объектный файл (по умолчанию индекс - если он есть)."""
+        if with_index is None:
+            with_index = self.index is not None
+        buffer = io.BytesIO()
+        writer = ObjectWriter(buffer, with_index)
+        writer.write(bytes(self.code))
+        writer.finish(self.data, self.symbols)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, blob: bytes, verify: bool = True) -> 'ObjectFile':
+        """
+        Читает объектный файл.
+
+        Args:
+            blob: Содержимое файла
+            verify: Проверять контрольную сумму
+
+        Returns:
+            Объект ObjectFile
+        """
+        view = memoryview(blob)
+        if len(view) < _HEADER.size or not is_object_file(view):
+            raise ObjectFormatError("Неверная сигнатура объектного файла")
+
+        magic, version, flags, count, table_offset, checksum, _ = _HEADER.unpack_from(view, 0)
+        if version > FORMAT_VERSION:
+            raise ObjectFormatError(f"Неподдерживаемая версия формата: {version}")
+        table_end = table_offset + count * _SECTION.size
+        if table_offset < _HEADER.size or table_end > len(view):
+            raise ObjectFormatError("Таблица секций выходит за границы файла")
+
+        if verify and zlib.crc32(view[_HEADER.size:table_end]) != checksum:
+            raise ObjectFormatError("Контрольная сумма не совпадает")
+
+        sections = {}
+        for i in range(count):
+            section_type, _, offset, size = _SECTION.unpack_from(view, table_offset + i * _SECTION.size)
+            if offset + size > table_offset:
+                raise ObjectFormatError(f"Секция {section_type} выходит за границы файла")
+            sections[section_type] = view[offset:offset + size]
+
+        if SECTION_CODE not in sections:
+            raise ObjectFormatError("Отсутствует секция кода")
+
+        data = []
+        if SECTION_DATA in sections:
+            payload = sections[SECTION_DATA]
+            pos = 0
+            while pos < len(payload):
+                address, length = _SEGMENT.unpack_from(payload, pos)
+                pos += _SEGMENT.size
+                data.append((address, payload[pos:pos + length]))
+                pos += length
+
+        symbols = None
+        if SECTION_SYMBOLS in sections:
+            import json
+            symbols = json.loads(bytes(sections[SECTION_SYMBOLS]).decode('utf-8'))
+
+        index = None
+        if flags & FLAG_INDEX and SECTION_INDEX in sections:
+            index = array('I')
+            index.frombytes(sections[SECTION_INDEX])
+            if sys.byteorder == 'big':
+                index.byteswap()
+
+        return cls(sections[SECTION_CODE], data, symbols, index)
+
+    def build_index(self) -> array:
+        """Строит индекс смещений команд по таблице размеров."""
+        index = array('I')
+        code = self.code
+        pos = 0
+        while pos < len(code):
+            index.append(pos)
+            opcode = code[pos] & 0x0F
+            if opcode not in isa.SIZES:
+                raise ObjectFormatError(f"Неизвестный код операции {opcode} по смещению {pos}")
+            pos += isa.SIZES[opcode]
+        self.index = index
+        return index
+
+    def instruction_count(self) -> int:
+        """Возвращает число команд в секции кода."""
+        if self.index is None:
+            self.build_index()
+        return len(self.index)
+
+    def instruction_offset(self, k: int) -> int:
+        """Возвращает смещение k-й команды в секции кода."""
+        if self.index is None:
+            self.build_index()
+        return self.index[k]
+
+    def instruction_bytes(self, k: int) -> memoryview:
+        """Возвращает байты k-й команды без декодирования остальных."""
+        offset = self.instruction_offset(k)
+        size = isa.SIZES[self.code[offset] & 0x0F]
+        return memoryview(self.code)[offset:offset + size]
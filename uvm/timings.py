@@ -0,0 +1,146 @@
+"""Замер длительности этапов работы УВМ и отчеты о запуске."""
+
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+
+class PhaseTimer:
+    """Накопитель длительностей именованных этапов (монотонные часы)."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        """Замеряет длительность блока и добавляет ее к этапу name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float):
+        """Добавляет длительность к этапу."""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def total(self) -> float:
+        """Суммарная длительность всех этапов."""
+        return sum(self.phases.values())
+
+    def format(self) -> str:
+        """Возвращает таблицу длительностей этапов в миллисекундах."""
+        width = max((len(name) for name in self.phases), default=0)
+        lines = [f"  {name:<{width}}  {seconds * 1000:9.3f} мс"
+                 for name, seconds in self.phases.items()]
+        lines.append(f"  {'итого':<{width}}  {self.total() * 1000:9.3f} мс")
+        return "\n".join(lines)
+
+
+# Формат и версия файла отчета
+REPORT_FORMAT = 'uvm-report'
+REPORT_VERSION = 1
+
+
+def process_age() -> Optional[float]:
+    """
+    Время с запуска процесса в секундах (None, если недоступно).
+
+    Момент запуска берется из /proc/self/stat (Linux), поэтому учитывается
+    и старт интерпретатора Python с импортом пакетов; точность - один такт
+    системных часов (обычно 10 мс).
+    """
+    try:
+        import os
+        with open('/proc/self/stat', 'rb') as f:
+            stat = f.read()
+        with open('/proc/uptime', 'rb') as f:
+            uptime = float(f.read().split()[0])
+        # Имя процесса в скобках может содержать пробелы: поля считаются после ')'
+        fields = stat[stat.rindex(b')') + 2:].split()
+        started = int(fields[19]) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+    return max(uptime - started, 0.0)
+
+
+def peak_rss() -> Optional[int]:
+    """Пиковый объем резидентной памяти процесса в байтах (None, если недоступен)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux сообщает килобайты, macOS - байты
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Report:
+    """
+    Отчет о запуске CLI в формате JSON: длительности этапов, счетчики,
+    пиковая память и пропускная способность.
+
+    Общее время (total_seconds) отсчитывается от создания отчета до его
+    записи и включает время вне замеренных этапов (разбор аргументов,
+    создание объектов, обработку ошибок).
+    """
+
+    def __init__(self, tool: str):
+        """
+        Args:
+            tool: Имя инструмента (assembler, interpreter)
+        """
+        self.tool = tool
+        self.started = time.perf_counter()
+        self.timer = PhaseTimer()
+        self.counts: Dict[str, int] = {}
+        self.throughput: Dict[str, float] = {}
+        self.status = 'ok'
+        self.error: Optional[str] = None
+
+    def phase(self, name: str):
+        """Замеряет этап (см. PhaseTimer.phase)."""
+        return self.timer.phase(name)
+
+    def count(self, name: str, value: int):
+        """Записывает счетчик."""
+        self.counts[name] = value
+
+    def rate(self, name: str, count: int, *phases: str):
+        """Записывает пропускную способность: count в секунду за указанные этапы."""
+        seconds = sum(self.timer.phases.get(phase, 0.0) for phase in phases)
+        if seconds > 0:
+            self.throughput[name] = count / seconds
+
+    def fail(self, message: str):
+        """Отмечает запуск как завершившийся ошибкой с сообщением message."""
+        self.status = 'error'
+        self.error = message
+
+    def to_dict(self) -> Dict:
+        """Возвращает отчет в виде словаря."""
+        report = {
+            'format': REPORT_FORMAT,
+            'version': REPORT_VERSION,
+            'tool': self.tool,
+            'status': self.status,
+            'phases': dict(self.timer.phases),
+            'total_seconds': time.perf_counter() - self.started,
+            'counts': dict(self.counts),
+            'throughput': dict(self.throughput),
+            'peak_rss_bytes': peak_rss(),
+        }
+        if self.error is not None:
+            report['error'] = self.error
+        return report
+
+    def save(self, path: Path):
+        """Сохраняет отчет в JSON файл."""
+        import json
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)